@@ -0,0 +1,318 @@
+"""
+โหมด asyncio: ขับทุกเว็บไซต์พร้อมกันใน event loop เดียว
+
+- แต่ละ host มี connection pool (aiohttp.TCPConnector, keep-alive) ของตัวเอง
+- จำกัดจำนวน request ที่ค้างอยู่ต่อ host ด้วย asyncio.Semaphore (สุภาพกับแต่ละเว็บ)
+- Deville (cld.php): ดึงผ่าน HTTP ทั้งหมด — หลายสิบ request พร้อมกันได้
+- Pool Villa City / Pattaya Party: หน้าเว็บ render ด้วย JavaScript ต้องใช้ Chrome
+  จึงส่งไปรันใน thread pool (1 CalendarScraper ต่อ thread) แต่ยังนับโควตาต่อ host
+  ร่วมกับ request HTTP
+- ผลลัพธ์เรียงตาม (ลำดับ URL, ลำดับ unit) เหมือน worker pool และออกมาทันทีที่ส่วนต้นครบ
+"""
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import aiohttp
+
+import sites
+from calendar_cache import cache_key, fingerprint
+from host_health import FAILED, SKIPPED, HostDown, host_of
+from deville_http import (
+    BASE_IFRAME_URL, USER_AGENT, http_listing, month_rows, parse_cld_html, print_unmatched,
+)
+from metrics import count_page, span
+from replay import record, route
+from worker_pool import drain
+
+
+class HostPool:
+    """Connection pool + ตัวจำกัด request ค้างของแต่ละ host"""
+
+    def __init__(self, max_per_host=4, timeout=15):
+        self.max_per_host = max_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.sessions = {}
+        self.limits = {}
+
+    def limit(self, host):
+        """Semaphore ของ host (ใช้ร่วมกันทั้ง HTTP และงาน Chrome)"""
+        if host not in self.limits:
+            self.limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self.limits[host]
+
+    def session(self, host):
+        """ClientSession ของ host (สร้างครั้งแรกที่ใช้)"""
+        if host not in self.sessions:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_per_host,
+                keepalive_timeout=30,
+            )
+            self.sessions[host] = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"User-Agent": USER_AGENT, "Accept-Language": "th,en;q=0.8"},
+            )
+        return self.sessions[host]
+
+    async def get_text(self, url):
+        """GET url แล้วคืน HTML (raise ถ้า status ไม่ใช่ 2xx)"""
+        host = urlparse(url).netloc
+        async with self.limit(host):
+            async with self.session(host).get(route(url)) as resp:
+                resp.raise_for_status()
+                text = await resp.text(errors="replace")
+        record(url, text)
+        return text
+
+    async def close(self):
+        for session in self.sessions.values():
+            await session.close()
+
+
+async def _done(rows):
+    """awaitable ที่คืน row ที่มีอยู่แล้ว (unit ที่ไม่ต้องส่ง request)"""
+    return rows
+
+
+class AsyncCrawler:
+    """
+    Crawler แบบ asyncio
+
+    - make_scraper: ฟังก์ชันสร้าง CalendarScraper (ใช้กับงานที่ต้องใช้ Chrome)
+    - detect_site_type: ฟังก์ชัน url -> ประเภทเว็บไซต์
+    - months: รายการเดือน (YYYY-MM) ที่ต้องดึง
+    - max_per_host: จำนวน request ค้างสูงสุดต่อ host
+    - browser_workers: จำนวน thread (Chrome) สำหรับเว็บที่ต้อง render JavaScript
+    - max_houses: จำกัดจำนวนบ้านต่อหน้า Deville (0 = ทั้งหมด)
+    - cache: CalendarCache (None = ไม่ใช้ cache)
+    - checkpoint: checkpoint.Checkpoint (None = ไม่บันทึก / ไม่ resume)
+    - shard: shards.Shard (None = ทุกบ้าน)
+    - scheduler: refresh_schedule.RefreshScheduler (None = ดึงทุก (บ้าน, เดือน) ทุกรอบ)
+    - health: host_health.HostHealth (None = ไม่ลองใหม่ / ไม่มี circuit breaker)
+    """
+
+    # เว็บที่ดึงผ่าน aiohttp ได้โดยตรง -> ชื่อ method ที่คืน list ของ unit
+    # (เว็บอื่นใช้ adapter ใน thread ที่มี Chrome)
+    ASYNC_SITES = {
+        'deville': '_crawl_deville',
+    }
+
+    def __init__(self, make_scraper, detect_site_type, months,
+                 max_per_host=4, browser_workers=1, max_houses=0, cache=None, checkpoint=None, shard=None,
+                 scheduler=None, health=None):
+        self.make_scraper = make_scraper
+        self.detect_site_type = detect_site_type
+        self.months = months
+        self.max_per_host = max_per_host
+        self.max_houses = max_houses
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.shard = shard
+        self.scheduler = scheduler
+        self.health = health
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, browser_workers),
+            thread_name_prefix="browser",
+        )
+        self._local = threading.local()
+        self._scrapers = []
+        self._scrapers_lock = threading.Lock()
+        self.pool = None
+
+    def crawl(self, urls):
+        """
+        Scrape ทุก URL -> generator ของ BookingRecord เรียงตามลำดับ URL -> unit
+
+        event loop รันใน thread แยก แล้วส่งผลแต่ละ unit กลับมาทางคิว
+        row จึงออกมาทันทีที่ส่วนต้นครบ (ไม่ต้องรอทุก URL เสร็จ)
+        """
+        events = queue.Queue()
+
+        def run():
+            try:
+                asyncio.run(self._crawl_all(urls, events))
+            except Exception as e:
+                print(f"❌ Error (async crawler): {e}")
+            finally:
+                events.put(None)
+
+        thread = threading.Thread(target=run, name="crawler", daemon=True)
+        thread.start()
+        try:
+            yield from drain(events, len(urls))
+        finally:
+            thread.join()
+            self.executor.shutdown(wait=True)
+            for scraper in self._scrapers:
+                scraper.close()
+
+    async def _crawl_all(self, urls, events):
+        self.pool = HostPool(self.max_per_host)
+        try:
+            await asyncio.gather(
+                *(self._crawl_url(url_idx, url, events) for url_idx, url in enumerate(urls))
+            )
+        finally:
+            await self.pool.close()
+
+    async def _crawl_url(self, url_idx, url, events):
+        """แตก URL เป็น unit (awaitable ที่คืน row) แล้วรอทุก unit พร้อมกัน"""
+        units = []
+        try:
+            site_type = self.detect_site_type(url)
+            if site_type == sites.UNKNOWN:
+                print(f"❌ ไม่รู้จักประเภทเว็บไซต์: {url}")
+            elif site_type in self.ASYNC_SITES:
+                units = await getattr(self, self.ASYNC_SITES[site_type])(url)
+            else:
+                # เว็บอื่นใช้ adapter ของเว็บนั้นใน thread ที่มี Chrome (1 unit ต่อ URL)
+                units = [self._in_browser(url, lambda s: list(s.scrape(url)))]
+        except Exception as e:
+            print(f"❌ Error scraping {url}: {e}")
+
+        events.put(("discovered", url_idx, len(units)))
+        await asyncio.gather(*(
+            self._finish_unit(events, url_idx, unit_idx, unit)
+            for unit_idx, unit in enumerate(units)
+        ))
+
+    async def _finish_unit(self, events, url_idx, unit_idx, unit):
+        rows = []
+        try:
+            rows = await unit
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            events.put(("done", url_idx, unit_idx, rows))
+
+    async def _crawl_deville(self, url):
+        """หาบ้านในหน้ารวม -> 1 unit ต่อ (บ้าน, เดือน)"""
+        houses = None
+        try:
+            with span("deville.listing", site="deville"):
+                html = await self.pool.get_text(url)
+            count_page("deville")
+            listing = http_listing(html)
+            if listing is not None:
+                print_unmatched(listing)
+                houses = listing.houses
+                if self.shard is not None:
+                    houses = self.shard.filter_houses(houses)
+                if self.max_houses > 0:
+                    houses = houses[:self.max_houses]
+                shard = f" (shard {self.shard})" if self.shard is not None else ""
+                print(f"📊 {url}: พบบ้านทั้งหมด {len(houses)} หลัง{shard}")
+            else:
+                # ไม่พบบ้าน (render ด้วย JavaScript / จับคู่ไม่ได้) -> ให้ Chrome หาบ้าน (ไม่ใช่ทุกบ้านว่าง)
+                print("  ⚠️ HTTP ไม่พบบ้านในหน้ารวม - ใช้ Chrome แทน")
+        except Exception as e:
+            print(f"  ⚠️ HTTP โหลดหน้าหลักไม่สำเร็จ ({e}) - ใช้ Chrome แทน")
+
+        if houses is None:
+            # หน้ารวม render ด้วย JavaScript -> หาบ้านด้วย Chrome แล้วดึงปฏิทินผ่าน HTTP
+            # (find_houses บันทึกหน้ารวมที่ไม่พบบ้านลง HostHealth เอง)
+            houses = await self._in_browser(url, lambda s: s.adapter('deville').find_houses(url))
+
+        if self.scheduler is not None:
+            planned = [(house['dv_code'], ym) for house in houses for ym in self.months]
+            chosen = self.scheduler.plan('deville', planned)
+            print(f"🗓️ {url}: ดึงใหม่ {chosen}/{len(planned)} unit (ที่เหลือใช้ข้อมูลเดิม)")
+
+        return [
+            self._deville_unit(url, house, ym)
+            for house in houses
+            for ym in self.months
+        ]
+
+    def _deville_unit(self, url, house, ym):
+        """awaitable ของ (บ้าน, เดือน): row เดิมถ้ายังไม่ถึงรอบ ไม่เช่นนั้นดึงผ่าน checkpoint"""
+        scheduler = self.scheduler
+        if scheduler is not None:
+            rows = scheduler.carried('deville', house['dv_code'], ym)
+            if rows is not None:
+                return _done(rows)
+
+        async def crawl():
+            rows = await self._crawl_deville_month(house, ym)
+            if scheduler is not None:
+                scheduler.observe('deville', house['dv_code'], ym, rows)
+            return rows
+
+        return self._checkpointed((url, house['dv_code'], ym), f"{house['dv_code']} {ym}", crawl)
+
+    async def _checkpointed(self, key, label, crawl):
+        """
+        รอ crawl() ผ่าน checkpoint + HostHealth แบบเดียวกับ CalendarScraper.run_unit
+
+        unit ที่เสร็จแล้ว (--resume) ไม่ส่ง request ใหม่ / unit ที่ error ลองใหม่ตาม HostHealth
+        และไม่ถูกบันทึกถ้ายังไม่สำเร็จ
+        """
+        if self.checkpoint is not None:
+            rows = self.checkpoint.lookup(key)
+            if rows is not None:
+                return rows
+        try:
+            if self.health is None:
+                rows = await crawl()
+            else:
+                rows = await self.health.acall(host_of(key[0]), crawl, label, source=key[1])
+        except Exception as e:
+            skipped = isinstance(e, HostDown)
+            print(f"  {'⏭️ ข้าม' if skipped else '⛔ Error'} ({label}): {e}")
+            self._unit_failed(key, SKIPPED if skipped else FAILED, e)
+            return []
+        if self.checkpoint is not None:
+            self.checkpoint.complete(key, rows)
+        return rows
+
+    def _unit_failed(self, key, reason, error):
+        if self.checkpoint is not None:
+            self.checkpoint.fail()
+        if self.health is not None:
+            self.health.unit_failed(key, reason, error)
+
+    async def _crawl_deville_month(self, house, ym):
+        with span("deville.fetch", site="deville", house=house['dv_code'], month=ym):
+            html = await self.pool.get_text(f"{BASE_IFRAME_URL}?ym={ym}&hId={house['id']}")
+        count_page("deville")
+
+        with span("deville.parse", site="deville", house=house['dv_code'], month=ym):
+            key = cache_key('deville', house['dv_code'], ym)
+            fp = fingerprint([house['name'], html]) if self.cache is not None else None
+            rows = self.cache.lookup(key, fp) if self.cache is not None else None
+            cached = " (cache)" if rows is not None else ""
+            if rows is None:
+                month_text, booked_days = parse_cld_html(html, ym)
+                rows = month_rows(house, ym, month_text, booked_days)
+                if self.cache is not None:
+                    self.cache.store(key, fp, rows)
+
+        label = rows[0].month if rows else ym
+        if rows:
+            days_str = ', '.join(str(row.day.day) for row in rows)
+            print(f"  📅 {house['dv_code']} {label}: {len(rows)} วัน → [{days_str}]{cached}")
+        else:
+            print(f"  📅 {house['dv_code']} {label}: ว่าง ✓{cached}")
+        return rows
+
+    async def _in_browser(self, url, fn):
+        """รัน fn(scraper) ใน thread ที่มี Chrome โดยนับโควตาของ host ด้วย"""
+        loop = asyncio.get_running_loop()
+        async with self.pool.limit(urlparse(url).netloc):
+            return await loop.run_in_executor(
+                self.executor, lambda: fn(self._thread_scraper())
+            )
+
+    def _thread_scraper(self):
+        """CalendarScraper ของ thread ปัจจุบัน (1 Chrome ต่อ thread)"""
+        scraper = getattr(self._local, "scraper", None)
+        if scraper is None:
+            scraper = self.make_scraper()
+            self._local.scraper = scraper
+            with self._scrapers_lock:
+                self._scrapers.append(scraper)
+        return scraper
+
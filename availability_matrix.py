@@ -0,0 +1,144 @@
+"""
+ไฟล์ตารางว่าง/ไม่ว่างแบบ bit-packed (บ้าน × วัน, 2 bit ต่อช่อง)
+
+โครงสร้างไฟล์ (.avm):
+
+    b"AVM1"                    magic
+    uint32 (little-endian)     ความยาว header
+    header (JSON, UTF-8)       {"start", "days", "bits", "row_bytes", "statuses", "houses"}
+    data                       houses × row_bytes — วันที่ i ของบ้าน r อยู่ที่
+                               byte r * row_bytes + i // 4, bit (i % 4) * 2
+
+สถานะ: 0 = ว่าง, 1 = ติดจอง, 2 = รอโอน
+
+Reader เปิดไฟล์ด้วย mmap แล้วตอบ "บ้าน X วันที่ D สถานะอะไร" ได้ทันทีโดยไม่ต้อง parse data
+"""
+import json
+import mmap
+import struct
+from datetime import date
+
+from thai_dates import row_date
+
+MAGIC = b"AVM1"
+BITS = 2
+CELLS_PER_BYTE = 8 // BITS
+STATUSES = ["", "ติดจอง", "รอโอน"]   # index = ค่าในช่อง
+FREE = 0
+
+
+def _house_key(row):
+    return (str(row.get("รหัส", "")).strip(), str(row.get("ชื่อบ้าน", "")).strip())
+
+
+class MatrixBuilder:
+    """
+    สร้างตารางทีละวันที่ (ใช้ได้ระหว่าง scrape โดยไม่ต้องเก็บ row ทั้งหมด)
+    หน่วยความจำ = จำนวนบ้าน × row_bytes
+    """
+
+    def __init__(self, start, days):
+        self.start = start
+        self.days = days
+        self.row_bytes = (days + CELLS_PER_BYTE - 1) // CELLS_PER_BYTE
+        self.rows = {}   # (รหัส, ชื่อบ้าน) -> bytearray(row_bytes)
+
+    def add(self, code, name, day, status):
+        """ใส่สถานะของบ้านวันที่ day (วันที่นอกช่วง / สถานะที่ไม่รู้จักถูกข้าม แต่บ้านยังมีแถว)"""
+        row = self.rows.get((code, name))
+        if row is None:
+            row = self.rows[(code, name)] = bytearray(self.row_bytes)
+        if status not in STATUSES or status == STATUSES[FREE] or day is None:
+            return
+        offset = (day - self.start).days
+        if not 0 <= offset < self.days:
+            return
+        pos = offset // CELLS_PER_BYTE
+        shift = (offset % CELLS_PER_BYTE) * BITS
+        row[pos] = (row[pos] & ~(0b11 << shift)) | (STATUSES.index(status) << shift)
+
+    def add_row(self, row):
+        code, name = _house_key(row)
+        self.add(code, name, row_date(row), row.get("สถานะ", ""))
+
+    def build(self):
+        """-> (houses, data) เรียงบ้านตามรหัส"""
+        houses = sorted(self.rows)
+        return houses, b"".join(self.rows[house] for house in houses)
+
+    def write(self, path):
+        """เขียนไฟล์ .avm -> จำนวนบ้าน"""
+        houses, data = self.build()
+        header = json.dumps({
+            "start": self.start.isoformat(),
+            "days": self.days,
+            "bits": BITS,
+            "row_bytes": self.row_bytes,
+            "statuses": STATUSES,
+            "houses": [list(h) for h in houses],
+        }, ensure_ascii=False).encode("utf-8")
+
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(data)
+        return len(houses)
+
+
+class AvailabilityMatrix:
+    """
+    อ่านไฟล์ .avm ผ่าน mmap
+
+        with AvailabilityMatrix("booking_result.avm") as m:
+            m.status("DV-2606", date(2026, 3, 8))   # -> "ติดจอง" / "รอโอน" / ""
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: ไม่ใช่ไฟล์ availability matrix")
+
+        (header_len,) = struct.unpack_from("<I", self._mm, 4)
+        header = json.loads(self._mm[8:8 + header_len].decode("utf-8"))
+        self._data_offset = 8 + header_len
+
+        self.start = date.fromisoformat(header["start"])
+        self.days = header["days"]
+        self.row_bytes = header["row_bytes"]
+        self.statuses = header["statuses"]
+        self.houses = [tuple(h) for h in header["houses"]]
+
+        # รหัสบ้าน -> แถว (ถ้ารหัสซ้ำ ใช้ชื่อบ้านแยก)
+        self._rows = {}
+        for i, (code, name) in enumerate(self.houses):
+            self._rows.setdefault(code, i)
+            self._rows[(code, name)] = i
+
+    def row_of(self, code, name=None):
+        """แถวของบ้าน (KeyError ถ้าไม่พบ)"""
+        return self._rows[(code, name)] if name is not None else self._rows[code]
+
+    def status_code(self, code, day, name=None):
+        """ค่าในช่อง (0 = ว่าง, 1 = ติดจอง, 2 = รอโอน) ของบ้าน code วันที่ day"""
+        offset = (day - self.start).days
+        if not 0 <= offset < self.days:
+            raise IndexError(f"{day} อยู่นอกช่วง {self.start} + {self.days} วัน")
+        pos = self._data_offset + self.row_of(code, name) * self.row_bytes + offset // CELLS_PER_BYTE
+        return (self._mm[pos] >> ((offset % CELLS_PER_BYTE) * BITS)) & 0b11
+
+    def status(self, code, day, name=None):
+        """สถานะของบ้าน code วันที่ day ("" = ว่าง)"""
+        return self.statuses[self.status_code(code, day, name)]
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,226 @@
+"""
+ค้นหาบ้านว่างตามช่วงวันที่จากผลลัพธ์ที่ scrape มา
+
+โหลด booking_result.json / .csv แล้วสร้าง index ช่วงวันที่ไม่ว่างของแต่ละบ้าน
+(วันติดจอง/รอโอนที่ติดกันถูกรวมเป็น 1 ช่วง) ค้นหาด้วย bisect จึงเร็วแม้มีหลายพันหลัง
+
+ทุกช่วงเป็นแบบ [เริ่ม, สิ้นสุด) เหมือนการเข้าพัก: check-in D1 check-out D2
+= พักคืนวันที่ D1 .. D2-1
+
+ใช้จาก command line:
+
+    python availability_query.py free 2026-03-10 2026-03-12
+    python availability_query.py check DV-2606 2026-03-10 2026-03-12
+    python availability_query.py window DV-2606 --nights 3 --from 2026-03-01
+    python availability_query.py nights DV-2606 2026-03-01 2026-04-01
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+from thai_dates import row_date
+
+DEFAULT_FILE = "booking_result.json"
+
+
+def load_rows(path):
+    """โหลด row จาก .json / .ndjson / .csv"""
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".ndjson"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+class AvailabilityIndex:
+    """Index ช่วงวันที่ไม่ว่าง (stay) ของแต่ละบ้าน"""
+
+    def __init__(self, rows):
+        days_by_house = {}
+        self.names = {}
+        first = last = None
+
+        for row in rows:
+            d = row_date(row)
+            if d is None:
+                continue
+            code = str(row.get("รหัส", "")).strip()
+            self.names.setdefault(code, str(row.get("ชื่อบ้าน", "")).strip())
+            days_by_house.setdefault(code, set()).add(d)
+            first = d if first is None or d < first else first
+            last = d if last is None or d > last else last
+
+        # ช่วงที่มีข้อมูล: ตั้งแต่ต้นเดือนแรกถึงสิ้นเดือนสุดท้ายที่พบ
+        self.first_day = first.replace(day=1) if first else None
+        self.last_day = _month_end(last) if last else None
+
+        # รวมวันที่ติดกันเป็นช่วง [start, end)
+        self.starts = {}
+        self.ends = {}
+        for code, days in days_by_house.items():
+            starts, ends = [], []
+            for d in sorted(days):
+                if ends and ends[-1] == d:
+                    ends[-1] = d + timedelta(days=1)
+                else:
+                    starts.append(d)
+                    ends.append(d + timedelta(days=1))
+            self.starts[code] = starts
+            self.ends[code] = ends
+
+    @classmethod
+    def load(cls, path):
+        return cls(load_rows(path))
+
+    @property
+    def houses(self):
+        """รหัสบ้านทั้งหมด (เรียง)"""
+        return sorted(self.names)
+
+    def stays(self, code):
+        """ช่วงไม่ว่างทั้งหมดของบ้าน -> list ของ (start, end)"""
+        return list(zip(self.starts.get(code, []), self.ends.get(code, [])))
+
+    def covers(self, start, end):
+        """ช่วง [start, end) อยู่ในช่วงที่มีข้อมูลหรือไม่ (นอกช่วงถือว่าว่างเพราะไม่รู้)"""
+        return (
+            self.first_day is not None
+            and start >= self.first_day
+            and end - timedelta(days=1) <= self.last_day
+        )
+
+    def is_free(self, code, checkin, checkout):
+        """ว่างทุกคืนตั้งแต่ checkin ถึง checkout-1 หรือไม่"""
+        starts = self.starts.get(code)
+        if not starts:
+            return True
+        ends = self.ends[code]
+        # ช่วงสุดท้ายที่เริ่มก่อน checkout ต้องจบก่อน (หรือตรงกับ) checkin
+        i = bisect_left(starts, checkout) - 1
+        return i < 0 or ends[i] <= checkin
+
+    def free_houses(self, checkin, checkout):
+        """รหัสบ้านที่ว่างตลอดช่วง check-in / check-out"""
+        return [code for code in self.houses if self.is_free(code, checkin, checkout)]
+
+    def first_free_window(self, code, nights, start, until=None):
+        """
+        ช่วงว่างแรกที่พักได้ nights คืน เริ่มไม่ก่อน start (และ check-out ไม่เกิน until)
+        -> (checkin, checkout) หรือ None
+        """
+        need = timedelta(days=nights)
+        starts = self.starts.get(code, [])
+        ends = self.ends.get(code, [])
+
+        cursor = start
+        i = bisect_right(ends, cursor)   # ข้ามช่วงที่จบก่อน/ตรงกับ cursor
+        while i < len(starts):
+            if starts[i] - cursor >= need:
+                break
+            cursor = max(cursor, ends[i])
+            i += 1
+
+        if until is not None and cursor + need > until:
+            return None
+        return cursor, cursor + need
+
+    def free_nights(self, code, start, end):
+        """จำนวนคืนที่ว่างในช่วง [start, end)"""
+        total = max(0, (end - start).days)
+        starts = self.starts.get(code, [])
+        ends = self.ends.get(code, [])
+        i = bisect_right(ends, start)
+        while i < len(starts) and starts[i] < end:
+            total -= (min(ends[i], end) - max(starts[i], start)).days
+            i += 1
+        return total
+
+
+def _month_end(d):
+    """วันสุดท้ายของเดือนของ d"""
+    next_month = (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def _parse_date(text):
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ค้นหาบ้านว่างจากผลลัพธ์การ scrape")
+    parser.add_argument("--file", default=DEFAULT_FILE, help=f"ไฟล์ผลลัพธ์ (ค่าเริ่มต้น {DEFAULT_FILE})")
+    parser.add_argument("--json", action="store_true", help="แสดงผลเป็น JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("free", help="บ้านที่ว่างตลอดช่วง check-in / check-out")
+    p.add_argument("checkin", type=_parse_date)
+    p.add_argument("checkout", type=_parse_date)
+
+    p = sub.add_parser("check", help="บ้านหลังนี้ว่างช่วงนี้หรือไม่")
+    p.add_argument("code")
+    p.add_argument("checkin", type=_parse_date)
+    p.add_argument("checkout", type=_parse_date)
+
+    p = sub.add_parser("window", help="ช่วงว่างแรกที่พักได้ N คืน")
+    p.add_argument("code")
+    p.add_argument("--nights", type=int, default=1)
+    p.add_argument("--from", dest="start", type=_parse_date, default=date.today())
+    p.add_argument("--until", type=_parse_date, default=None)
+
+    p = sub.add_parser("nights", help="จำนวนคืนที่ว่างในช่วง")
+    p.add_argument("code")
+    p.add_argument("start", type=_parse_date)
+    p.add_argument("end", type=_parse_date)
+
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.file):
+        print(f"⛔ ไม่พบไฟล์ {args.file}")
+        return 1
+    index = AvailabilityIndex.load(args.file)
+
+    if args.command == "free":
+        codes = index.free_houses(args.checkin, args.checkout)
+        result = [{"รหัส": c, "ชื่อบ้าน": index.names[c]} for c in codes]
+        if not index.covers(args.checkin, args.checkout):
+            print("⚠️ ช่วงวันที่อยู่นอกข้อมูลที่ดึงมา - วันที่ไม่มีข้อมูลถือว่าว่าง", file=sys.stderr)
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            print(f"🏠 ว่าง {len(codes)} หลัง ({args.checkin} → {args.checkout}):")
+            for r in result:
+                print(f"   {r['รหัส']:<12} {r['ชื่อบ้าน']}")
+    elif args.command == "check":
+        free = index.is_free(args.code, args.checkin, args.checkout)
+        if args.json:
+            print(json.dumps({"รหัส": args.code, "ว่าง": free}, ensure_ascii=False))
+        else:
+            print(f"{args.code}: {'ว่าง ✓' if free else 'ไม่ว่าง ✗'} ({args.checkin} → {args.checkout})")
+    elif args.command == "window":
+        window = index.first_free_window(args.code, args.nights, args.start, args.until)
+        if args.json:
+            print(json.dumps(
+                {"รหัส": args.code, "checkin": window[0].isoformat(), "checkout": window[1].isoformat()}
+                if window else None, ensure_ascii=False,
+            ))
+        elif window:
+            print(f"{args.code}: ว่าง {args.nights} คืนแรก {window[0]} → {window[1]}")
+        else:
+            print(f"{args.code}: ไม่พบช่วงว่าง {args.nights} คืน")
+    elif args.command == "nights":
+        n = index.free_nights(args.code, args.start, args.end)
+        if args.json:
+            print(json.dumps({"รหัส": args.code, "คืนว่าง": n}, ensure_ascii=False))
+        else:
+            print(f"{args.code}: ว่าง {n} คืน ({args.start} → {args.end})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
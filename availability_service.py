@@ -0,0 +1,301 @@
+"""
+HTTP service ตอบสถานะว่าง/ไม่ว่างจาก index ในหน่วยความจำ
+
+โหลด booking_result.json ครั้งเดียว แล้วตอบ query เป็น JSON แทนที่ client ทุกตัว
+จะต้องโหลดไฟล์ทั้งก้อนไปหาเอง
+
+    python availability_service.py --port 8765
+
+Endpoint (GET):
+
+    /health                                 สถานะ index (จำนวนบ้าน, เวลาโหลด, etag)
+    /houses                                 รายชื่อบ้านทั้งหมด
+    /house/<รหัส>                           วันที่ไม่ว่างของบ้าน แยกตามเดือน + ช่วง stay
+    /month/<YYYY-MM>                        วันที่ไม่ว่างของทุกบ้านในเดือนนั้น
+    /free?checkin=YYYY-MM-DD&checkout=...   บ้านที่ว่างตลอดช่วง
+    /check?code=..&checkin=..&checkout=..   บ้านหลังนี้ว่างหรือไม่
+    /window?code=..&nights=3[&from=..&until=..]
+    /nights?code=..&start=..&end=..
+
+ทุก response มี ETag (ผูกกับข้อมูลชุดปัจจุบัน + URL) ส่ง If-None-Match มาจะได้ 304
+
+อัปเดตข้อมูล:
+- เฝ้าดูไฟล์ (mtime) ทุก --watch วินาที แล้วโหลดใหม่เมื่อไฟล์เปลี่ยน
+- POST /push (body = JSON list ของ row) จาก main() หลัง scrape เสร็จ
+- POST /reload บังคับโหลดไฟล์ใหม่
+
+index ใหม่ถูกสร้างเสร็จก่อนแล้วค่อยสลับ reference ทีเดียว request ที่กำลังทำงาน
+จะใช้ index เดิมจนจบ ไม่มี request ไหนเห็นข้อมูลครึ่ง ๆ กลาง ๆ
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from availability_query import AvailabilityIndex, load_rows
+from calendar_cache import fingerprint
+from thai_dates import row_date
+
+DEFAULT_FILE = "booking_result.json"
+DEFAULT_PORT = 8765
+RESPONSE_CACHE_SIZE = 2048   # จำนวน response ที่ encode แล้วเก็บไว้ต่อ snapshot
+
+
+class Snapshot:
+    """ข้อมูลชุดหนึ่ง (ไม่เปลี่ยนหลังสร้าง) + response ที่ encode แล้ว"""
+
+    def __init__(self, rows, source=""):
+        self.index = AvailabilityIndex(rows)
+        self.etag = fingerprint(rows)[:16]
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        self.source = source
+        self.row_count = len(rows)
+
+        # รหัส -> "YYYY-MM" -> {วันที่: สถานะ} และ "YYYY-MM" -> รหัส -> {วันที่: สถานะ}
+        self.by_house = {}
+        self.by_month = {}
+        for row in rows:
+            d = row_date(row)
+            if d is None:
+                continue
+            code = str(row.get("รหัส", "")).strip()
+            ym = f"{d.year:04d}-{d.month:02d}"
+            status = row.get("สถานะ", "")
+            self.by_house.setdefault(code, {}).setdefault(ym, {})[d.day] = status
+            self.by_month.setdefault(ym, {}).setdefault(code, {})[d.day] = status
+
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def response(self, target, build):
+        """(etag, body) ของ URL นี้ - เรียก build(snapshot) ครั้งแรกแล้วเก็บไว้"""
+        cached = self._responses.get(target)
+        if cached is not None:
+            return cached
+        body = json.dumps(build(self), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha1(f"{self.etag}|{target}".encode("utf-8")).hexdigest()[:20] + '"'
+        with self._lock:
+            if len(self._responses) >= RESPONSE_CACHE_SIZE:
+                self._responses.clear()
+            self._responses[target] = (etag, body)
+        return etag, body
+
+
+class AvailabilityService:
+    """ถือ Snapshot ปัจจุบัน และสลับเป็นชุดใหม่เมื่อไฟล์เปลี่ยนหรือมีการ push"""
+
+    def __init__(self, path=DEFAULT_FILE):
+        self.path = path
+        self.snapshot = Snapshot([], source="(empty)")
+        self._mtime = None
+        self._reload_lock = threading.Lock()
+
+    def reload(self):
+        """โหลดไฟล์ใหม่ -> True ถ้าสลับ snapshot"""
+        with self._reload_lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+                rows = load_rows(self.path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ โหลด {self.path} ไม่สำเร็จ: {e}")
+                return False
+            self._mtime = mtime
+            return self._swap(rows, self.path)
+
+    def push(self, rows):
+        """รับ row ชุดใหม่โดยตรง (จาก main) แล้วสลับ snapshot"""
+        with self._reload_lock:
+            return self._swap(rows, "push")
+
+    def _swap(self, rows, source):
+        snapshot = Snapshot(rows, source=source)
+        if snapshot.etag == self.snapshot.etag:
+            return False
+        self.snapshot = snapshot   # สลับ reference ทีเดียว
+        print(f"🔄 โหลดข้อมูลใหม่ ({source}): {len(snapshot.index.names)} หลัง, {snapshot.row_count} รายการ")
+        return True
+
+    def watch(self, interval):
+        """thread เฝ้าดู mtime ของไฟล์"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    mtime = os.path.getmtime(self.path)
+                except OSError:
+                    continue
+                if mtime != self._mtime:
+                    self.reload()
+
+        thread = threading.Thread(target=loop, name="availability-watch", daemon=True)
+        thread.start()
+        return thread
+
+    # ---------------------------------------------------------------- query
+
+    def handle(self, path, query):
+        """(status, builder) ของ GET request - builder รับ snapshot คืน dict/list"""
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        name = parts[0] if parts else "health"
+        arg = lambda key, default=None: query.get(key, [default])[0]
+
+        if name == "health":
+            return 200, lambda s: {
+                "etag": s.etag, "loaded_at": s.loaded_at, "source": s.source,
+                "houses": len(s.index.names), "rows": s.row_count,
+                "first_day": _iso(s.index.first_day), "last_day": _iso(s.index.last_day),
+            }
+        if name == "houses":
+            return 200, lambda s: [{"รหัส": c, "ชื่อบ้าน": s.index.names[c]} for c in s.index.houses]
+        if name == "house" and len(parts) == 2:
+            code = parts[1]
+            return 200, lambda s: None if code not in s.index.names else {
+                "รหัส": code,
+                "ชื่อบ้าน": s.index.names[code],
+                "months": s.by_house.get(code, {}),
+                "stays": [[a.isoformat(), b.isoformat()] for a, b in s.index.stays(code)],
+            }
+        if name == "month" and len(parts) == 2:
+            ym = parts[1]
+            return 200, lambda s: s.by_month.get(ym, {})
+        if name == "free":
+            checkin, checkout = _date(arg("checkin")), _date(arg("checkout"))
+            return 200, lambda s: {
+                "checkin": checkin.isoformat(), "checkout": checkout.isoformat(),
+                "covered": s.index.covers(checkin, checkout),
+                "houses": [{"รหัส": c, "ชื่อบ้าน": s.index.names[c]}
+                           for c in s.index.free_houses(checkin, checkout)],
+            }
+        if name == "check":
+            code, checkin, checkout = arg("code", ""), _date(arg("checkin")), _date(arg("checkout"))
+            return 200, lambda s: {
+                "รหัส": code, "ว่าง": s.index.is_free(code, checkin, checkout),
+                "covered": s.index.covers(checkin, checkout),
+            }
+        if name == "window":
+            code, nights = arg("code", ""), int(arg("nights", 1))
+            start = _date(arg("from")) if arg("from") else date.today()
+            until = _date(arg("until")) if arg("until") else None
+
+            def build(s):
+                window = s.index.first_free_window(code, nights, start, until)
+                return {"รหัส": code, "nights": nights,
+                        "checkin": _iso(window and window[0]), "checkout": _iso(window and window[1])}
+            return 200, build
+        if name == "nights":
+            code, start, end = arg("code", ""), _date(arg("start")), _date(arg("end"))
+            return 200, lambda s: {"รหัส": code, "คืนว่าง": s.index.free_nights(code, start, end)}
+        return 404, None
+
+
+def _date(text):
+    if not text:
+        raise ValueError("ต้องระบุวันที่ (YYYY-MM-DD)")
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def _iso(d):
+    return d.isoformat() if d else None
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+        disable_nagle_algorithm = True   # ส่ง header + body ทันที (ไม่ติด delayed ACK 40 ms)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            snapshot = service.snapshot   # ใช้ snapshot เดียวตลอด request
+            try:
+                status, build = service.handle(url.path, parse_qs(url.query))
+            except ValueError as e:
+                return self._send(400, json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8"))
+            if build is None:
+                return self._send(404, b'{"error":"not found"}')
+
+            etag, body = snapshot.response(self.path, build)
+            if body == b"null":
+                return self._send(404, b'{"error":"not found"}')
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", etag)
+            self._send(status, body, etag)
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            if url.path == "/reload":
+                changed = service.reload()
+            elif url.path == "/push":
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    rows = json.loads(self.rfile.read(length).decode("utf-8"))
+                except ValueError as e:
+                    return self._send(400, json.dumps({"error": str(e)}).encode("utf-8"))
+                if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                    return self._send(400, b'{"error":"body must be a JSON list of rows"}')
+                changed = service.push(rows)
+            else:
+                return self._send(404, b'{"error":"not found"}')
+            self._send(200, json.dumps({"changed": changed, "etag": service.snapshot.etag}).encode("utf-8"))
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def push_rows(service_url, rows, timeout=10):
+    """ส่ง row ชุดใหม่ไปให้ service (ใช้จาก main หลัง scrape เสร็จ)"""
+    request = urllib.request.Request(
+        service_url.rstrip("/") + "/push",
+        data=json.dumps(rows, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service สถานะว่าง/ไม่ว่างของบ้าน")
+    parser.add_argument("--file", default=DEFAULT_FILE, help=f"ไฟล์ผลลัพธ์ (ค่าเริ่มต้น {DEFAULT_FILE})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--watch", type=float, default=5.0, help="ตรวจไฟล์ทุกกี่วินาที (0 = ไม่ตรวจ)")
+    args = parser.parse_args(argv)
+
+    service = AvailabilityService(args.file)
+    service.reload()
+    if args.watch > 0:
+        service.watch(args.watch)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    server.daemon_threads = True
+    print(f"🌐 Availability service: http://{args.host}:{args.port}/ ({args.file})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Benchmark การ parse ปฏิทินแบบ offline (ไม่โหลดหน้าเว็บ ไม่เปิด Chrome)
+
+วัดเฉพาะต้นทุนฝั่ง Python ของแต่ละ adapter จากหน้าที่บันทึกไว้ใน fixtures/:
+
+    fixtures/deville_listing/*.html      หน้ารวมปฏิทิน Deville     -> find_deville_houses
+    fixtures/deville_cld/*.html          cld.php                   -> parse_cld_html + month_rows
+    fixtures/fullcalendar/*.html         หน้า Pool Villa City        -> classify_fullcalendar
+    fixtures/fullcalendar_events/*.json  event จาก FullCalendar API -> expand_fullcalendar_events
+    fixtures/pattaya/*.html              หน้า Pattaya Party          -> classify_pattaya + month_records
+
+ไฟล์ debug_madagascar4_*.html (cld.php) และ debug_calendar.html (Pattaya) ที่ scraper
+บันทึกไว้ในโฟลเดอร์ปัจจุบันถูกนำมาใช้ด้วย
+
+หน้า FullCalendar / Pattaya ใน production ถูกแปลงเป็น cell ด้วย execute_script ในเบราว์เซอร์
+ที่นี่แปลง HTML เป็น cell แบบเดียวกันครั้งเดียวตอนโหลด fixture (ไม่นับเวลา) แล้ววัดเฉพาะการจัดประเภท
+ใช้ไฟล์ *.cells.json (ผลของ execute_script ที่บันทึกไว้) แทน HTML ก็ได้
+
+    python bench_parsers.py --make-fixtures          # สร้าง fixture ตัวอย่าง (ถ้ายังไม่มีของจริง)
+    python bench_parsers.py --repeat 20 --output bench_results.json
+    python bench_parsers.py --compare bench_results.json   # เทียบกับผลรอบก่อน
+"""
+import argparse
+import calendar
+import glob
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from html.parser import HTMLParser
+
+from booking_record import BookingStatus, month_records
+from deville_http import VOID_TAGS, find_deville_houses, month_rows, parse_cld_html
+from dom_extract import classify_fullcalendar, classify_pattaya, expand_fullcalendar_events
+from thai_dates import month_label, parse_month_label
+
+FIXTURES_DIR = "fixtures"
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_YM = "2026-03"
+
+
+# ========================================================
+# HTML -> cell แบบเดียวกับ *_CELLS_JS ใน dom_extract (ใช้ตอนโหลด fixture เท่านั้น)
+# ========================================================
+class _Node:
+    __slots__ = ("tag", "attrs", "children", "text")
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.text = []
+
+    @property
+    def classes(self):
+        return self.attrs.get("class") or ""
+
+    def has_class(self, name):
+        return name in self.classes.split()
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def inner_text(self):
+        return "".join(self.text) + "".join(child.inner_text() for child in self.children)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#root", {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, dict((k, v or "") for k, v in attrs))
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data):
+        self._stack[-1].text.append(data)
+
+
+def _parse_tree(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def fullcalendar_cells(html):
+    """เหมือน FULLCALENDAR_CELLS_JS"""
+    cells = []
+    for td in _parse_tree(html).descendants():
+        if td.tag != "td" or not td.has_class("fc-daygrid-day"):
+            continue
+        num = next((n for n in td.descendants() if n.has_class("fc-daygrid-day-number")), None)
+        events = [n for n in td.descendants() if n.has_class("fc-bg-event")]
+        cells.append((
+            num.inner_text().strip() if num else "",
+            " ".join([td.classes] + [ev.classes for ev in events]),
+            ";".join(ev.attrs.get("style", "") for ev in events),
+            td.attrs.get("data-date", ""),
+        ))
+    return cells
+
+
+def pattaya_cells(html):
+    """เหมือน PATTAYA_CELLS_JS"""
+    root = _parse_tree(html)
+    grids = [n for n in root.descendants()
+             if n.tag == "div" and n.has_class("grid") and n.has_class("grid-cols-7")]
+    scope = grids[1] if len(grids) > 1 else (grids[0] if grids else root)
+    return [
+        (n.inner_text().strip(), n.classes, n.attrs.get("style", ""), n.attrs.get("data-date", ""))
+        for n in scope.descendants()
+        if n.tag == "div" and n.has_class("aspect-square")
+    ]
+
+
+# ========================================================
+# adapter: โหลด fixture (ไม่นับเวลา) + ฟังก์ชันที่วัด (คืนจำนวน row)
+# ========================================================
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _ym_from_name(path):
+    match = re.search(r"(\d{4}-\d{2})", os.path.basename(path))
+    return match.group(1) if match else DEFAULT_YM
+
+
+def _load_cells(path, from_html):
+    if path.endswith(".json"):
+        return [tuple(cell) for cell in json.loads(_read(path))]
+    return from_html(_read(path))
+
+
+def _month_of_cells(path, cells):
+    """ปี/เดือนของหน้า: จาก data-date ของ cell ถ้ามี ไม่เช่นนั้นจากชื่อไฟล์"""
+    dates = sorted(c[3] for c in cells if c[3])
+    if dates:
+        return int(dates[len(dates) // 2][:4]), int(dates[len(dates) // 2][5:7])
+    return parse_month_label(_ym_from_name(path))
+
+
+def _deville_listing(paths):
+    pages = [_read(p) for p in paths]
+    return pages, lambda html: len(find_deville_houses(html))
+
+
+def _deville_cld(paths):
+    house = {'id': '0', 'name': 'Bench Villa', 'dv_code': 'DV-0'}
+    pages = [(_read(p), _ym_from_name(p)) for p in paths]
+
+    def run(page):
+        html, ym = page
+        month_text, booked_days = parse_cld_html(html, ym)
+        return len(month_rows(house, ym, month_text, booked_days))
+    return pages, run
+
+
+def _fullcalendar(paths):
+    pages = [_load_cells(p, fullcalendar_cells) for p in paths]
+    return pages, lambda cells: len(classify_fullcalendar(cells))
+
+
+def _fullcalendar_events(paths):
+    pages = []
+    for p in paths:
+        data = json.loads(_read(p))
+        pages.append(data.get("events", []) if isinstance(data, dict) else data)
+    return pages, lambda events: len(expand_fullcalendar_events(events))
+
+
+def _pattaya(paths):
+    pages = []
+    for p in paths:
+        cells = _load_cells(p, pattaya_cells)
+        pages.append((cells, *_month_of_cells(p, cells)))
+
+    def run(page):
+        cells, year, month = page
+        booked, pending = classify_pattaya(cells, calendar.monthrange(year, month)[1])
+        return len(
+            month_records("Bench Villa", "DV-0", year, month, booked, BookingStatus.BOOKED)
+            + month_records("Bench Villa", "DV-0", year, month, pending, BookingStatus.PENDING)
+        )
+    return pages, run
+
+
+# ชื่อ adapter -> (pattern ของ fixture, ฟังก์ชันโหลด)
+ADAPTERS = {
+    "deville_listing": (["deville_listing/*.html"], _deville_listing),
+    "deville_cld": (["deville_cld/*.html", "../debug_madagascar4_*.html"], _deville_cld),
+    "fullcalendar": (["fullcalendar/*.html", "fullcalendar/*.cells.json"], _fullcalendar),
+    "fullcalendar_events": (["fullcalendar_events/*.json"], _fullcalendar_events),
+    "pattaya": (["pattaya/*.html", "pattaya/*.cells.json", "../debug_calendar.html"], _pattaya),
+}
+
+
+def fixture_paths(fixtures_dir, patterns):
+    paths = []
+    for pattern in patterns:
+        if pattern.startswith("../"):
+            paths.extend(glob.glob(pattern[3:]))
+        else:
+            paths.extend(glob.glob(os.path.join(fixtures_dir, pattern)))
+    return sorted(set(paths))
+
+
+def bench_adapter(pages, run, warmup, repeat):
+    """วัดเวลาของการ parse ทุกหน้า (1 รอบ) ซ้ำ repeat ครั้ง หลัง warm-up"""
+    for _ in range(warmup):
+        for page in pages:
+            run(page)
+
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        rows = 0
+        started = time.perf_counter()
+        for page in pages:
+            rows += run(page)
+        timings.append(time.perf_counter() - started)
+
+    median = statistics.median(timings)
+    return {
+        "pages": len(pages),
+        "rows_per_pass": rows,
+        "repeat": repeat,
+        "best_s": round(min(timings), 6),
+        "median_s": round(median, 6),
+        "pages_per_sec": round(len(pages) / median, 1) if median else None,
+        "rows_per_sec": round(rows / median, 1) if median else None,
+    }
+
+
+# ========================================================
+# fixture ตัวอย่าง (โครงสร้างเดียวกับหน้าจริง) สำหรับเครื่องที่ยังไม่มีหน้าที่บันทึกไว้
+# ========================================================
+def make_fixtures(fixtures_dir, pages=20, houses=200, seed=1):
+    rng = random.Random(seed)
+    first = date(2026, 3, 1)
+
+    def write(sub, name, text):
+        os.makedirs(os.path.join(fixtures_dir, sub), exist_ok=True)
+        with open(os.path.join(fixtures_dir, sub, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def months():
+        for i in range(pages):
+            year, month = first.year + (first.month - 1 + i) // 12, (first.month - 1 + i) % 12 + 1
+            yield i, year, month, calendar.monthrange(year, month)[1]
+
+    # หน้ารวม Deville
+    blocks = [
+        f'<div class="col"><h6>(DV-{2000 + i})<br>Bench Villa {i}</h6>'
+        f'<iframe src="cld.php?hId={3000 + i}" width="100%"></iframe></div>'
+        for i in range(houses)
+    ]
+    write("deville_listing", "synthetic.html", "<html><body>" + "\n".join(blocks) + "</body></html>")
+
+    # หน้ารวม 500 หลังที่มีเนื้อหาคั่นระหว่างหัวบ้านกับ iframe แบบหน้าจริง
+    # บางหลังไม่มี iframe (regex .*? เดิมต้องไล่ข้ามไปถึงบ้านถัดไปทุกครั้ง)
+    card = ('<div class="card-body"><p class="text-muted">' + "ห้องนอน 4 ห้องน้ำ 5 สระว่ายน้ำส่วนตัว " * 8
+            + '</p><img src="/images/villa.jpg" alt=""><a class="btn" href="#">จอง</a></div>')
+    blocks = []
+    for i in range(500):
+        iframe = "" if i % 50 == 49 else f'<iframe src="cld.php?hId={5000 + i}" width="100%" height="330"></iframe>'
+        blocks.append(f'<div class="col-md-4"><h6>(DV-{4000 + i})<br>Listing Villa {i}</h6>{card}{iframe}</div>')
+    write("deville_listing", "synthetic_500.html", "<html><body>" + "\n".join(blocks) + "</body></html>")
+
+    for i, year, month, days in months():
+        lead = date(year, month, 1).weekday()
+        status = [rng.choice(["", "", "booking", "waiting"]) for _ in range(days)]
+
+        # cld.php
+        tds = [f'<td class="prev"><div>{28 + k}</div></td>' for k in range(lead)]
+        tds += [f'<td class="{status[d]}"><div>{d + 1}</div><span>฿</span></td>' for d in range(days)]
+        rows_html = "".join(
+            "<tr>" + "".join(tds[k:k + 7]) + "</tr>" for k in range(0, len(tds), 7)
+        )
+        write("deville_cld", f"synthetic_{year}-{month:02d}.html",
+              f'<table><tr><th colspan="7">Bench Villa<br>{month_label(year, month)}</th></tr>{rows_html}</table>')
+
+        # FullCalendar (view 6 สัปดาห์)
+        start = date(year, month, 1) - timedelta(days=lead)
+        fc = []
+        for k in range(42):
+            d = start + timedelta(days=k)
+            event = ('<div class="fc-daygrid-bg-harness"><div class="fc-bg-event" '
+                     'style="background-color: rgb(248, 229, 231);"></div></div>') if rng.random() < 0.3 else ""
+            fc.append(f'<td class="fc-day fc-daygrid-day" data-date="{d.isoformat()}"><div class="fc-daygrid-day-frame">'
+                      f'<a class="fc-daygrid-day-number">{d.day}</a>{event}</div></td>')
+        fc_rows = "".join("<tr>" + "".join(fc[k:k + 7]) + "</tr>" for k in range(0, 42, 7))
+        write("fullcalendar", f"synthetic_{year}-{month:02d}.html",
+              f'<html><body><h1>CITY-{i}</h1><div class="fc"><table>{fc_rows}</table></div></body></html>')
+
+        # event จาก FullCalendar API
+        events = []
+        d = date(year, month, 1)
+        while d.month == month:
+            nights = rng.randint(1, 4)
+            if rng.random() < 0.4:
+                events.append({"start": d.isoformat(), "end": (d + timedelta(days=nights)).isoformat(),
+                               "allDay": True, "display": "background", "color": "#f8e5e7", "classNames": ""})
+            d += timedelta(days=nights)
+        write("fullcalendar_events", f"synthetic_{year}-{month:02d}.json", json.dumps({"source": "feed", "events": events}))
+
+        # Pattaya Party (grid หัววัน + grid ตัวเลขวัน)
+        head = "".join(f"<div>{n}</div>" for n in ["อา", "จ", "อ", "พ", "พฤ", "ศ", "ส"])
+        cells = [f'<div class="aspect-square text-gray-400">{28 + k}</div>' for k in range(lead)]
+        for d in range(days):
+            color = rng.choice(["", "", "bg-red-500 text-white", "bg-green-500 text-white"])
+            cells.append(f'<div class="aspect-square rounded {color}"><span>{d + 1}</span></div>')
+        write("pattaya", f"synthetic_{year}-{month:02d}.html",
+              f'<div><h2>{month_label(year, month)}</h2><div class="grid grid-cols-7">{head}</div>'
+              f'<div class="grid grid-cols-7 gap-1">{"".join(cells)}</div></div>')
+
+
+def compare(previous, current):
+    """พิมพ์การเปลี่ยนแปลง pages/sec เทียบกับผลรอบก่อน"""
+    print(f"\n📈 เทียบกับ {previous.get('timestamp', '?')}:")
+    for name, result in current["results"].items():
+        old = previous.get("results", {}).get(name)
+        if not old or not old.get("pages_per_sec") or not result.get("pages_per_sec"):
+            continue
+        change = (result["pages_per_sec"] / old["pages_per_sec"] - 1) * 100
+        mark = "⚠️" if change < -10 else "  "
+        print(f"  {mark} {name:<20} {old['pages_per_sec']:>10,.1f} → {result['pages_per_sec']:>10,.1f} pages/s ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark การ parse ปฏิทินแบบ offline")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help=f"โฟลเดอร์ fixture (ค่าเริ่มต้น {FIXTURES_DIR})")
+    parser.add_argument("--adapter", action="append", choices=sorted(ADAPTERS), help="เลือกเฉพาะ adapter (ใส่ซ้ำได้)")
+    parser.add_argument("--warmup", type=int, default=3, help="จำนวนรอบ warm-up (ไม่นับเวลา)")
+    parser.add_argument("--repeat", type=int, default=10, help="จำนวนรอบที่วัด")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="ไฟล์ JSON ผลลัพธ์ ('' = ไม่บันทึก)")
+    parser.add_argument("--compare", help="ไฟล์ JSON ผลรอบก่อนที่จะเทียบ")
+    parser.add_argument("--make-fixtures", action="store_true", help="สร้าง fixture ตัวอย่างแล้วจบ")
+    args = parser.parse_args(argv)
+
+    if args.make_fixtures:
+        make_fixtures(args.fixtures)
+        print(f"📁 สร้าง fixture ตัวอย่างใน {args.fixtures}/")
+        return 0
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "warmup": args.warmup,
+        "results": {},
+    }
+
+    print(f"⏱️ Benchmark parser (warm-up {args.warmup}, วัด {args.repeat} รอบ)")
+    for name in args.adapter or ADAPTERS:
+        patterns, load = ADAPTERS[name]
+        paths = fixture_paths(args.fixtures, patterns)
+        if not paths:
+            print(f"  ⏭️ {name:<20} ไม่มี fixture")
+            continue
+        pages, run = load(paths)
+        result = bench_adapter(pages, run, args.warmup, args.repeat)
+        report["results"][name] = result
+        print(
+            f"  ✅ {name:<20} {result['pages']:>4} หน้า  {result['pages_per_sec']:>10,.1f} pages/s"
+            f"  {result['rows_per_sec']:>12,.1f} rows/s  (median {result['median_s'] * 1000:.2f} ms/รอบ)"
+        )
+
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 บันทึกผล → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
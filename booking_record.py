@@ -0,0 +1,109 @@
+"""
+Record ของวันที่ไม่ว่าง 1 วันของบ้าน 1 หลัง
+
+scraper ทุกเว็บสร้าง BookingRecord (มี datetime.date และสถานะเป็น enum ตั้งแต่แรก)
+แปลงเป็น row แบบเดิม {"ชื่อบ้าน", "รหัส", "เดือน", "วันที่", "สถานะ", "เว็บ"} เฉพาะตอน export
+site = ชื่อเว็บที่ดึงมา (sites.detect) — รหัสบ้านของหลายเว็บขึ้นต้นด้วย "DV-" เหมือนกัน จึงแยกเว็บจากรหัสไม่ได้
+"""
+import calendar
+from datetime import date
+from enum import Enum
+
+from thai_dates import month_label, row_date
+
+
+class BookingStatus(str, Enum):
+    BOOKED = "ติดจอง"
+    PENDING = "รอโอน"
+
+
+class BookingRecord:
+    __slots__ = ("name", "code", "day", "status", "site")
+
+    def __init__(self, name, code, day, status=BookingStatus.BOOKED, site=""):
+        self.name = name
+        self.code = code
+        self.day = day
+        self.status = BookingStatus(status)
+        self.site = site
+
+    @property
+    def month(self):
+        """ชื่อเดือนแบบในผลลัพธ์ เช่น 'มีนาคม 2569'"""
+        return month_label(self.day.year, self.day.month)
+
+    def to_row(self):
+        """row แบบเดิม (key ภาษาไทย) สำหรับ export"""
+        return {
+            "ชื่อบ้าน": self.name,
+            "รหัส": self.code,
+            "เดือน": self.month,
+            "วันที่": self.day.day,
+            "สถานะ": self.status.value,
+            "เว็บ": self.site,
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        """row แบบเดิม -> BookingRecord หรือ None ถ้าวันที่/สถานะ parse ไม่ได้"""
+        day = row_date(row)
+        if day is None:
+            return None
+        try:
+            status = BookingStatus(row.get("สถานะ", ""))
+        except ValueError:
+            return None
+        return cls(
+            str(row.get("ชื่อบ้าน", "")).strip(), str(row.get("รหัส", "")).strip(), day, status,
+            str(row.get("เว็บ") or "").strip(),
+        )
+
+    def to_list(self):
+        """รูปแบบย่อสำหรับเก็บใน cache: [ชื่อบ้าน, รหัส, "YYYY-MM-DD", สถานะ, เว็บ]"""
+        return [self.name, self.code, self.day.isoformat(), self.status.value, self.site]
+
+    @classmethod
+    def from_list(cls, item):
+        name, code, day, status, site = item
+        return cls(name, code, date.fromisoformat(day), status, site)
+
+    def __eq__(self, other):
+        if not isinstance(other, BookingRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        return (self.name, self.code, self.day, self.status)
+
+    def __repr__(self):
+        return f"BookingRecord({self.code!r}, {self.day.isoformat()}, {self.status.value})"
+
+
+def month_records(name, code, year, month, days, status=BookingStatus.BOOKED, site=""):
+    """
+    record ของบ้านหนึ่งหลังในหนึ่งเดือน (days = วันที่ int ตามลำดับที่พบ, site = ชื่อเว็บ)
+    วันที่ที่ไม่มีจริงในเดือนนั้น (เช่น 31 ของเดือนที่มี 30 วัน) ถูกข้าม
+    """
+    last_day = calendar.monthrange(year, month)[1]
+    return [
+        BookingRecord(name, code, date(year, month, day), status, site)
+        for day in days if 1 <= day <= last_day
+    ]
+
+
+def records_from_rows(rows):
+    """row แบบเดิม (เช่น snapshot รอบก่อน) -> list ของ BookingRecord (ข้าม row ที่ parse ไม่ได้)"""
+    records = []
+    for row in rows:
+        record = BookingRecord.from_row(row)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def to_rows(records):
+    """list ของ BookingRecord -> row แบบเดิม"""
+    return [record.to_row() for record in records]
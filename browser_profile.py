@@ -0,0 +1,77 @@
+"""
+โปรไฟล์ของ headless Chrome: โหลดเฉพาะสิ่งที่ต้องใช้อ่านปฏิทิน
+
+    "full" = โหลดทุกอย่างเหมือนเบราว์เซอร์ปกติ (page load strategy "normal")
+    "lean" = ไม่โหลดรูป / ฟอนต์ / วิดีโอ / CSS / สคริปต์ third-party (analytics, chat, โฆษณา)
+             และใช้ page load strategy "eager" — driver.get() คืนค่าตอน DOMContentLoaded
+             ไม่รอรูปและ iframe โฆษณา ส่วนการรอปฏิทินพร้อมใช้เงื่อนไขใน readiness
+
+การบล็อกใช้ Chrome DevTools (Network.setBlockedURLs) ซึ่งกรองด้วย URL pattern
+รูปที่ไม่มีนามสกุลถูกปิดอีกชั้นด้วย preference ของ Chrome
+
+ตัวอ่านปฏิทิน (dom_extract) ใช้ class และ style แบบ inline เท่านั้น จึงไม่ต้องใช้ CSS
+"""
+PROFILES = ("lean", "full")
+
+# ชนิดไฟล์ที่ไม่ต้องใช้ (ไม่มีผลกับ DOM ของปฏิทิน)
+BLOCKED_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "m4v", "mov", "mp3", "ogg",
+    "css",
+)
+
+# โดเมน third-party ที่ไม่เกี่ยวกับปฏิทิน
+BLOCKED_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "facebook.com", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "tiktok.com", "analytics.tiktok.com", "line-scdn.net",
+    "youtube.com", "ytimg.com", "vimeo.com", "fonts.googleapis.com", "fonts.gstatic.com",
+    "maps.googleapis.com", "tawk.to", "embed.tawk.to", "zopim.com", "cloudflareinsights.com",
+)
+
+# ปิดรูปใน Chrome (รวมรูปที่ URL ไม่มีนามสกุล)
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+
+def blocked_url_patterns():
+    """pattern สำหรับ Network.setBlockedURLs ('*' = อะไรก็ได้)"""
+    patterns = [f"*.{ext}" for ext in BLOCKED_EXTENSIONS]
+    patterns += [f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS]
+    patterns += [f"*://{domain}/*" for domain in BLOCKED_DOMAINS]
+    patterns += [f"*://*.{domain}/*" for domain in BLOCKED_DOMAINS]
+    return patterns
+
+
+def configure_options(options, profile):
+    """ตั้ง ChromeOptions ตามโปรไฟล์ (เรียกก่อนสร้าง driver)"""
+    if profile == "lean":
+        options.page_load_strategy = "eager"
+        options.add_experimental_option("prefs", LEAN_PREFS)
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+    return options
+
+
+def apply(driver, profile):
+    """เปิดการบล็อก URL ผ่าน DevTools (เรียกหลังสร้าง driver)"""
+    if profile != "lean":
+        return driver
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+    except Exception as e:
+        print(f"⚠️ เปิดการบล็อก resource ไม่สำเร็จ ({e}) - โหลดทุกอย่างตามปกติ")
+    return driver
+
+
+# ขนาดที่โหลดจริงของหน้าปัจจุบัน (ตัวหน้าเว็บ + resource ทั้งหมด ที่ไม่ได้ถูกบล็อก)
+TRANSFER_SIZE_JS = """
+var total = 0;
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .forEach(function (e) { total += e.transferSize || 0; });
+return total;
+"""
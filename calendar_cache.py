@@ -0,0 +1,119 @@
+"""
+Cache ถาวร (บนดิสก์) ของปฏิทินแต่ละ (เว็บ, รหัสบ้าน, เดือน)
+
+เก็บ fingerprint (sha1) ของข้อมูลดิบที่ดึงมา (HTML / cell ที่อ่านจาก DOM / event)
+พร้อม BookingRecord ที่ parse แล้ว ถ้ารอบถัดไป fingerprint ตรงกันจะใช้ record เดิมโดยไม่ต้อง parse
+
+- ลบ entry ที่เก่ากว่า max_age_days และเก็บไม่เกิน max_entries (ลบตัวที่เก่าสุดก่อน)
+- ใช้ร่วมกันหลาย thread ได้ (worker pool)
+- นับ hit / miss เพื่อสรุปตอนจบการรัน
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from booking_record import BookingRecord
+
+CACHE_VERSION = 3   # 3 = record แบบ [ชื่อบ้าน, รหัส, YYYY-MM-DD, สถานะ, เว็บ]
+
+
+def cache_key(site, house_code, month):
+    """key ของ cache เช่น 'deville|DV-2606|2026-03'"""
+    return f"{site}|{house_code}|{month}"
+
+
+def fingerprint(payload):
+    """sha1 ของข้อมูลดิบ (str หรือโครงสร้างที่แปลงเป็น JSON ได้)"""
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class CalendarCache:
+    """Cache ของ record ปฏิทิน โดยใช้ fingerprint ของข้อมูลดิบเป็นตัวตรวจการเปลี่ยนแปลง"""
+
+    def __init__(self, path, max_age_days=7, max_entries=20000):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ อ่าน cache ไม่สำเร็จ ({e}) - เริ่มใหม่")
+            return
+        if data.get("version") != CACHE_VERSION:
+            print("⚠️ cache เป็นรูปแบบเก่า - เริ่มใหม่")
+            return
+        self.entries = data.get("entries", {})
+
+    def lookup(self, key, fp):
+        """คืน record ที่ cache ไว้ถ้า fingerprint ตรงกัน ไม่เช่นนั้นคืน None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry.get("fp") == fp:
+                self.hits += 1
+                entry["ts"] = time.time()
+                return [BookingRecord.from_list(item) for item in entry["rows"]]
+            self.misses += 1
+            return None
+
+    def rows(self, key):
+        """record ล่าสุดของ key ไม่ว่า fingerprint จะเป็นอะไร (None ถ้าไม่มี) - ไม่นับเป็น hit / miss"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            entry["ts"] = time.time()
+            return [BookingRecord.from_list(item) for item in entry["rows"]]
+
+    def has(self, key):
+        with self._lock:
+            return key in self.entries
+
+    def store(self, key, fp, rows):
+        """บันทึก record ที่ parse แล้วพร้อม fingerprint"""
+        with self._lock:
+            self.entries[key] = {"fp": fp, "rows": [r.to_list() for r in rows], "ts": time.time()}
+
+    def evict(self):
+        """ลบ entry ที่หมดอายุ และตัดให้เหลือไม่เกิน max_entries -> จำนวนที่ลบ"""
+        now = time.time()
+        with self._lock:
+            before = len(self.entries)
+            self.entries = {
+                k: v for k, v in self.entries.items()
+                if now - v.get("ts", 0) <= self.max_age
+            }
+            if len(self.entries) > self.max_entries:
+                newest = sorted(self.entries.items(), key=lambda kv: kv[1].get("ts", 0), reverse=True)
+                self.entries = dict(newest[:self.max_entries])
+            return before - len(self.entries)
+
+    def save(self):
+        """Evict แล้วเขียนลงดิสก์ (เขียนไฟล์ชั่วคราวแล้ว rename)"""
+        evicted = self.evict()
+        with self._lock:
+            data = {"version": CACHE_VERSION, "entries": self.entries}
+            tmp = f"{self.path}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        return evicted
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        print(f"\n🗃️ Cache: hit {self.hits} / miss {self.misses} ({rate:.0f}% hit), {len(self.entries)} entries")
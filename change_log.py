@@ -0,0 +1,107 @@
+"""
+Log การเปลี่ยนแปลงการจอง (NDJSON, ต่อท้ายไฟล์เรื่อย ๆ)
+
+เทียบผลรอบนี้กับ snapshot รอบก่อน (booking_result.json) ด้วย key (รหัส, เดือน, วันที่)
+แล้วเขียน event ทีละบรรทัด:
+
+- booked:         วันที่เพิ่งติดจอง/รอโอน
+- released:       วันที่เคยติดจองแต่ตอนนี้ว่าง
+- status_changed: สถานะเปลี่ยน เช่น ติดจอง -> รอโอน
+
+ระบบปลายทางอ่านเฉพาะบรรทัดใหม่ได้ ไม่ต้องโหลด snapshot ทั้งไฟล์มา diff เอง
+"""
+import csv
+import json
+import os
+from datetime import datetime
+
+
+def row_key(row):
+    """key ของ row: (รหัส, เดือน, วันที่)"""
+    return (
+        str(row.get("รหัส", "")).strip(),
+        str(row.get("เดือน", "")).strip(),
+        int(row.get("วันที่", 0)),
+    )
+
+
+def load_snapshot(json_path, csv_path=None):
+    """
+    โหลด snapshot รอบก่อน (list ของ row)
+    ใช้ JSON ก่อน ถ้าไม่มีหรืออ่านไม่ได้ (เช่น ไฟล์ขาดจากการรันที่ถูก kill) ใช้ CSV ถ้าไม่มีทั้งคู่คืน None
+    """
+    if json_path and os.path.exists(json_path):
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError as e:
+            print(f"⚠️ อ่าน {json_path} ไม่ได้: {e} - ใช้ CSV แทน")
+
+    if csv_path and os.path.exists(csv_path):
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+
+    return None
+
+
+class ChangeTracker:
+    """
+    diff แบบทีละ row: โหลด snapshot เก่าเป็น dict แล้วเทียบ row ใหม่ตามที่ได้มา
+    (row ใหม่ต้องไม่ซ้ำ key) — เก็บเฉพาะ snapshot เก่าที่ยังไม่เจอ + event ที่เกิดขึ้น
+    """
+
+    def __init__(self, old_rows):
+        self.old = {}
+        for row in old_rows:
+            try:
+                self.old[row_key(row)] = row
+            except (TypeError, ValueError):
+                continue
+        self.events = {}
+
+    def add(self, row):
+        key = row_key(row)
+        before = self.old.pop(key, None)
+        if before is None:
+            self.events[key] = _event("booked", row)
+        elif str(before.get("สถานะ", "")) != str(row.get("สถานะ", "")):
+            event = _event("status_changed", row)
+            event["สถานะเดิม"] = before.get("สถานะ", "")
+            self.events[key] = event
+
+    def finish(self):
+        """row เก่าที่ไม่เจอในรอบนี้ = released -> list ของ event (เรียงตาม key)"""
+        for key, before in self.old.items():
+            self.events[key] = _event("released", before)
+        self.old = {}
+        return [self.events[key] for key in sorted(self.events)]
+
+
+def _event(kind, row):
+    return {
+        "event": kind,
+        "ชื่อบ้าน": row.get("ชื่อบ้าน", ""),
+        "รหัส": row.get("รหัส", ""),
+        "เดือน": row.get("เดือน", ""),
+        "วันที่": int(row.get("วันที่", 0)),
+        "สถานะ": row.get("สถานะ", ""),
+    }
+
+
+def append_events(path, events, run_at=None):
+    """ต่อท้าย event ลงไฟล์ NDJSON (1 บรรทัด = 1 event พร้อมเวลาของรอบนี้)"""
+    if not events:
+        return 0
+    ts = (run_at or datetime.now()).isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps({"ts": ts, **event}, ensure_ascii=False) + "\n")
+    return len(events)
+
+
+def summarize(events):
+    """นับจำนวน event แต่ละประเภท"""
+    counts = {"booked": 0, "released": 0, "status_changed": 0}
+    for event in events:
+        counts[event["event"]] = counts.get(event["event"], 0) + 1
+    return counts
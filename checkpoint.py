@@ -0,0 +1,96 @@
+"""
+Checkpoint ของการรัน: บันทึกทุก unit ที่เสร็จแล้วพร้อม row ของ unit นั้น (NDJSON ต่อท้ายไฟล์)
+
+unit = (url, รหัสบ้าน, เดือน YYYY-MM) — เว็บที่ต้องอ่านทั้งหน้าในครั้งเดียว
+(Pool Villa City / Pattaya Party) ใช้ (url, None, None) เป็น unit เดียว
+
+    {"version": 2, "created": "2026-03-08"}                                       บรรทัดแรก
+    {"unit": [url, house, ym], "rows": [[ชื่อบ้าน, รหัส, "YYYY-MM-DD", สถานะ, เว็บ], ...]}
+
+รันด้วย --resume: unit ที่อยู่ในไฟล์ไม่ต้องดึงใหม่ ใช้ row ที่บันทึกไว้แทน
+unit ที่ error ไม่ถูกบันทึก จึงถูกดึงใหม่ในรอบ resume
+checkpoint ที่สร้างก่อนวันนี้ถือว่าเก่า (ข้อมูลการจองเปลี่ยนได้) และเริ่มใหม่
+"""
+import json
+import os
+import threading
+from datetime import date
+
+from booking_record import BookingRecord
+
+CHECKPOINT_VERSION = 2   # 2 = row มีชื่อเว็บต่อท้าย
+
+
+class Checkpoint:
+    def __init__(self, path, resume=False, today=None):
+        self.path = path
+        self.today = today or date.today()
+        self.units = {}
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+        if self.units:
+            self._file = open(path, "a", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+            self._write({"version": CHECKPOINT_VERSION, "created": self.today.isoformat()})
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"♻️ ไม่พบ checkpoint ({self.path}) - เริ่มใหม่ทั้งหมด")
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = None
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    break   # บรรทัดสุดท้ายที่เขียนไม่ครบตอน process ถูก kill
+                if header is None:
+                    header = item
+                    if header.get("version") != CHECKPOINT_VERSION or header.get("created") != self.today.isoformat():
+                        print(f"♻️ checkpoint {self.path} เก่า ({header.get('created')}) - เริ่มใหม่ทั้งหมด")
+                        return
+                    continue
+                self.units[tuple(item["unit"])] = item["rows"]
+        rows = sum(len(r) for r in self.units.values())
+        print(f"♻️ resume จาก {self.path}: {len(self.units)} unit เสร็จแล้ว ({rows} row)")
+
+    def _write(self, item):
+        self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def lookup(self, key):
+        """row (BookingRecord) ของ unit ที่เสร็จแล้ว หรือ None ถ้ายังไม่เคยเสร็จ"""
+        with self._lock:
+            rows = self.units.get(key)
+            if rows is None:
+                return None
+            self.skipped += 1
+        return [BookingRecord.from_list(item) for item in rows]
+
+    def complete(self, key, records):
+        """บันทึก unit ที่เสร็จแล้ว (เขียนลงไฟล์ทันที)"""
+        rows = [record.to_list() for record in records]
+        with self._lock:
+            self.units[key] = rows
+            self.completed += 1
+            self._write({"unit": list(key), "rows": rows})
+
+    def fail(self):
+        with self._lock:
+            self.failed += 1
+
+    def close(self):
+        """ปิดไฟล์ — ลบทิ้งถ้าทุก unit สำเร็จ (เก็บไว้ให้ --resume ถ้ามี unit ที่ error)"""
+        self._file.close()
+        if self.failed == 0:
+            os.remove(self.path)
+        print(
+            f"♻️ checkpoint: ใช้ของเดิม {self.skipped} unit, ดึงใหม่ {self.completed} unit"
+            + (f", error {self.failed} unit (รันด้วย --resume เพื่อดึงเฉพาะที่เหลือ)" if self.failed else "")
+        )
@@ -0,0 +1,111 @@
+"""
+หา chromedriver ที่ใช้กับ Chrome ในเครื่องได้ โดยไม่ต้องต่อเน็ตทุกรอบ
+
+ChromeDriverManager().install() ถาม server (และอาจดาวน์โหลด) ทุกครั้งที่เรียก
+ที่นี่เก็บ path + เวอร์ชันของ driver ไว้ในไฟล์ cache แล้วรอบถัดไปเทียบ major version
+กับ Chrome ที่ติดตั้ง (อ่านจาก `google-chrome --version` ในเครื่อง ไม่ใช้เน็ต):
+
+    1. driver ใน cache ยังอยู่และ major ตรงกับ Chrome  -> ใช้เลย
+    2. chromedriver ใน PATH major ตรงกับ Chrome          -> ใช้และเก็บลง cache
+    3. ไม่เช่นนั้น ChromeDriverManager().install()        -> เก็บลง cache
+
+ตั้ง env CHROMEDRIVER=/path/to/chromedriver เพื่อข้ามการหาทั้งหมด
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from datetime import datetime
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+VERSION_PATTERN = re.compile(r"(\d+)(?:\.\d+){1,3}")
+
+_resolved = {}
+_lock = threading.Lock()
+
+
+def binary_version(path):
+    """เวอร์ชันจาก `<path> --version` เช่น '122.0.6261.94' (None ถ้ารันไม่ได้)"""
+    try:
+        out = subprocess.run(
+            [path, "--version"], capture_output=True, text=True, timeout=10,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(out or "")
+    return match.group(0) if match else None
+
+
+def chrome_version():
+    """เวอร์ชันของ Chrome ที่ติดตั้งในเครื่อง (None ถ้าไม่พบ)"""
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            version = binary_version(path)
+            if version:
+                return version
+    return None
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+def _load(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save(cache_path, path, driver_version, chrome):
+    entry = {
+        "path": path,
+        "driver_version": driver_version,
+        "chrome_version": chrome,
+        "resolved_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠️ บันทึก {cache_path} ไม่สำเร็จ: {e}")
+
+
+def _resolve(cache_path):
+    env_path = os.environ.get("CHROMEDRIVER")
+    if env_path:
+        return env_path
+
+    chrome = chrome_version()
+    cached = _load(cache_path)
+    if cached and os.path.exists(cached.get("path", "")):
+        # ไม่พบ Chrome (เช่น ติดตั้งไว้ที่อื่น) -> เชื่อ cache
+        if chrome is None or _major(chrome) == _major(cached.get("driver_version")):
+            return cached["path"]
+        print(f"🔧 Chrome {chrome} ไม่ตรงกับ chromedriver {cached.get('driver_version')} - หา driver ใหม่")
+
+    on_path = shutil.which("chromedriver")
+    if on_path:
+        version = binary_version(on_path)
+        if version and (chrome is None or _major(chrome) == _major(version)):
+            _save(cache_path, on_path, version, chrome)
+            return on_path
+
+    from webdriver_manager.chrome import ChromeDriverManager  # ต้องใช้เน็ต
+
+    path = ChromeDriverManager().install()
+    _save(cache_path, path, binary_version(path), chrome)
+    print(f"🔧 chromedriver → {path}")
+    return path
+
+
+def resolve(cache_path):
+    """path ของ chromedriver (หาครั้งเดียวต่อ process แม้หลาย worker เรียกพร้อมกัน)"""
+    with _lock:
+        if cache_path not in _resolved:
+            _resolved[cache_path] = _resolve(cache_path)
+        return _resolved[cache_path]
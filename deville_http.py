@@ -0,0 +1,270 @@
+"""
+ดึงปฏิทิน Deville Groups (cld.php) ผ่าน HTTP โดยไม่ต้องเปิด Chrome
+
+หน้า cld.php เป็น HTML ที่ render จากฝั่ง server อยู่แล้ว จึงดึงตรงด้วย
+requests.Session (ใช้ connection pool + keep-alive) แล้ว parse ด้วย
+html.parser ได้เลย ผลลัพธ์ (ชื่อเดือน, วันที่ติดจอง) ตรงกับเส้นทาง Selenium
+"""
+import html as html_lib
+import re
+from collections import namedtuple
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from booking_record import month_records
+from dom_extract import classify_deville
+from replay import record, route
+from thai_dates import parse_month_label
+
+BASE_IFRAME_URL = "https://www.devillegroups.com/allcalendar/cld.php"
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# หน้ารวม: <h6>(DV-xxxx)<br>ชื่อบ้าน</h6> ... <iframe src="cld.php?hId=xxxx">
+# ไล่เฉพาะหัวบ้านและ iframe ปฏิทินตามลำดับในหน้า (สแกนครั้งเดียว ไม่มี .*? ข้ามไปบ้านถัดไป)
+# -> (เลข DV, HTML ที่เหลือใน h6, "") หรือ ("", "", hId)
+LISTING_TAG = re.compile(
+    r'<h6\b[^>]*>\s*\(DV-(\d+)\)((?:[^<]++|<(?!/h6))*+)</h6\s*>'
+    r"""|<iframe\b[^>]*?\bsrc\s*=\s*["']?[^"'\s>]*cld\.php\?(?:[^"'\s>]*?&(?:amp;)?)?hId=(\d+)"""
+)
+_BR_TAG = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_ANY_TAG = re.compile(r'<[^>]*>')
+
+DevilleListing = namedtuple("DevilleListing", ["houses", "unmatched_headers", "unmatched_iframes"])
+
+# tag ที่ไม่มี end tag (ไม่ต้องเก็บใน stack)
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+
+class CldCalendarParser(HTMLParser):
+    """
+    Parser สำหรับหน้า cld.php
+
+    เก็บ:
+    - ths: ข้อความของ <th> ทุกอัน (<br> -> ขึ้นบรรทัดใหม่)
+    - cells: (class, ข้อความใน div แรก หรือ None, ข้อความทั้ง td) ของ <td> ทุกอัน
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.ths = []
+        self.cells = []
+        self._th = None        # list ของข้อความใน th ที่กำลังอ่าน
+        self._td = None        # dict ของ td ที่กำลังอ่าน
+        self._td_depth = 0     # ความลึกของ tag ภายใน td
+        self._div_depth = 0    # ความลึกภายใน div แรกของ td (0 = ไม่อยู่ใน div)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'br':
+            self._add_text("\n")
+            return
+
+        if tag == 'th':
+            self._th = []
+        elif tag == 'td':
+            self._td = {
+                'class': dict(attrs).get('class') or "",
+                'div': None,
+                'text': [],
+            }
+            self._td_depth = 0
+            self._div_depth = 0
+            return
+
+        if self._td is not None and tag not in VOID_TAGS:
+            self._td_depth += 1
+            if self._div_depth:
+                self._div_depth += 1
+            elif tag == 'div' and self._td['div'] is None:
+                self._td['div'] = []
+                self._div_depth = 1
+
+    def handle_endtag(self, tag):
+        if tag == 'th' and self._th is not None:
+            self.ths.append("".join(self._th))
+            self._th = None
+        elif tag == 'td' and self._td is not None:
+            div = self._td['div']
+            self.cells.append((
+                self._td['class'],
+                "".join(div) if div is not None else None,
+                "".join(self._td['text']),
+            ))
+            self._td = None
+        elif self._td is not None and self._td_depth > 0:
+            self._td_depth -= 1
+            if self._div_depth:
+                self._div_depth -= 1
+
+    def handle_data(self, data):
+        self._add_text(data)
+
+    def _add_text(self, text):
+        if self._th is not None:
+            self._th.append(text)
+        if self._td is not None:
+            self._td['text'].append(text)
+            if self._div_depth:
+                self._td['div'].append(text)
+
+
+def _clean_lines(text):
+    """ยุบช่องว่างให้เหมือน element.text ของ Selenium"""
+    lines = [re.sub(r'[ \t\r\f\v]+', ' ', line).strip() for line in text.split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def parse_cld_html(html, ym):
+    """
+    Parse HTML ของ cld.php -> (month_text, booked_days)
+
+    - month_text: บรรทัดใน <th> ที่มีปี พ.ศ. (256x/257x) เช่น "มีนาคม 2569"
+      ถ้าไม่พบใช้ ym ("2026-03") แทน เหมือนเส้นทาง Selenium
+    - booked_days: วันที่ (int) ที่เป็น booking/waiting ของเดือนนี้ เรียงตามที่พบ
+    """
+    parser = CldCalendarParser()
+    parser.feed(html)
+    parser.close()
+
+    month_text = ym
+    for th_text in parser.ths:
+        th_text = _clean_lines(th_text)
+        if "256" in th_text or "257" in th_text:
+            month_text = th_text
+            for line in th_text.split("\n"):
+                if "256" in line or "257" in line:
+                    month_text = line.strip()
+                    break
+            break
+
+    cells = [
+        (_clean_lines(div_text if div_text is not None else td_text), cell_class, "", "")
+        for cell_class, div_text, td_text in parser.cells
+    ]
+    return month_text, classify_deville(cells)
+
+
+def _header_text(fragment):
+    """HTML ภายใน <h6> -> ข้อความ (<br> = ขึ้นบรรทัดใหม่)"""
+    text = _BR_TAG.sub("\n", fragment)
+    if "<" in text:
+        text = _ANY_TAG.sub("", text)
+    if "&" in text:
+        text = html_lib.unescape(text)
+    return text.strip()
+
+
+def parse_deville_listing(html):
+    """
+    จับคู่หัวบ้าน <h6>(DV-xxxx)<br>ชื่อบ้าน</h6> กับ <iframe src="...cld.php?hId=..."> ถัดไป
+
+    ไล่ tag ครั้งเดียวตามลำดับในหน้า (ใช้ได้ทั้ง page_source ของ Chrome และ HTML จาก HTTP)
+    หัวบ้านที่เจอหัวบ้านอื่นก่อน iframe = ไม่มีปฏิทิน (ไม่จับคู่ข้ามไปใช้ iframe ของบ้านถัดไป)
+
+    -> DevilleListing
+    - houses: list ของ {'id', 'name', 'dv_code'} (ไม่ซ้ำ hId)
+    - unmatched_headers: "DV-xxxx ชื่อบ้าน" ที่ไม่มี iframe ตามมา
+    - unmatched_iframes: hId ของ iframe cld.php ที่ไม่มีหัวบ้านนำหน้า
+    """
+    houses = []
+    unmatched_headers = []
+    unmatched_iframes = []
+    seen_ids = set()
+    pending = None          # (dv_id, name) ของหัวบ้านที่ยังไม่เจอ iframe
+
+    for dv_id, header_html, h_id in LISTING_TAG.findall(html):
+        if dv_id:
+            if pending is not None:
+                unmatched_headers.append(f"DV-{pending[0]} {pending[1]}")
+            pending = (dv_id, " ".join(_header_text(header_html).split()))
+            continue
+
+        if pending is None:
+            unmatched_iframes.append(h_id)
+            continue
+        dv_id, name = pending
+        pending = None
+        if h_id in seen_ids:
+            continue
+        seen_ids.add(h_id)
+        houses.append({
+            'id': h_id,
+            'name': name,
+            'dv_code': f'DV-{dv_id}'
+        })
+
+    if pending is not None:
+        unmatched_headers.append(f"DV-{pending[0]} {pending[1]}")
+    return DevilleListing(houses, unmatched_headers, unmatched_iframes)
+
+
+def http_listing(html):
+    """
+    หน้ารวมที่ดึงผ่าน HTTP -> DevilleListing ถ้าพบบ้าน (ทั้ง cld.php?hId= และ cld.php?ym=..&hId=)
+    หรือ None ถ้าไม่พบบ้านเลย (เช่น หน้า render ด้วย JavaScript) -> ต้องใช้ Chrome
+    """
+    listing = parse_deville_listing(html)
+    return listing if listing.houses else None
+
+
+def find_deville_houses(html):
+    """หารายชื่อบ้านจาก HTML หน้ารวมปฏิทิน -> list ของ {'id', 'name', 'dv_code'} (ไม่ซ้ำ hId)"""
+    return parse_deville_listing(html).houses
+
+
+def print_unmatched(listing):
+    """แจ้งหัวบ้าน / iframe ที่จับคู่ไม่ได้ (โครงสร้างหน้าเปลี่ยน หรือบ้านไม่มีปฏิทิน)"""
+    if listing.unmatched_headers:
+        print(f"  ⚠️ หัวบ้านที่ไม่มีปฏิทิน {len(listing.unmatched_headers)} หลัง: {', '.join(listing.unmatched_headers)}")
+    if listing.unmatched_iframes:
+        print(f"  ⚠️ ปฏิทินที่ไม่มีหัวบ้าน {len(listing.unmatched_iframes)} อัน: hId={', '.join(listing.unmatched_iframes)}")
+
+
+def month_rows(house, ym, month_text, booked_days):
+    """
+    record ของบ้านหนึ่งหลังในหนึ่งเดือน
+    ใช้เดือนจากหัวปฏิทิน (month_text) ถ้าอ่านได้ ไม่เช่นนั้นใช้ ym ที่ขอไป
+    """
+    year, month = parse_month_label(month_text)
+    if year is None:
+        year, month = parse_month_label(ym)
+    return month_records(house['name'], house['dv_code'], year, month, booked_days, site="deville")
+
+
+class DevilleHttpClient:
+    """HTTP client (connection pool + keep-alive) สำหรับหน้า Deville"""
+
+    def __init__(self, pool_size=10, timeout=15):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "th,en;q=0.8",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url):
+        """ดึง HTML จาก URL (raise ถ้า status ไม่ใช่ 2xx)"""
+        resp = self.session.get(route(url), timeout=self.timeout)
+        resp.raise_for_status()
+        if not resp.encoding or resp.encoding.lower() == 'iso-8859-1':
+            resp.encoding = resp.apparent_encoding or 'utf-8'
+        record(url, resp.text)
+        return resp.text
+
+    def fetch_month_html(self, h_id, ym):
+        """ดึง HTML ของ cld.php สำหรับบ้าน h_id เดือน ym ("2026-03")"""
+        return self.get(f"{BASE_IFRAME_URL}?ym={ym}&hId={h_id}")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,279 @@
+"""
+ดึงข้อมูลปฏิทินทั้งเดือนด้วย execute_script ครั้งเดียว แล้วจัดประเภทด้วย Python ล้วน
+
+เดิมแต่ละ cell ต้องเรียก get_attribute / .text / find_element ทีละครั้ง
+(1 ครั้ง = 1 HTTP round trip ไปหา chromedriver) เดือนละ 100+ ครั้ง
+ตอนนี้ JavaScript รวบรวม cell ทั้งหมดเป็น list ของ tuple:
+
+    [day, classes, style, data_date]
+
+- day: ข้อความวันที่ใน cell (string)
+- classes: class ของ cell (และ element ภายในที่เกี่ยวข้อง)
+- style: style attribute ที่เกี่ยวข้อง
+- data_date: ค่า data-date ("" ถ้าไม่มี)
+"""
+import re
+from datetime import date, timedelta
+
+# ========================================================
+# Deville Groups (cld.php): td ทุกอันในตาราง
+# ========================================================
+DEVILLE_CELLS_JS = """
+return Array.prototype.map.call(document.querySelectorAll('td'), function (td) {
+    var div = td.querySelector('div');
+    var text = div ? div.innerText : td.innerText;
+    return [(text || '').trim(), td.className || '', td.getAttribute('style') || '',
+            td.getAttribute('data-date') || ''];
+});
+"""
+
+# ========================================================
+# Pool Villa City (FullCalendar): td.fc-daygrid-day + fc-bg-event ภายใน
+# ========================================================
+FULLCALENDAR_CELLS_JS = """
+return Array.prototype.map.call(document.querySelectorAll('td.fc-daygrid-day'), function (td) {
+    var num = td.querySelector('.fc-daygrid-day-number');
+    var classes = [td.className || ''];
+    var styles = [];
+    td.querySelectorAll('.fc-bg-event').forEach(function (ev) {
+        classes.push(ev.className || '');
+        styles.push(ev.getAttribute('style') || '');
+    });
+    return [num ? (num.innerText || '').trim() : '', classes.join(' '), styles.join(';'),
+            td.getAttribute('data-date') || ''];
+});
+"""
+
+# ========================================================
+# Pattaya Party (Tailwind): div.aspect-square ใน grid ตัวเลขวัน
+# ========================================================
+PATTAYA_CELLS_JS = """
+var grids = document.querySelectorAll('div.grid.grid-cols-7');
+var grid = grids.length > 1 ? grids[1] : grids[0];
+var cells = grid ? grid.querySelectorAll('div.aspect-square')
+                 : document.querySelectorAll('div.aspect-square');
+return Array.prototype.map.call(cells, function (cell) {
+    return [(cell.innerText || '').trim(), cell.className || '', cell.getAttribute('style') || '',
+            cell.getAttribute('data-date') || ''];
+});
+"""
+
+# class ของ td ที่เป็นวันของเดือนอื่น (Deville)
+DEVILLE_OTHER_MONTH_CLASSES = ('prev', 'next', 'other', 'disabled')
+
+# สีพื้นหลังของ fc-bg-event ที่หมายถึง "ติดจอง" (Pool Villa City)
+POOLVILLA_BOOKED_STYLE = 'rgb(248, 229, 231)'
+
+
+def extract(driver, script):
+    """รัน script ครั้งเดียว -> list ของ (day, classes, style, data_date)"""
+    return [tuple(cell) for cell in (driver.execute_script(script) or [])]
+
+
+def classify_deville(cells):
+    """วันที่ booking/waiting ของเดือนนี้ (ไม่ซ้ำ เรียงตามที่พบ)"""
+    booked_days = []
+    for day, classes, _style, _data_date in cells:
+        if 'booking' not in classes and 'waiting' not in classes:
+            continue
+        # ข้ามวันที่ของเดือนอื่น
+        if any(x in classes for x in DEVILLE_OTHER_MONTH_CLASSES):
+            continue
+        # กรองเฉพาะตัวเลข (ไม่รวม header)
+        if day.isdigit():
+            day_int = int(day)
+            if 1 <= day_int <= 31 and day_int not in booked_days:
+                booked_days.append(day_int)
+    return booked_days
+
+
+def classify_fullcalendar(cells):
+    """
+    data-date ของวันที่ติดจองใน view ปัจจุบัน
+
+    ใช้ fc-bg-event ที่มีสีติดจองก่อน ถ้าไม่มีเลยใน view นี้ ใช้ td ที่มี fc-bg-event ใดก็ได้
+    """
+    with_event = [c for c in cells if 'fc-bg-event' in c[1] and c[3]]
+    booked = [c for c in with_event if POOLVILLA_BOOKED_STYLE in c[2]]
+    return {c[3] for c in (booked or with_event)}
+
+
+def classify_pattaya(cells, days_in_month):
+    """(booked_days, pending_days) ของเดือนที่แสดง: แดง = ติดจอง, เขียว = รอโอน"""
+    booked_days = []
+    pending_days = []
+    for day_text, classes, _style, _data_date in cells:
+        # ข้ามถ้าเป็นวันของเดือนอื่น (มี text-gray-400)
+        if "text-gray" in classes:
+            continue
+
+        numbers = re.findall(r'\d+', day_text)
+        if not numbers:
+            continue
+        day = int(numbers[0])
+        if not 1 <= day <= days_in_month:
+            continue
+
+        if "bg-red" in classes:
+            booked_days.append(day)
+        elif "bg-green" in classes:
+            pending_days.append(day)
+
+    return sorted(set(booked_days)), sorted(set(pending_days))
+
+
+# ========================================================
+# Pool Villa City: อ่าน event จาก FullCalendar API ทีเดียวทั้งช่วง (ไม่ต้องกด Next)
+# ========================================================
+# execute_async_script(FULLCALENDAR_EVENTS_JS, start, end)
+# -> {'source': 'feed' | 'getEvents' | 'jquery', 'events': [...], 'lazySources': n}
+#    หรือ null ถ้าไม่พบปฏิทิน (lazySources = source แบบฟังก์ชันที่โหลดเฉพาะ view ที่แสดง)
+# - หา instance ของ FullCalendar (v4+ : ตัวแปร global ที่มี getEvents, v3 : jQuery .fullCalendar)
+# - ถ้ามี event source แบบ URL (JSON feed) จะ fetch ทั้งช่วง start..end ในครั้งเดียว
+# - ไม่เช่นนั้นใช้ event ที่โหลดไว้แล้ว (getEvents / clientEvents)
+FULLCALENDAR_EVENTS_JS = """
+var done = arguments[arguments.length - 1];
+var rangeStart = arguments[0], rangeEnd = arguments[1];
+
+function pad(n) {
+    return (n < 10 ? '0' : '') + n;
+}
+function iso(d) {
+    if (!d) return '';
+    if (typeof d === 'string') return d;
+    if (typeof d.format === 'function') return d.format();
+    if (typeof d.getFullYear === 'function') {
+        // วันที่ตามเวลาท้องถิ่น (toISOString แปลงเป็น UTC: เที่ยงคืนที่ไทย = 17:00Z ของวันก่อน)
+        var s = d.getFullYear() + '-' + pad(d.getMonth() + 1) + '-' + pad(d.getDate());
+        if (d.getHours() || d.getMinutes() || d.getSeconds()) {
+            s += 'T' + pad(d.getHours()) + ':' + pad(d.getMinutes()) + ':' + pad(d.getSeconds());
+        }
+        return s;
+    }
+    return String(d);
+}
+function classes(c) {
+    if (!c) return '';
+    return Array.isArray(c) ? c.join(' ') : String(c);
+}
+function plain(ev) {
+    return {
+        start: ev.startStr || iso(ev.start),
+        end: ev.endStr || iso(ev.end),
+        allDay: ev.allDay !== false,
+        display: ev.display || ev.rendering || '',
+        color: ev.backgroundColor || ev.color || '',
+        classNames: classes(ev.classNames || ev.className)
+    };
+}
+function findCalendar() {
+    var names = ['calendar', 'fullCalendar', 'fcCalendar', 'cal'];
+    for (var i = 0; i < names.length; i++) {
+        var c = window[names[i]];
+        if (c && typeof c.getEvents === 'function') return c;
+    }
+    for (var k in window) {
+        try {
+            var w = window[k];
+            if (w && typeof w.getEvents === 'function' && typeof w.getEventSources === 'function') return w;
+        } catch (e) {}
+    }
+    return null;
+}
+
+var cal = findCalendar();
+if (!cal) {
+    if (window.jQuery && jQuery.fn && jQuery.fn.fullCalendar) {
+        var el = jQuery('.fc').first();
+        if (el.length) {
+            try {
+                done({source: 'jquery', events: el.fullCalendar('clientEvents').map(plain)});
+                return;
+            } catch (e) {}
+        }
+    }
+    done(null);
+    return;
+}
+
+var loaded = cal.getEvents().map(plain);
+var urls = [];
+var lazySources = 0;
+(cal.getEventSources ? cal.getEventSources() : []).forEach(function (src) {
+    var meta = src.internalEventSource && src.internalEventSource.meta;
+    var url = (meta && meta.url) || src.url;
+    if (typeof url === 'string' && url) urls.push(url);
+    else if (typeof meta === 'function' || (meta && typeof meta.events === 'function')) lazySources++;
+});
+if (!urls.length) {
+    done({source: 'getEvents', events: loaded, lazySources: lazySources});
+    return;
+}
+
+Promise.all(urls.map(function (u) {
+    var q = (u.indexOf('?') < 0 ? '?' : '&') +
+        'start=' + encodeURIComponent(rangeStart) + '&end=' + encodeURIComponent(rangeEnd);
+    return fetch(u + q, {credentials: 'same-origin'}).then(function (r) { return r.json(); });
+})).then(function (lists) {
+    var events = loaded.slice();
+    lists.forEach(function (list) {
+        if (!Array.isArray(list)) list = list.events || list.data || [];
+        list.forEach(function (ev) { events.push(plain(ev)); });
+    });
+    done({source: 'feed', events: events});
+}).catch(function (e) {
+    done({source: 'getEvents', events: loaded, error: String(e)});
+});
+"""
+
+
+def _normalize_color(color):
+    """'#F8E5E7' / 'rgb(248,229,231)' / 'rgba(248, 229, 231, 1)' -> (248, 229, 231)"""
+    color = (color or "").strip().lower()
+    match = re.fullmatch(r'#([0-9a-f]{6})', color)
+    if match:
+        h = match.group(1)
+        return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
+    match = re.match(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)', color)
+    if match:
+        return tuple(int(x) for x in match.groups())
+    return None
+
+
+POOLVILLA_BOOKED_RGB = _normalize_color(POOLVILLA_BOOKED_STYLE)
+
+
+def expand_fullcalendar_events(events):
+    """
+    แปลง event (ช่วงวันที่) เป็น set ของ 'YYYY-MM-DD' ที่ติดจอง
+
+    เหมือนการอ่านจาก DOM: ใช้ background event สีติดจองก่อน
+    ถ้าไม่มีเลย ใช้ background event ทั้งหมด
+    - end เป็นแบบ exclusive (FullCalendar all-day) ถ้าไม่มีเวลาหรือเวลาเป็น 00:00
+    """
+    background = [
+        ev for ev in events
+        if 'background' in (ev.get('display') or '') or 'fc-bg-event' in (ev.get('classNames') or '')
+    ]
+    booked = [ev for ev in background if _normalize_color(ev.get('color')) == POOLVILLA_BOOKED_RGB]
+
+    dates = set()
+    for ev in booked or background:
+        start_str = ev.get('start') or ''
+        end_str = ev.get('end') or ''
+        if len(start_str) < 10:
+            continue
+        start = date.fromisoformat(start_str[:10])
+        if len(end_str) >= 10:
+            end = date.fromisoformat(end_str[:10])
+            time_part = end_str[11:19]
+            if time_part and not time_part.startswith('00:00'):
+                end += timedelta(days=1)
+        else:
+            end = start + timedelta(days=1)
+
+        day = start
+        while day < end:
+            dates.add(day.isoformat())
+            day += timedelta(days=1)
+    return dates
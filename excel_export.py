@@ -0,0 +1,212 @@
+"""
+Export ผลลัพธ์เป็น Excel (booking_result.xlsx) ด้วย xlsxwriter แบบ constant_memory
+
+ใช้ร่วมกันทั้ง scrape_calendar.py (หลัง scrape เสร็จ) และ export_to_excel.py (จาก CSV ที่มีอยู่)
+อ่าน CSV ทีละบรรทัดแล้วเขียนลง Excel ทันที — แถวที่เขียนแล้วถูก flush ลงไฟล์ชั่วคราว
+หน่วยความจำจึงไม่โตตามจำนวน row (เหลือแค่ตารางบ้าน × วันแบบ 2 bit ต่อช่อง)
+
+Sheets:
+    Bookings   row แบบเดิม (ชื่อบ้าน, รหัส, เดือน, วันที่, สถานะ, เว็บ) + AutoFilter
+    Calendar   1 แถวต่อบ้าน × 1 คอลัมน์ต่อวัน สีตามสถานะ (แดง = ติดจอง, เหลือง = รอโอน)
+    deville…   (per_site=True) Calendar แยกตามเว็บ (คอลัมน์ "เว็บ"; CSV เก่าที่ไม่มีใช้ส่วนหน้า "-" ของรหัส)
+
+xlsxwriter เป็น dependency เสริม: import เฉพาะตอน export
+"""
+import calendar
+import csv
+import re
+from datetime import timedelta
+
+from availability_matrix import BITS, CELLS_PER_BYTE, FREE, STATUSES, MatrixBuilder
+from sinks import ROW_FIELDS
+from thai_dates import month_label, row_date
+
+COLUMN_WIDTHS = {
+    "ชื่อบ้าน": 30,
+    "รหัส": 14,
+    "เดือน": 18,
+    "วันที่": 10,
+    "สถานะ": 12,
+    "เว็บ": 14,
+}
+
+# ค่าในช่องของตาราง (index ของ STATUSES) -> (ตัวอักษรในช่อง, สีพื้น)
+STATUS_CELLS = {
+    STATUSES.index("ติดจอง"): ("จ", "#F4A6A6"),
+    STATUSES.index("รอโอน"): ("ร", "#FFE08A"),
+}
+
+CALENDAR_HEADER_ROWS = 2   # แถวเดือน + แถววันที่
+CALENDAR_LABEL_COLS = 2    # รหัส, ชื่อบ้าน
+
+# byte -> สถานะของ 4 วันใน byte นั้น (ถอดทั้งแถวด้วยการเปิดตาราง ไม่ต้อง shift ทีละช่อง)
+_UNPACK = [
+    tuple((value >> (i * BITS)) & 0b11 for i in range(CELLS_PER_BYTE))
+    for value in range(256)
+]
+_SHEET_NAME_INVALID = re.compile(r"[\[\]:*?/\\]")
+
+
+def unpack_row(row, days):
+    """แถว bytearray ของ MatrixBuilder -> list สถานะรายวัน (0 = ว่าง) ยาว days"""
+    cells = [cell for value in row for cell in _UNPACK[value]]
+    del cells[days:]
+    return cells
+
+
+def read_rows(csv_path):
+    """อ่าน row จาก CSV ทีละบรรทัด (generator)"""
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def date_range(csv_path):
+    """(start, days) ตั้งแต่ต้นเดือนแรกถึงสิ้นเดือนสุดท้ายที่มีใน CSV (None ถ้าไม่มีวันที่เลย)"""
+    first = last = None
+    for row in read_rows(csv_path):
+        d = row_date(row)
+        if d is None:
+            continue
+        first = d if first is None or d < first else first
+        last = d if last is None or d > last else last
+    if first is None:
+        return None
+    start = first.replace(day=1)
+    end = last.replace(day=calendar.monthrange(last.year, last.month)[1]) + timedelta(days=1)
+    return start, (end - start).days
+
+
+def site_group(code, site=""):
+    """
+    ชื่อ sheet แยกเว็บของบ้าน: ชื่อเว็บ ("pattayaparty") ถ้ามี
+    ไม่เช่นนั้น (CSV เก่า) ใช้ส่วนหน้า "-" ของรหัส: "DV-2606" -> "DV", "CITY-743" -> "CITY"
+    """
+    group = str(site or "").strip() or str(code).split("-", 1)[0].strip()
+    return _SHEET_NAME_INVALID.sub("_", group)[:31] or "Other"
+
+
+class ExcelExporter:
+    """
+    เขียน Excel ทีละ row
+
+        exporter = ExcelExporter("booking_result.xlsx", start, days)
+        for row in rows:
+            exporter.add(row)
+        exporter.close()   # เขียน sheet Calendar แล้วปิดไฟล์ -> จำนวนบ้าน
+
+    วันที่นอกช่วง start..start+days ไม่อยู่ใน Calendar (แต่ยังอยู่ใน Bookings)
+    """
+
+    def __init__(self, path, start, days, per_site=False):
+        import xlsxwriter
+
+        self.path = path
+        self.start = start
+        self.days = days
+        self.per_site = per_site
+        self.count = 0
+        self.matrix = MatrixBuilder(start, days)
+        self.sites = {}   # (รหัส, ชื่อบ้าน) -> ชื่อเว็บ (จากคอลัมน์ "เว็บ")
+
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        self.header_format = self.workbook.add_format({"bold": True, "bg_color": "#D9E1F2", "border": 1})
+        self.day_format = self.workbook.add_format(
+            {"bold": True, "align": "center", "bg_color": "#D9E1F2", "border": 1}
+        )
+        self.status_formats = {
+            value: (mark, self.workbook.add_format(
+                {"bg_color": color, "align": "center", "border": 1, "border_color": "#BFBFBF"}
+            ))
+            for value, (mark, color) in STATUS_CELLS.items()
+        }
+
+        # Bookings ต้องเพิ่มก่อน Calendar (ลำดับ sheet) แต่ Calendar เขียนตอน close
+        self.bookings = self.workbook.add_worksheet("Bookings")
+        for idx, col in enumerate(ROW_FIELDS):
+            self.bookings.set_column(idx, idx, COLUMN_WIDTHS.get(col, max(10, min(40, len(col) + 2))))
+        self.bookings.write_row(0, 0, ROW_FIELDS, self.header_format)
+        self.bookings.freeze_panes(1, 0)
+        self.calendar = self.workbook.add_worksheet("Calendar")
+
+    def add(self, row):
+        """เขียน row ลง Bookings ทันที และใส่ลงตาราง Calendar"""
+        self.count += 1
+        r = self.count
+        # เขียนตามชนิดโดยตรง (write_row ต้องเดาชนิดทุกช่อง ช้ากว่ามากเมื่อมีหลายแสน row)
+        for idx, col in enumerate(ROW_FIELDS):
+            value = row.get(col, "")
+            if col == "วันที่" and str(value).isdigit():
+                self.bookings.write_number(r, idx, int(value))
+            else:
+                self.bookings.write_string(r, idx, str(value))
+        self.matrix.add_row(row)
+        if row.get("เว็บ"):
+            house = (str(row.get("รหัส", "")).strip(), str(row.get("ชื่อบ้าน", "")).strip())
+            self.sites.setdefault(house, row["เว็บ"])
+
+    def close(self):
+        """เขียน Calendar (+ sheet แยกเว็บ) แล้วปิดไฟล์ -> จำนวนบ้าน"""
+        self.bookings.autofilter(0, 0, self.count, len(ROW_FIELDS) - 1)
+
+        houses = sorted(self.matrix.rows)
+        self._write_calendar(self.calendar, houses)
+        if self.per_site:
+            groups = {}
+            for house in houses:
+                groups.setdefault(site_group(house[0], self.sites.get(house)), []).append(house)
+            for name in sorted(groups):
+                self._write_calendar(self.workbook.add_worksheet(name), groups[name])
+
+        self.workbook.close()
+        return len(houses)
+
+    def _write_calendar(self, sheet, houses):
+        """ตารางบ้าน × วัน: แถวที่ 1 = เดือน, แถวที่ 2 = วันที่, ช่องที่ไม่ว่างลงสีตามสถานะ"""
+        sheet.set_column(0, 0, 12)
+        sheet.set_column(1, 1, 28)
+        if self.days:
+            sheet.set_column(CALENDAR_LABEL_COLS, CALENDAR_LABEL_COLS + self.days - 1, 3.5)
+        sheet.freeze_panes(CALENDAR_HEADER_ROWS, CALENDAR_LABEL_COLS)
+
+        # constant_memory: ต้องเขียนทีละแถวจากบนลงล่าง
+        days = [self.start + timedelta(days=i) for i in range(self.days)]
+        sheet.write(0, 0, "รหัส", self.header_format)
+        sheet.write(0, 1, "ชื่อบ้าน", self.header_format)
+        col = CALENDAR_LABEL_COLS
+        for i, d in enumerate(days):
+            if i == 0 or d.day == 1:
+                sheet.write(0, col + i, month_label(d.year, d.month), self.header_format)
+        sheet.write(1, 0, "", self.header_format)
+        sheet.write(1, 1, "", self.header_format)
+        for i, d in enumerate(days):
+            sheet.write_number(1, col + i, d.day, self.day_format)
+
+        for r, house in enumerate(houses, CALENDAR_HEADER_ROWS):
+            sheet.write_string(r, 0, house[0])
+            sheet.write_string(r, 1, house[1])
+            for i, value in enumerate(unpack_row(self.matrix.rows[house], self.days)):
+                if value != FREE:
+                    mark, fmt = self.status_formats[value]
+                    sheet.write_string(r, col + i, mark, fmt)
+
+
+def export_excel(csv_path, xlsx_path, start=None, days=None, per_site=False):
+    """
+    CSV ผลลัพธ์ -> Excel (Bookings + Calendar) -> จำนวนบ้าน
+
+    start / days = ช่วงของ Calendar (ไม่ระบุ = ต้นเดือนแรกถึงสิ้นเดือนสุดท้ายใน CSV)
+    คืน None ถ้าไม่มี xlsxwriter
+    """
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        print("⚠️ ไม่พบ xlsxwriter - ข้ามการสร้าง Excel (ติดตั้งด้วย: python -m pip install xlsxwriter)")
+        return None
+
+    if start is None or days is None:
+        start, days = date_range(csv_path) or (None, 0)
+
+    exporter = ExcelExporter(xlsx_path, start, days, per_site=per_site)
+    for row in read_rows(csv_path):
+        exporter.add(row)
+    return exporter.close()
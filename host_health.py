@@ -0,0 +1,260 @@
+"""
+สุขภาพของแต่ละ host: ลองใหม่แบบจำกัดจำนวน + circuit breaker (ใช้ร่วมกันทุก worker / thread)
+
+- unit ที่ error ลองใหม่ได้ไม่เกิน retries ครั้ง รอแบบ exponential backoff + jitter
+  (สุ่ม 0..min(max_delay, base_delay × 2^(ครั้งที่-1)) วินาที) และทั้ง host ลองใหม่ได้รวมไม่เกิน retry_budget ครั้งต่อรอบ
+- host ที่ล้มเหลวติดกัน failure_threshold ครั้งภายใน window วินาที จากบ้านอย่างน้อย 2 หลัง -> circuit เปิด:
+  unit ที่เหลือของ host นั้นถูกข้ามทันที (ไม่ต้องรอ timeout ของ WebDriverWait ทีละหน้า)
+  บ้านหลังเดียวที่เสีย (เช่น ถูกลบแต่ยังอยู่ในหน้ารวม) จึงไม่ทำให้ข้ามทั้งเว็บ
+- ครบ cooldown วินาทีแล้วปล่อยให้ลอง 1 unit (half-open): สำเร็จ = ปิด circuit, ล้มเหลว = เปิดต่อ
+- unit ที่ไม่สำเร็จ (ข้าม / error จนหมดสิทธิ์ลองใหม่) ถูกเก็บไว้ใน self.failed
+  เขียนเป็น booking_skipped.json และไม่นับ released ของบ้าน/เดือนนั้นใน change log
+
+    [{"site": "pattayaparty", "host": "pattayapartypoolvilla.com", "รหัส": "DV-2606", "month": null,
+      "reason": "circuit_open", "error": "...", "unit": "https://..."}]
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import sites
+from thai_dates import row_date
+
+SKIPPED = "circuit_open"   # ไม่ได้ส่ง request เพราะ circuit ของ host เปิดอยู่
+FAILED = "error"           # ลองครบแล้วยังไม่สำเร็จ
+
+
+class HostDown(Exception):
+    """circuit ของ host เปิดอยู่ -> ข้าม unit โดยไม่ส่ง request"""
+
+
+def host_of(url):
+    """ชื่อ host ของ url (ไม่สนใจ www.)"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _Host:
+    def __init__(self, retry_budget):
+        self.failures = deque()     # (เวลา, บ้าน) ที่ล้มเหลวติดกันภายใน window
+        self.opened = None          # เวลาที่ circuit เปิด (None = ปิด)
+        self.probing = False        # half-open: มี unit ที่ลองอยู่
+        self.retries_left = retry_budget
+        self.ok = 0
+        self.errors = 0
+        self.retries = 0
+        self.skipped = 0
+        self.trips = 0
+
+
+class HostHealth:
+    def __init__(self, retries=2, retry_budget=20, base_delay=1.0, max_delay=30.0,
+                 failure_threshold=5, window=120.0, cooldown=300.0):
+        """
+        - retries: จำนวนครั้งที่ลองใหม่สูงสุดต่อ unit (0 = ไม่ลองใหม่)
+        - retry_budget: จำนวนครั้งที่ลองใหม่ได้รวมทั้ง host ต่อรอบ
+        - base_delay / max_delay: ช่วง backoff (วินาที)
+        - failure_threshold / window: ล้มเหลวกี่ครั้งภายในกี่วินาทีจึงเปิด circuit
+        - cooldown: เปิด circuit นานเท่าไรก่อนลองใหม่ 1 unit
+        """
+        self.retries = retries
+        self.retry_budget = retry_budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.failed = []
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _Host(self.retry_budget)
+        return state
+
+    def check(self, host):
+        """raise HostDown ถ้า circuit ของ host เปิดอยู่ (ครบ cooldown แล้วปล่อยผ่าน 1 unit)"""
+        with self._lock:
+            state = self._host(host)
+            if state.opened is None:
+                return
+            waited = time.monotonic() - state.opened
+            if waited >= self.cooldown and not state.probing:
+                state.probing = True
+                return
+            state.skipped += 1
+            raise HostDown(f"{host} ล้มเหลวติดกัน - circuit เปิดอยู่ (พักอีก {max(0, self.cooldown - waited):.0f} วินาที)")
+
+    def is_open(self, host):
+        """circuit ของ host เปิดอยู่หรือไม่ (ไม่นับเป็นการข้าม และไม่เริ่ม half-open แบบ check)"""
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.opened is not None
+
+    def success(self, host):
+        with self._lock:
+            state = self._host(host)
+            state.ok += 1
+            state.failures.clear()
+            if state.opened is not None:
+                print(f"  🟢 {host} กลับมาแล้ว - ปิด circuit")
+            state.opened = None
+            state.probing = False
+
+    def failure(self, host, source=None):
+        """บันทึกความล้มเหลวของบ้าน source (เปิด circuit ถ้าครบเกณฑ์)"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._host(host)
+            state.errors += 1
+            state.failures.append((now, source))
+            while state.failures and now - state.failures[0][0] > self.window:
+                state.failures.popleft()
+            tripped = (
+                len(state.failures) >= self.failure_threshold
+                and len({who for _, who in state.failures}) >= 2
+            )
+            if state.probing or (state.opened is None and tripped):
+                if state.opened is None:
+                    state.trips += 1
+                    print(f"  🔌 {host} ล้มเหลว {len(state.failures)} ครั้งติดกัน - ข้ามทั้ง host {self.cooldown:.0f} วินาที")
+                state.opened = now
+                state.probing = False
+
+    def retry_delay(self, host, attempt):
+        """เวลารอ (วินาที) ก่อนลองใหม่ครั้งที่ attempt (1, 2, ...) หรือ None ถ้าไม่ลองแล้ว"""
+        if attempt > self.retries:
+            return None
+        with self._lock:
+            state = self._host(host)
+            if state.opened is not None or state.retries_left <= 0:
+                return None
+            state.retries_left -= 1
+            state.retries += 1
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, host, fn, label, source=None):
+        """
+        fn() พร้อมลองใหม่ตามนโยบายของ host (raise HostDown ถ้า circuit เปิด / error สุดท้ายถ้าลองครบ)
+
+        source = บ้านของ unit (รหัสหรือ URL) ใช้นับว่าความล้มเหลวมาจากหลายบ้านหรือไม่
+        """
+        attempt = 0
+        while True:
+            self.check(host)
+            try:
+                result = fn()
+            except Exception as e:
+                self.failure(host, source or label)
+                attempt += 1
+                delay = self.retry_delay(host, attempt)
+                if delay is None:
+                    raise
+                print(f"  🔁 ลองใหม่ ({label}) ครั้งที่ {attempt}/{self.retries} ใน {delay:.1f} วินาที: {e}")
+                time.sleep(delay)
+                continue
+            self.success(host)
+            return result
+
+    async def acall(self, host, crawl, label, source=None):
+        """call() สำหรับ coroutine: crawl() -> awaitable (รอ backoff ด้วย asyncio.sleep)"""
+        attempt = 0
+        while True:
+            self.check(host)
+            try:
+                result = await crawl()
+            except Exception as e:
+                self.failure(host, source or label)
+                attempt += 1
+                delay = self.retry_delay(host, attempt)
+                if delay is None:
+                    raise
+                print(f"  🔁 ลองใหม่ ({label}) ครั้งที่ {attempt}/{self.retries} ใน {delay:.1f} วินาที: {e}")
+                await asyncio.sleep(delay)
+                continue
+            self.success(host)
+            return result
+
+    def unit_failed(self, key, reason, error, code=None):
+        """บันทึก unit (url, รหัสบ้าน, เดือน) ที่ไม่ได้ข้อมูลรอบนี้ (code = รหัสบ้านถ้า key ไม่มี)"""
+        url, house, ym = key
+        with self._lock:
+            self.failed.append({
+                "site": sites.detect(url),
+                "host": host_of(url),
+                "รหัส": house or code,
+                "month": ym,
+                "reason": reason,
+                "error": str(error),
+                "unit": url,
+            })
+
+    def summary(self):
+        """สรุปต่อ host -> dict (เฉพาะ host ที่เคยล้มเหลว)"""
+        with self._lock:
+            return {
+                host: {
+                    "ok": s.ok, "errors": s.errors, "retries": s.retries, "skipped": s.skipped,
+                    "circuit_trips": s.trips, "open": s.opened is not None,
+                }
+                for host, s in sorted(self._hosts.items())
+                if s.errors or s.skipped
+            }
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("\n🩺 สุขภาพของ host:")
+        for host, s in summary.items():
+            state = " (circuit เปิดอยู่)" if s["open"] else ""
+            print(
+                f"   {host}: สำเร็จ {s['ok']}, ล้มเหลว {s['errors']}, ลองใหม่ {s['retries']}, "
+                f"ข้าม {s['skipped']} unit{state}"
+            )
+        if self.failed:
+            print(f"   ⏭️ unit ที่ไม่ได้ข้อมูลรอบนี้: {len(self.failed)} (ไม่นับเป็น released)")
+
+
+def write_failed(path, units):
+    """เขียนรายการ unit ที่ไม่ได้ข้อมูล (list ว่างถ้าครบทุก unit)"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(units, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def read_failed(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def failed_filter(units):
+    """
+    unit ที่ไม่ได้ข้อมูล -> ฟังก์ชัน row -> True ถ้า row อยู่ในบ้าน/เดือนของ unit เหล่านั้น
+
+    unit ที่ไม่มีเดือน = ทุกเดือนของบ้านนั้น, unit ที่ไม่รู้รหัสบ้าน (เช่น หน้ารวมโหลดไม่สำเร็จ) = ทุก row
+    """
+    everything = any(not unit.get("รหัส") for unit in units)
+    houses = {unit["รหัส"] for unit in units if unit.get("รหัส") and not unit.get("month")}
+    months = {(unit["รหัส"], unit["month"]) for unit in units if unit.get("รหัส") and unit.get("month")}
+
+    def covers(row):
+        if everything:
+            return True
+        code = str(row.get("รหัส", "")).strip()
+        if code in houses:
+            return True
+        day = row_date(row)
+        return day is not None and (code, day.strftime("%Y-%m")) in months
+
+    return covers
@@ -0,0 +1,223 @@
+"""
+จับเวลาแต่ละขั้นตอนของการรัน (span) และสรุปเป็น metrics JSON
+
+    with span("deville.fetch", site="deville", house="DV-2606", month="2026-03"):
+        ...
+    count_page("deville")
+
+ทุก span เก็บใน SPANS (ใช้ร่วมกันทุก thread) ตอนจบการรัน write_metrics() เขียน
+p50 / p95 ของแต่ละขั้นตอน (รวมและแยกตามเว็บ), span ที่ช้าที่สุด และ pages/min
+แล้วต่อท้ายสรุปย่อ 1 บรรทัดลงไฟล์ประวัติ (NDJSON) ให้ workflow เก็บไว้เทียบแต่ละรอบ
+
+เวลารอปฏิทินพร้อมของ readiness ก็เก็บที่นี่ (WAITS) — สรุปได้โดยไม่ต้อง import Selenium
+"""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+SLOWEST_SPANS = 10
+
+# span ทั้งหมดของการรันนี้: {'phase', 'seconds', 'ok', 'site', 'house', 'month'}
+SPANS = []
+PAGES = {}
+BYTES = {}   # ขนาดที่ Chrome โหลดจริงต่อเว็บ (transferSize รวม)
+# การรอปฏิทินพร้อมทั้งหมด: (ชื่อการรอ, วินาที, สำเร็จหรือไม่)
+WAITS = []
+_LOCK = threading.Lock()
+_process_started = time.time()   # ประมาณเวลาเริ่ม process (ตอน import โมดูลนี้)
+_run_started = _process_started
+_first_span = None               # เวลาเริ่ม span แรก (~ request แรก) ใช้วัด cold start
+
+
+def reset():
+    """เริ่มนับการรันใหม่ (เรียกตอนเริ่ม main)"""
+    global _run_started, _first_span
+    with _LOCK:
+        SPANS.clear()
+        PAGES.clear()
+        BYTES.clear()
+        WAITS.clear()
+        _run_started = time.time()
+        _first_span = None
+
+
+@contextmanager
+def span(phase, site=None, house=None, month=None):
+    """จับเวลาขั้นตอน phase (ok = False ถ้ามี exception หลุดออกมา)"""
+    global _first_span
+    if _first_span is None:
+        _first_span = time.time()
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        add_span(phase, time.perf_counter() - started, ok, site, house, month)
+
+
+def add_span(phase, seconds, ok=True, site=None, house=None, month=None):
+    """บันทึก span ที่จับเวลาเอง (เช่น เวลารวมของขั้นตอนที่ทำทีละ record)"""
+    record = {
+        'phase': phase,
+        'seconds': seconds,
+        'ok': ok,
+        'site': site,
+        'house': house,
+        'month': month,
+    }
+    with _LOCK:
+        SPANS.append(record)
+
+
+def count_page(site, n=1):
+    """นับหน้าที่โหลด (HTTP หรือ Chrome) ของเว็บ site"""
+    with _LOCK:
+        PAGES[site] = PAGES.get(site, 0) + n
+
+
+def count_bytes(site, n):
+    """นับขนาดที่ Chrome โหลดสำหรับหน้าของเว็บ site"""
+    with _LOCK:
+        BYTES[site] = BYTES.get(site, 0) + n
+
+
+def record_wait(name, seconds, ok):
+    """บันทึกการรอ 1 ครั้ง (เรียกจาก readiness)"""
+    with _LOCK:
+        WAITS.append((name, seconds, ok))
+
+
+def wait_summary():
+    """สรุปการรอ -> {ชื่อ: {'count', 'timeouts', 'total', 'avg', 'max'}}"""
+    with _LOCK:
+        log = list(WAITS)
+
+    waits = {}
+    for name, seconds, ok in log:
+        s = waits.setdefault(name, {'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0})
+        s['count'] += 1
+        s['total'] += seconds
+        s['max'] = max(s['max'], seconds)
+        if not ok:
+            s['timeouts'] += 1
+    for s in waits.values():
+        s['avg'] = s['total'] / s['count']
+    return waits
+
+
+def print_wait_summary():
+    waits = wait_summary()
+    if not waits:
+        return
+    print("\n⏱️ เวลารอปฏิทินพร้อม:")
+    for name, s in sorted(waits.items()):
+        print(
+            f"   {name:<28} {s['count']:>4} ครั้ง  เฉลี่ย {s['avg']:.2f}s  "
+            f"สูงสุด {s['max']:.2f}s  รวม {s['total']:.1f}s  timeout {s['timeouts']}"
+        )
+
+
+def _percentile(sorted_values, pct):
+    """nearest-rank percentile ของ list ที่เรียงแล้ว"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _stats(seconds, errors):
+    seconds = sorted(seconds)
+    return {
+        'count': len(seconds),
+        'errors': errors,
+        'total': round(sum(seconds), 4),
+        'p50': round(_percentile(seconds, 50), 4),
+        'p95': round(_percentile(seconds, 95), 4),
+        'max': round(seconds[-1], 4),
+    }
+
+
+def _group(spans, key):
+    groups = {}
+    for s in spans:
+        g = groups.setdefault(key(s), ([], [0]))
+        g[0].append(s['seconds'])
+        if not s['ok']:
+            g[1][0] += 1
+    return {k: _stats(values, errors[0]) for k, (values, errors) in sorted(groups.items())}
+
+
+def summary():
+    """สรุปการรันนี้ -> dict (เขียนเป็น JSON ได้)"""
+    with _LOCK:
+        spans = list(SPANS)
+        pages = dict(PAGES)
+        page_bytes = dict(BYTES)
+    wall = time.time() - _run_started
+    total_pages = sum(pages.values())
+
+    by_site = {}
+    for site in sorted({s['site'] for s in spans if s['site']}):
+        by_site[site] = _group([s for s in spans if s['site'] == site], lambda s: s['phase'])
+
+    slowest = sorted(spans, key=lambda s: s['seconds'], reverse=True)[:SLOWEST_SPANS]
+    return {
+        'started_at': datetime.fromtimestamp(_run_started).isoformat(timespec='seconds'),
+        'wall_seconds': round(wall, 2),
+        # import + เตรียมการ ก่อนเริ่มดึงหน้าแรก
+        'startup_seconds': round(_first_span - _process_started, 3) if _first_span else None,
+        'pages': pages,
+        'pages_total': total_pages,
+        'pages_per_min': round(total_pages / wall * 60, 1) if wall > 0 else None,
+        'browser_bytes': page_bytes,
+        'phases': _group(spans, lambda s: s['phase']),
+        'by_site': by_site,
+        'slowest': [dict(s, seconds=round(s['seconds'], 4)) for s in slowest],
+    }
+
+
+def print_summary(data=None):
+    data = data or summary()
+    if not data['phases']:
+        return
+    print(f"\n📈 เวลาแต่ละขั้นตอน (รวม {data['wall_seconds']:.1f}s, {data['pages_total']} หน้า, "
+          f"{data['pages_per_min'] or 0:.1f} หน้า/นาที, เริ่มดึงหน้าแรกหลังเริ่ม process "
+          f"{data['startup_seconds'] or 0:.2f}s):")
+    for phase, s in data['phases'].items():
+        print(
+            f"   {phase:<22} {s['count']:>5} ครั้ง  p50 {s['p50']:.3f}s  p95 {s['p95']:.3f}s  "
+            f"สูงสุด {s['max']:.2f}s  รวม {s['total']:.1f}s" + (f"  error {s['errors']}" if s['errors'] else "")
+        )
+    for site, n in sorted(data['browser_bytes'].items()):
+        pages = data['pages'].get(site) or 1
+        print(f"   🌐 {site}: Chrome โหลด {n / 1024:,.0f} KB (~{n / 1024 / pages:,.0f} KB/หน้า)")
+
+
+def write_metrics(path, history_path=None, extra=None):
+    """เขียน metrics ของการรันนี้ลง path และต่อท้ายสรุปย่อลง history_path (NDJSON)"""
+    data = summary()
+    if extra:
+        data.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    if history_path:
+        line = {
+            'started_at': data['started_at'],
+            'wall_seconds': data['wall_seconds'],
+            'startup_seconds': data['startup_seconds'],
+            'pages_total': data['pages_total'],
+            'pages_per_min': data['pages_per_min'],
+            'browser_bytes': sum(data['browser_bytes'].values()),
+            'phases': {phase: {'p50': s['p50'], 'p95': s['p95'], 'count': s['count']}
+                       for phase, s in data['phases'].items()},
+        }
+        with open(history_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return data
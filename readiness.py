@@ -0,0 +1,129 @@
+"""
+รอจนปฏิทินพร้อมด้วยเงื่อนไขเฉพาะของแต่ละเว็บ (แทน time.sleep แบบตายตัว)
+
+ทุกการรอผ่าน WebDriverWait จึงคืนค่าทันทีที่เงื่อนไขเป็นจริง และบันทึกเวลาที่รอจริง
+ไว้ใน metrics.WAITS (ใช้ร่วมกันทุก thread) เพื่อสรุปตอนจบการรัน
+"""
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from metrics import record_wait
+from thai_dates import THAI_MONTHS
+
+DEFAULT_TIMEOUT = 15
+POLL_INTERVAL = 0.1
+
+# header เดือนของปฏิทิน Pattaya Party (ข้อความที่มีชื่อเดือนภาษาไทย)
+THAI_MONTH_XPATH = "//*[" + " or ".join(
+    f"contains(text(),'{name}')" for name in THAI_MONTHS
+) + "]"
+
+
+class Readiness:
+    """ชุดเงื่อนไข "ปฏิทินพร้อมแล้ว" ของแต่ละเว็บ สำหรับ driver หนึ่งตัว"""
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.timeout = timeout
+
+    def wait(self, name, condition, timeout=None):
+        """
+        รอจน condition(driver) คืนค่า truthy แล้วคืนค่านั้น
+        ถ้าหมดเวลาคืน None (ไม่ raise) — ผู้เรียกใช้ค่าสำรองของตัวเอง
+        """
+        start = time.perf_counter()
+        ok = True
+        try:
+            return WebDriverWait(
+                self.driver, timeout or self.timeout, poll_frequency=POLL_INTERVAL,
+                ignored_exceptions=(StaleElementReferenceException,),
+            ).until(condition)
+        except TimeoutException:
+            ok = False
+            return None
+        finally:
+            record_wait(name, time.perf_counter() - start, ok)
+
+    # ---------- Deville Groups ----------
+    def deville_listing(self):
+        """หน้ารวม Deville: มี iframe ปฏิทิน cld.php อย่างน้อย 1 อัน"""
+        return self.wait(
+            "deville.listing",
+            EC.presence_of_element_located((By.CSS_SELECTOR, "iframe[src*='cld.php']")),
+        )
+
+    def deville_month(self, timeout=10):
+        """cld.php: มี <th> ที่เป็นหัวเดือน (มีปี พ.ศ. 256x/257x)"""
+        return self.wait(
+            "deville.month_header",
+            EC.presence_of_element_located(
+                (By.XPATH, "//th[contains(text(),'256') or contains(text(),'257')]")
+            ),
+            timeout,
+        )
+
+    # ---------- Pool Villa City (FullCalendar) ----------
+    def fullcalendar(self):
+        """FullCalendar render ตารางวันแล้ว (มี td.fc-daygrid-day)"""
+        return self.wait(
+            "poolvillacity.grid",
+            EC.presence_of_element_located((By.CLASS_NAME, "fc-daygrid-day")),
+        )
+
+    def fullcalendar_state(self):
+        """ชื่อเดือนบน toolbar + cell แรก (ใช้ตรวจว่ากด Next แล้วเปลี่ยนหน้า)"""
+        title = self.driver.find_elements(By.CLASS_NAME, "fc-toolbar-title")
+        cells = self.driver.find_elements(By.CLASS_NAME, "fc-daygrid-day")
+        return (title[0].text if title else None, cells[0] if cells else None)
+
+    def fullcalendar_changed(self, old_state):
+        """หลังกด Next: ชื่อเดือนเปลี่ยน หรือ cell เดิมถูก render ใหม่"""
+        old_title, old_cell = old_state
+
+        def changed(driver):
+            if old_cell is not None:
+                try:
+                    old_cell.is_enabled()
+                except StaleElementReferenceException:
+                    return bool(driver.find_elements(By.CLASS_NAME, "fc-daygrid-day"))
+            if old_title is not None:
+                title = driver.find_elements(By.CLASS_NAME, "fc-toolbar-title")
+                return bool(title) and title[0].text != old_title
+            return False
+
+        return self.wait("poolvillacity.next", changed, 5)
+
+    # ---------- Pattaya Party (Tailwind grid) ----------
+    def pattaya_calendar(self):
+        """ปฏิทิน Pattaya render แล้ว (มี div.grid.grid-cols-7 ที่มี cell วัน)"""
+        return self.wait(
+            "pattayaparty.grid",
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "div.grid.grid-cols-7 div.aspect-square")
+            ),
+        )
+
+    def pattaya_header(self):
+        """ข้อความ header เดือนปัจจุบันของปฏิทิน Pattaya ("" ถ้าไม่พบ)"""
+        elements = self.driver.find_elements(By.XPATH, THAI_MONTH_XPATH)
+        return elements[0].text.strip() if elements else ""
+
+    def pattaya_month_changed(self, old_header, timeout=5):
+        """หลังกด Next / วันนี้: header เดือนเปลี่ยนจากข้อความเดิม"""
+        def changed(driver):
+            header = self.pattaya_header()
+            return header if header and header != old_header else None
+
+        return self.wait("pattayaparty.month_changed", changed, timeout)
+
+    def pattaya_month_shown(self, *parts, timeout=5):
+        """header แสดงเดือนที่ต้องการแล้ว เช่น ("มีนาคม", "2569") หลังกดปุ่ม 'วันนี้'"""
+        def shown(driver):
+            header = self.pattaya_header()
+            return all(part in header for part in parts)
+
+        return self.wait("pattayaparty.month_shown", shown, timeout)
@@ -0,0 +1,160 @@
+"""
+ตารางรอบดึงใหม่ของแต่ละ (เว็บ, รหัสบ้าน, เดือน) ตามระยะห่างจากวันนี้และความถี่ที่เคยเปลี่ยน
+
+เดือนใกล้ ๆ เปลี่ยนบ่อย (ดึงทุกรอบ) เดือนไกล ๆ แทบไม่เปลี่ยน (ดึงวันละครั้งหรือน้อยกว่า):
+
+    interval = ชั่วโมงตามระยะห่าง (intervals) × (1.5 - อัตราการเปลี่ยน)
+
+- อัตราการเปลี่ยน = ค่าเฉลี่ยถ่วงน้ำหนัก (EWMA) ของ "รอบที่ดึงแล้ว row ไม่เหมือนรอบก่อน" (0..1)
+  unit ที่เปลี่ยนทุกรอบ -> interval ครึ่งหนึ่ง, ไม่เคยเปลี่ยน -> 1.5 เท่า
+- unit ที่ครบกำหนดถูกดึงตามลำดับความเร่งด่วน (เวลาที่ผ่านไป / interval) ภายใน page budget
+- unit ที่ยังไม่ครบกำหนด (หรือเกิน budget) ใช้ row ล่าสุดจาก CalendarCache — ผลลัพธ์จึงยังครบทุกบ้าน
+- unit ที่ยังไม่เคยดึง / ไม่มี row ใน cache ต้องดึงเสมอ (นับรวมใน budget แต่ไม่ถูกตัด)
+
+ใช้กับเว็บที่แยกดึงทีละ (บ้าน, เดือน) ได้ (Deville) — เว็บที่อ่านทุกเดือนจากการโหลดหน้าเดียว
+ยังดึงทุกรอบ
+
+    {"version": 1, "units": {"deville|DV-2606|2026-03": {"checked": 1767225600.0, "fp": "...", "rate": 0.4}}}
+"""
+import json
+import os
+import threading
+import time
+from datetime import date
+
+from calendar_cache import cache_key, fingerprint
+
+SCHEDULE_VERSION = 1
+INITIAL_RATE = 0.5   # unit ใหม่: ถือว่าเปลี่ยนครึ่งหนึ่งของรอบ
+RATE_WEIGHT = 0.3    # น้ำหนักของรอบล่าสุดใน EWMA
+
+# (ระยะห่างจากวันนี้ถึงต้นเดือนไม่เกิน (วัน), interval (ชั่วโมง)) — None = ไกลกว่านั้นทั้งหมด
+DEFAULT_INTERVALS = ((28, 4), (60, 12), (90, 24), (None, 72))
+
+
+class RefreshScheduler:
+    def __init__(self, path, cache, intervals=DEFAULT_INTERVALS, budget=0, today=None):
+        """
+        - path: ไฟล์สถานะ (เวลาที่ดึงล่าสุด / fingerprint / อัตราการเปลี่ยน ของแต่ละ unit)
+        - cache: CalendarCache ที่เก็บ row ล่าสุดของทุก unit
+        - budget: จำนวนหน้าสูงสุดที่ดึงต่อรอบ (0 = ไม่จำกัด ดึงทุก unit ที่ครบกำหนด)
+        """
+        self.path = path
+        self.cache = cache
+        self.intervals = intervals
+        self.budget = budget
+        self.remaining = budget
+        self.today = today or date.today()
+        self.now = time.time()
+        self.units = {}
+        self._carry = set()   # unit ที่วางแผนแล้วว่าใช้ row เดิม
+        self._lock = threading.Lock()
+        self.stats = {"due": 0, "new": 0, "carried": 0, "over_budget": 0, "changed": 0, "checked": 0}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ อ่านตารางรอบดึง ({self.path}) ไม่สำเร็จ ({e}) - เริ่มใหม่")
+            return
+        if data.get("version") == SCHEDULE_VERSION:
+            self.units = data.get("units", {})
+
+    def interval(self, ym, rate):
+        """interval (วินาที) ของเดือน ym ("2026-03") ที่มีอัตราการเปลี่ยน rate"""
+        first = date(int(ym[:4]), int(ym[5:7]), 1)
+        ahead = max(0, (first - self.today).days)
+        hours = self.intervals[-1][1]
+        for limit, limit_hours in self.intervals:
+            if limit is None or ahead <= limit:
+                hours = limit_hours
+                break
+        return hours * 3600 * (1.5 - rate)
+
+    def plan(self, site, units):
+        """
+        เลือก unit (รหัสบ้าน, เดือน) ที่ต้องดึงในรอบนี้ -> จำนวนที่เลือก
+
+        unit ที่ไม่ถูกเลือกใช้ row จาก cache ผ่าน carried()
+        """
+        must, due, carry = [], [], []
+        with self._lock:
+            for code, ym in units:
+                key = cache_key(site, code, ym)
+                state = self.units.get(key)
+                if state is None or not self.cache.has(key):
+                    must.append(key)
+                    continue
+                urgency = (self.now - state.get("checked", 0)) / max(1.0, self.interval(ym, state.get("rate", INITIAL_RATE)))
+                if urgency >= 1:
+                    due.append((urgency, key))
+                else:
+                    carry.append(key)
+
+            due.sort(reverse=True)
+            chosen = list(must)
+            if self.budget > 0:
+                room = max(0, self.remaining - len(must))
+                chosen += [key for _, key in due[:room]]
+                carry += [key for _, key in due[room:]]
+                self.stats["over_budget"] += max(0, len(due) - room)
+                self.remaining = max(0, self.remaining - len(chosen))
+            else:
+                chosen += [key for _, key in due]
+
+            self._carry.update(carry)
+            self.stats["new"] += len(must)
+            self.stats["due"] += len(chosen) - len(must)
+        return len(chosen)
+
+    def carried(self, site, code, ym):
+        """row ล่าสุดของ unit ที่ไม่ต้องดึงรอบนี้ (None = ต้องดึง)"""
+        key = cache_key(site, code, ym)
+        with self._lock:
+            if key not in self._carry:
+                return None
+        rows = self.cache.rows(key)
+        if rows is not None:
+            with self._lock:
+                self.stats["carried"] += 1
+        return rows
+
+    def observe(self, site, code, ym, rows):
+        """บันทึกผลการดึง unit (เปลี่ยนจากรอบก่อนหรือไม่) เพื่อปรับ interval รอบหน้า"""
+        key = cache_key(site, code, ym)
+        fp = fingerprint([record.to_list() for record in rows])
+        with self._lock:
+            state = self.units.get(key)
+            if state is None:
+                state = self.units[key] = {"rate": INITIAL_RATE}
+            else:
+                changed = state.get("fp") != fp
+                state["rate"] = round((1 - RATE_WEIGHT) * state.get("rate", INITIAL_RATE) + RATE_WEIGHT * changed, 4)
+                self.stats["changed"] += changed
+                self.stats["checked"] += 1
+            state["fp"] = fp
+            state["checked"] = self.now
+
+    def save(self):
+        """เขียนสถานะ (ลบ unit ของเดือนที่ผ่านไปแล้ว)"""
+        current = self.today.strftime("%Y-%m")
+        with self._lock:
+            units = {k: v for k, v in self.units.items() if k.rsplit("|", 1)[-1] >= current}
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": SCHEDULE_VERSION, "units": units}, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+
+    def print_stats(self):
+        s = self.stats
+        budget = f", เกิน budget {s['over_budget']} unit" if self.budget > 0 else ""
+        print(
+            f"\n🗓️ รอบดึง: ดึงใหม่ {s['due'] + s['new']} unit (ครบกำหนด {s['due']}, ยังไม่มีข้อมูล {s['new']}), "
+            f"ใช้ข้อมูลเดิม {s['carried']} unit{budget}"
+        )
+        if s["checked"]:
+            print(f"   เปลี่ยนจากรอบก่อน {s['changed']}/{s['checked']} unit ที่ดึงซ้ำ")
@@ -0,0 +1,195 @@
+"""
+บันทึกหน้าเว็บที่ scraper เข้า (record) และเล่นซ้ำผ่าน HTTP server ในเครื่อง (replay)
+
+ใช้รันทั้ง pipeline แบบ offline ซ้ำได้เหมือนเดิมทุกครั้ง เพื่อวัด/ปรับ concurrency และการรอ
+
+    python scrape_calendar.py --record recordings/2026-03     # รันกับเว็บจริง + บันทึกทุกหน้า
+    python replay.py recordings/2026-03 --port 8800 --latency 0.3
+    python scrape_calendar.py --replay http://127.0.0.1:8800  # รันกับ server ในเครื่อง
+
+โครงสร้างที่บันทึก:
+
+    <dir>/index.json     {"version": 1, "pages": {url: {"file", "content_type"}}}
+    <dir>/pages/*        body ของแต่ละ URL
+
+ตอน replay URL ถูกเปลี่ยนเป็น <replay>/<host>/<path>?<query> (ผ่าน route()) ทั้งฝั่ง HTTP
+และ Chrome ลิงก์แบบ relative ในหน้า (เช่น iframe cld.php) จึงชี้กลับมาที่ server เดิม
+ส่วนการตรวจประเภทเว็บยังใช้ URL จริง
+
+หน้าที่เปิดด้วย Chrome ถูกบันทึกเป็น DOM หลัง render (ตัด <script> ออก) จึงเล่นซ้ำได้โดยไม่ต้อง
+โหลด JavaScript ของเว็บ - หน้าที่ต้องกด Next (Pattaya / FullCalendar) จะมีเฉพาะ view แรก
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+INDEX_FILE = "index.json"
+PAGES_DIR = "pages"
+DEFAULT_PORT = 8800
+
+_SCRIPT_TAG = re.compile(r"<script\b.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+# สถานะของ process นี้ (ตั้งจาก main ด้วย start_recording / use_replay)
+_recorder = None
+_replay_base = None
+
+
+def _page_key(url):
+    """key ของหน้า: host + path + query (ไม่สนใจ scheme)"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+class Recorder:
+    """เก็บ body ของทุก URL ลงโฟลเดอร์ (ใช้ร่วมกันหลาย thread ได้)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(path, PAGES_DIR), exist_ok=True)
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                self.pages = json.load(f).get("pages", {})
+
+    def record(self, url, body, content_type="text/html; charset=utf-8"):
+        key = _page_key(url)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".html"
+        with open(os.path.join(self.path, PAGES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(body)
+        with self._lock:
+            self.pages[key] = {"url": url, "file": name, "content_type": content_type}
+
+    def save(self):
+        with self._lock:
+            tmp = os.path.join(self.path, INDEX_FILE + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "pages": self.pages}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+        return len(self.pages)
+
+
+def start_recording(path):
+    """เริ่มบันทึกทุกหน้าที่ดึงในการรันนี้ลง path"""
+    global _recorder
+    _recorder = Recorder(path)
+    return _recorder
+
+
+def stop_recording():
+    """เขียน index แล้วหยุดบันทึก -> จำนวนหน้า (None ถ้าไม่ได้บันทึก)"""
+    global _recorder
+    if _recorder is None:
+        return None
+    count = _recorder.save()
+    _recorder = None
+    return count
+
+
+def record(url, body, browser=False):
+    """บันทึก body ของ url (ถ้าเปิด record) - browser=True ตัด <script> ออกจาก DOM ที่ render แล้ว"""
+    if _recorder is not None and body:
+        _recorder.record(url, _SCRIPT_TAG.sub("", body) if browser else body)
+
+
+def use_replay(base_url):
+    """ส่งทุก request ไปที่ replay server (None = เว็บจริง)"""
+    global _replay_base
+    _replay_base = base_url.rstrip("/") if base_url else None
+
+
+def route(url):
+    """URL ที่ต้องดึงจริง: URL เดิม หรือ URL บน replay server"""
+    if _replay_base is None:
+        return url
+    return f"{_replay_base}/{_page_key(url)}"
+
+
+# ========================================================
+# Replay server
+# ========================================================
+class ReplayStore:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as f:
+            self.pages = json.load(f).get("pages", {})
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        """(content_type, body bytes) หรือ None"""
+        page = self.pages.get(key)
+        if page is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with open(os.path.join(self.path, PAGES_DIR, page["file"]), "rb") as f:
+            return page.get("content_type", "text/html; charset=utf-8"), f.read()
+
+
+def make_handler(store, latency=0.0, jitter=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True   # ส่ง header + body ทันที (ไม่ติด delayed ACK 40 ms)
+
+        def do_GET(self):
+            delay = latency + (random.uniform(-jitter, jitter) if jitter else 0)
+            if delay > 0:
+                time.sleep(delay)
+
+            page = store.lookup(self.path.lstrip("/"))
+            if page is None:
+                print(f"  ❓ ไม่มีในบันทึก: {self.path}")
+                body = b"not recorded"
+                self.send_response(404)
+                self.send_header("Content-Type", "text/plain")
+            else:
+                content_type, body = page
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(path, host="127.0.0.1", port=DEFAULT_PORT, latency=0.0, jitter=0.0):
+    store = ReplayStore(path)
+    server = ThreadingHTTPServer((host, port), make_handler(store, latency, jitter))
+    server.daemon_threads = True
+    print(f"🔁 Replay {len(store.pages)} หน้าจาก {path} ที่ http://{host}:{port}/ "
+          f"(latency {latency * 1000:.0f}±{jitter * 1000:.0f} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n🔁 hit {store.hits} / miss {store.misses}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay server สำหรับหน้าที่บันทึกด้วย --record")
+    parser.add_argument("path", help="โฟลเดอร์ที่บันทึกไว้")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="หน่วงทุก response (วินาที)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="สุ่มหน่วงเพิ่ม/ลด ± วินาที")
+    args = parser.parse_args(argv)
+    serve(args.path, args.host, args.port, args.latency, args.jitter)
+
+
+if __name__ == "__main__":
+    main()
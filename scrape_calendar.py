@@ -1,21 +1,65 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
-import pandas as pd
+import argparse
 import re
 import os
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from urllib.parse import urlparse
+
+import sites
+from availability_matrix import MatrixBuilder
+from availability_query import load_rows
+from availability_service import push_rows
+from booking_record import records_from_rows, to_rows
+from browser_profile import PROFILES, TRANSFER_SIZE_JS, apply as apply_profile, configure_options
+from calendar_cache import CalendarCache, fingerprint
+from checkpoint import Checkpoint
+from host_health import FAILED, SKIPPED, HostDown, HostHealth, failed_filter, host_of, write_failed
+from refresh_schedule import RefreshScheduler
+from excel_export import export_excel
+from chromedriver import resolve as resolve_chromedriver
+from change_log import ChangeTracker, append_events, load_snapshot, summarize
+from replay import record, route, start_recording, stop_recording, use_replay
+from shards import Shard
+from sinks import ChangeSink, CsvWriter, Dedupe, Fanout, JsonWriter, MatrixSink, NdjsonWriter, PastDateFilter, Stats
+import metrics
+from metrics import count_bytes, print_wait_summary, span, wait_summary
+from worker_pool import run_pool
 
 # ===== CONFIG =====
 MONTH_TO_SCRAPE = 5   # 👈 จำนวนเดือนที่ต้องการ (ลดลงเพื่อ debug)
 MAX_HOUSES = 0       # 👈 จำนวนบ้านที่ต้องการดึง (0 = ทั้งหมด) - เพิ่มเพื่อดึง Madagascar 4
 DEBUG_MODE = True     # 👈 เปิด debug mode เพื่อบันทึก HTML/screenshot
+DEVILLE_ENGINE = "http"  # 👈 "http" = ดึง cld.php ผ่าน HTTP (เร็ว, ไม่ใช้ Chrome), "selenium" = เปิดด้วย Chrome
+WORKERS = 1           # 👈 จำนวน worker ที่ scrape พร้อมกัน (1 Chrome ต่อ worker) - แก้ได้ด้วย --workers
+POOLVILLA_MODE = "api"  # 👈 "api" = อ่าน event จาก FullCalendar ในครั้งเดียว, "click" = กด Next ทีละเดือน
+MAX_PER_HOST = 4      # 👈 โหมด --async: จำนวน request ค้างสูงสุดต่อ host
+RESULT_CSV_FILE = "booking_result.csv"       # 👈 ผลลัพธ์ (เขียนทีละเดือนระหว่าง scrape)
+RESULT_NDJSON_FILE = "booking_result.ndjson"  # 👈 ผลลัพธ์แบบ 1 บรรทัด = 1 row (เขียนพร้อม CSV)
+RESULT_XLSX_FILE = "booking_result.xlsx"    # 👈 Excel: Bookings + Calendar (บ้าน × วัน ลงสีตามสถานะ)
+EXCEL_PER_SITE = False                      # 👈 True = เพิ่ม sheet Calendar แยกตามเว็บ (deville, poolvillacity, ...)
+SNAPSHOT_FILE = "booking_result.json"       # 👈 snapshot รอบก่อน (ใช้เทียบหาการเปลี่ยนแปลง)
+CHANGE_LOG_FILE = "booking_changes.ndjson"  # 👈 log การเปลี่ยนแปลง (ต่อท้ายไฟล์ทุกรอบ)
+MATRIX_FILE = "booking_result.avm"          # 👈 ตารางว่าง/ไม่ว่างแบบ bit-packed (อ่านด้วย availability_matrix)
+METRICS_FILE = "run_metrics.json"                   # 👈 เวลาแต่ละขั้นตอน (p50/p95) + หน้า/นาที ของรอบล่าสุด
+METRICS_HISTORY_FILE = "run_metrics_history.ndjson"  # 👈 สรุปย่อของทุกรอบ (ต่อท้ายไฟล์)
+AVAILABILITY_SERVICE_URL = ""               # 👈 เช่น "http://127.0.0.1:8765" = push ผลลัพธ์ให้ availability_service ("" = ไม่ส่ง)
+CACHE_FILE = "calendar_cache.json"  # 👈 cache ปฏิทินที่ไม่เปลี่ยน (ข้ามการ parse) - ปิดได้ด้วย --no-cache
+CACHE_MAX_AGE_DAYS = 7              # 👈 ลบ entry ที่ไม่ได้ใช้นานกว่านี้
+CACHE_MAX_ENTRIES = 20000           # 👈 จำนวน entry สูงสุด (บ้าน × เดือน)
+BROWSER_PROFILE = "lean"  # 👈 "lean" = ไม่โหลดรูป/ฟอนต์/CSS/วิดีโอ/analytics + eager page load, "full" = โหลดทุกอย่าง
+CHROMEDRIVER_CACHE_FILE = ".chromedriver.json"  # 👈 path + เวอร์ชัน chromedriver ที่หาไว้ (ไม่ต้องต่อเน็ตทุกรอบ)
+CHECKPOINT_FILE = "scrape_checkpoint.ndjson"    # 👈 unit (url, บ้าน, เดือน) ที่เสร็จแล้ว - รันต่อได้ด้วย --resume
+REFRESH_SCHEDULE = False                        # 👈 True = ดึงแต่ละ (บ้าน, เดือน) ตามรอบ (เดือนไกลดึงห่างกว่า) - เปิดได้ด้วย --schedule
+REFRESH_STATE_FILE = "refresh_state.json"       # 👈 เวลาที่ดึงล่าสุด + อัตราการเปลี่ยนของแต่ละ (บ้าน, เดือน)
+REFRESH_INTERVAL_HOURS = ((28, 4), (60, 12), (90, 24), (None, 72))  # 👈 (เดือนที่เริ่มภายใน N วัน, ดึงทุก H ชั่วโมง)
+PAGE_BUDGET = 0                                 # 👈 จำนวนหน้าปฏิทินสูงสุดต่อรอบเมื่อเปิด --schedule (0 = ไม่จำกัด)
+PAGE_LOAD_TIMEOUT = 30                          # 👈 วินาทีสูงสุดที่รอ Chrome โหลดหน้า (ค่าเริ่มต้นของ Selenium = 300)
+RETRIES = 2                                     # 👈 ลองใหม่สูงสุดต่อ unit (บ้าน / เดือน) ที่ error
+RETRY_BUDGET = 20                               # 👈 จำนวนครั้งที่ลองใหม่ได้รวมต่อ host ต่อรอบ
+BACKOFF_SECONDS = (1.0, 30.0)                   # 👈 backoff ครั้งแรก / สูงสุด (×2 ทุกครั้ง + สุ่ม jitter)
+CIRCUIT_FAILURES = 5                            # 👈 host ที่ล้มเหลวติดกันกี่ครั้ง (จากบ้านอย่างน้อย 2 หลัง)...
+CIRCUIT_WINDOW_SECONDS = 120                    # 👈 ...ภายในกี่วินาที จะถูกข้ามทั้ง host (circuit breaker)
+CIRCUIT_COOLDOWN_SECONDS = 300                  # 👈 ข้าม host นานเท่าไรก่อนลองใหม่ 1 unit
+SKIPPED_FILE = "booking_skipped.json"           # 👈 unit ที่ไม่ได้ข้อมูลรอบนี้ (host ล่ม / error จนหมดสิทธิ์ลองใหม่)
 
 # รายการ URL ที่ต้องการ scrape (รองรับหลายเว็บ) — ใช้เป็น fallback
 URLS = [
@@ -51,99 +95,157 @@ def load_urls_from_webpath():
 
 
 class CalendarScraper:
-    """Base class สำหรับ scraping ปฏิทิน"""
-    
-    # Map ชื่อเดือนภาษาไทย -> เลขเดือน
-    THAI_MONTH_MAP = {
-        'มกราคม': 1, 'กุมภาพันธ์': 2, 'มีนาคม': 3, 'เมษายน': 4,
-        'พฤษภาคม': 5, 'มิถุนายน': 6, 'กรกฎาคม': 7, 'สิงหาคม': 8,
-        'กันยายน': 9, 'ตุลาคม': 10, 'พฤศจิกายน': 11, 'ธันวาคม': 12
-    }
+    """Base class สำหรับ scraping ปฏิทิน (วิธี scrape ของแต่ละเว็บอยู่ใน sites/)"""
     
-    def __init__(self, driver):
-        self.driver = driver
-        self.results = []
+    def __init__(self, driver=None, driver_factory=None, cache=None, checkpoint=None, shard=None, scheduler=None,
+                 health=None):
+        """
+        แต่ละ instance มี driver / adapter (และ HTTP client ของ adapter) เป็นของตัวเอง
+        (worker pool สร้าง 1 instance ต่อ worker จึงรันพร้อมกันได้)
+        
+        - driver: WebDriver ที่สร้างไว้แล้ว
+        - driver_factory: ฟังก์ชันสร้าง WebDriver (สร้างเมื่อใช้ครั้งแรกเท่านั้น)
+        - cache: CalendarCache ที่ใช้ร่วมกัน (None = ไม่ใช้ cache)
+        - checkpoint: Checkpoint ที่ใช้ร่วมกัน (None = ไม่บันทึก unit ที่เสร็จ)
+        - shard: shards.Shard (None = ดึงทุกบ้าน)
+        - scheduler: RefreshScheduler ที่ใช้ร่วมกัน (None = ดึงทุก unit ทุกรอบ)
+        - health: HostHealth ที่ใช้ร่วมกัน (None = ไม่ลองใหม่ / ไม่มี circuit breaker)
+        """
+        self._driver = driver
+        self.driver_factory = driver_factory
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.shard = shard
+        self.scheduler = scheduler
+        self.health = health
+        self._ready = None
+        self._adapters = {}
         self.today = datetime.now().date()  # วันที่ปัจจุบัน
+        
+        # config ที่ adapter ใช้ (adapter ไม่ import โมดูลนี้)
+        self.month_count = MONTH_TO_SCRAPE
+        self.max_houses = MAX_HOUSES
+        self.debug = DEBUG_MODE
+        self.deville_engine = DEVILLE_ENGINE
+        self.poolvilla_mode = POOLVILLA_MODE
+    
+    @property
+    def driver(self):
+        """WebDriver ของ scraper นี้ (เปิด Chrome เมื่อใช้ครั้งแรก)"""
+        if self._driver is None and self.driver_factory is not None:
+            self._driver = self.driver_factory()
+        return self._driver
+    
+    @property
+    def ready(self):
+        """เงื่อนไขรอปฏิทินพร้อม (Readiness) ของ driver นี้"""
+        from readiness import Readiness  # import Selenium เฉพาะเมื่อใช้ Chrome
+        
+        driver = self.driver
+        if self._ready is None or self._ready.driver is not driver:
+            self._ready = Readiness(driver)
+        return self._ready
+    
+    def adapter(self, site_type):
+        """adapter ของเว็บ site_type สำหรับ scraper นี้ (import โมดูลของเว็บเมื่อใช้ครั้งแรก)"""
+        adapter = self._adapters.get(site_type)
+        if adapter is None:
+            adapter = self._adapters[site_type] = sites.load(site_type)(self)
+        return adapter
+    
+    def close(self):
+        """ปิด Chrome และ HTTP client ของ adapter ทุกตัว"""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+        for adapter in self._adapters.values():
+            adapter.close()
+    
+    def open(self, url):
+        """เปิด url ด้วย Chrome (ไปที่ replay server แทนถ้ารันด้วย --replay)"""
+        self.driver.get(route(url))
     
-    def filter_past_dates(self, results):
+    def record_page(self, url):
+        """DOM ปัจจุบันของ Chrome (บันทึกเป็นหน้าของ url ถ้ารันด้วย --record)"""
+        html = self.driver.page_source
+        record(url, html, browser=True)
+        try:
+            count_bytes(sites.detect(url), self.driver.execute_script(TRANSFER_SIZE_JS) or 0)
+        except Exception:
+            pass
+        return html
+    
+    def cached_rows(self, key, payload, build):
         """
-        กรองวันที่ก่อนวันปัจจุบันออก (ใช้ได้กับทุกเว็บไซต์)
-        
-        รองรับรูปแบบเดือน:
-        - "มกราคม 2569" (พ.ศ.)
-        - "2026-01" (ค.ศ.)
+        ใช้ row จาก cache ถ้าข้อมูลดิบ (payload) ไม่เปลี่ยน
+        ไม่เช่นนั้นเรียก build() เพื่อ parse แล้วเก็บลง cache -> (rows, hit)
         """
-        filtered = []
+        if self.cache is None:
+            return build(), False
         
-        for row in results:
-            try:
-                month_str = row.get('เดือน', '')
-                day = int(row.get('วันที่', 0))
-                
-                # แปลงเดือนเป็น year, month
-                year, month = self._parse_month_string(month_str)
-                
-                if year and month and day:
-                    # สร้าง date object
-                    from datetime import date
-                    row_date = date(year, month, day)
-                    
-                    # เก็บเฉพาะวันที่ >= วันปัจจุบัน
-                    if row_date >= self.today:
-                        filtered.append(row)
-            except Exception as e:
-                # ถ้า parse ไม่ได้ ให้เก็บไว้ก่อน
-                filtered.append(row)
+        fp = fingerprint(payload)
+        rows = self.cache.lookup(key, fp)
+        if rows is not None:
+            return rows, True
         
-        return filtered
+        rows = build()
+        self.cache.store(key, fp, rows)
+        return rows, False
     
-    def _parse_month_string(self, month_str):
+    def run_unit(self, key, label, scrape):
         """
-        แปลง string เดือนเป็น (year, month)
+        ดึง unit key = (url, บ้าน, เดือน) ด้วย scrape() -> list ของ BookingRecord
         
-        รองรับ:
-        - "มกราคม 2569" -> (2026, 1)
-        - "2026-01" -> (2026, 1)
+        - unit ที่เสร็จแล้วใน checkpoint (--resume) ใช้ row ที่บันทึกไว้ ไม่ดึงใหม่
+        - เสร็จแล้วบันทึกลง checkpoint ทันที
+        - ถ้า error: ลองใหม่ตาม HostHealth (host ที่ล่มอยู่ข้ามทันที)
+          ไม่สำเร็จ = คืน row ที่ได้ก่อน error แต่ไม่บันทึก (รอบ resume จะดึงใหม่)
         """
-        try:
-            # รูปแบบ "มกราคม 2569"
-            for thai_month, month_num in self.THAI_MONTH_MAP.items():
-                if thai_month in month_str:
-                    # หาปี พ.ศ.
-                    year_match = re.search(r'(25\d{2}|26\d{2}|27\d{2})', month_str)
-                    if year_match:
-                        thai_year = int(year_match.group(1))
-                        # แปลง พ.ศ. เป็น ค.ศ.
-                        year = thai_year - 543
-                        return (year, month_num)
-            
-            # รูปแบบ "2026-01"
-            match = re.match(r'(\d{4})-(\d{2})', month_str)
-            if match:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                return (year, month)
-                
-        except:
-            pass
+        if self.checkpoint is not None:
+            rows = self.checkpoint.lookup(key)
+            if rows is not None:
+                return rows
+        
+        rows = []
         
-        return (None, None)
+        def attempt():
+            del rows[:]
+            rows.extend(scrape())
+        
+        try:
+            if self.health is None:
+                attempt()
+            else:
+                self.health.call(host_of(key[0]), attempt, label, source=key[1] or key[0])
+        except Exception as e:
+            skipped = isinstance(e, HostDown)
+            print(f"  {'⏭️ ข้าม' if skipped else '⛔ Error'} ({label}): {e}")
+            self.unit_failed(key, SKIPPED if skipped else FAILED, e)
+            return rows
+        
+        if self.checkpoint is not None:
+            self.checkpoint.complete(key, rows)
+        return rows
+    
+    def unit_failed(self, key, reason, error):
+        """unit ไม่ได้ข้อมูลรอบนี้: ไม่บันทึกลง checkpoint และจดไว้ใน HostHealth"""
+        if self.checkpoint is not None:
+            self.checkpoint.fail()
+        if self.health is not None:
+            url = key[0]
+            site = sites.detect(url)
+            code = self.adapter(site).house_code(url) if site != sites.UNKNOWN else None
+            self.health.unit_failed(key, reason, error, code=code)
     
     def detect_site_type(self, url):
-        """ตรวจจับประเภทเว็บไซต์จาก URL"""
-        domain = urlparse(url).netloc.lower()
-        
-        if 'devillegroups.com' in domain:
-            return 'deville'
-        elif 'poolvillacity.co.th' in domain:
-            return 'poolvillacity'
-        elif 'pattayapartypoolvilla.com' in domain:
-            return 'pattayaparty'
-        else:
-            return 'unknown'
+        """ตรวจจับประเภทเว็บไซต์จาก URL (ตาม domain ที่ประกาศใน sites.SITES)"""
+        return sites.detect(url)
     
-    def scrape(self, url):
-        """เลือก scraper ตามประเภทเว็บไซต์"""
+    def _announce(self, url):
+        """พิมพ์หัวข้อของ URL -> ประเภทเว็บ (None ถ้าไม่รู้จัก)"""
         site_type = self.detect_site_type(url)
         
         print(f"\n{'='*60}")
@@ -151,715 +253,397 @@ class CalendarScraper:
         print(f"📌 ประเภท: {site_type}")
         print(f"{'='*60}")
         
-        if site_type == 'deville':
-            return self.scrape_deville(url)
-        elif site_type == 'poolvillacity':
-            return self.scrape_poolvillacity(url)
-        elif site_type == 'pattayaparty':
-            return self.scrape_pattayaparty(url)
-        else:
+        if site_type == sites.UNKNOWN:
             print(f"❌ ไม่รู้จักประเภทเว็บไซต์: {url}")
-            return []
-
-
-    # ========================================================
-    # รูปแบบที่ 1: Deville Groups (หลายบ้านในหน้าเดียว + iframe)
-    # ========================================================
-    def scrape_deville(self, url):
-        """Scrape ปฏิทินจาก devillegroups.com"""
-        print("🔄 กำลังโหลดหน้าหลัก Deville Groups...")
-        
-        BASE_IFRAME_URL = "https://www.devillegroups.com/allcalendar/cld.php"
-        
-        self.driver.get(url)
-        time.sleep(8)
-        
-        results = []
-        html = self.driver.page_source
-        
-        # หา pattern: <h6>(DV-xxxx)<br>ชื่อบ้าน</h6>...<iframe src="cld.php?hId=xxxx"
-        pattern = r'<h6>\(DV-(\d+)\)<br>([^<]+)</h6>.*?src="cld\.php\?hId=(\d+)"'
-        matches = re.findall(pattern, html, re.DOTALL)
-        
-        houses = []
-        seen_ids = set()
-        
-        for dv_id, name, h_id in matches:
-            if h_id in seen_ids:
-                continue
-            seen_ids.add(h_id)
-            
-            house_name = name.strip()
-            houses.append({
-                'id': h_id,
-                'name': house_name,
-                'dv_code': f'DV-{dv_id}'
-            })
-            print(f"  🏠 พบบ้าน: {house_name} (DV-{dv_id}, hId={h_id})")
-        
-        print(f"\n📊 พบบ้านทั้งหมด: {len(houses)} หลัง")
-        
-        if not houses:
-            print("❌ ไม่พบข้อมูลบ้าน")
-            return results
-        
-        # จำกัดจำนวนบ้าน
-        if MAX_HOUSES > 0:
-            houses = houses[:MAX_HOUSES]
-            print(f"🔧 จำกัดดึงแค่ {MAX_HOUSES} หลังแรก")
-        
-        # วนดึงข้อมูลแต่ละบ้าน
-        start_date = datetime.now()
-        total_houses = len(houses)
-        
-        for house_idx, house in enumerate(houses, 1):
-            h_id = house['id']
-            house_name = house['name']
-            dv_code = house['dv_code']
-            
-            print(f"\n{'='*50}")
-            print(f"🏠 [{house_idx}/{total_houses}] กำลังดึง: {house_name} ({dv_code})")
-            print(f"{'='*50}")
-            
-            for i in range(MONTH_TO_SCRAPE):
-                try:
-                    target_date = start_date + relativedelta(months=i)
-                    ym = target_date.strftime("%Y-%m")
-                    calendar_url = f"{BASE_IFRAME_URL}?ym={ym}&hId={h_id}"
-                    
-                    self.driver.get(calendar_url)
-                    time.sleep(3)  # เพิ่ม delay ให้ปฏิทินโหลดครบ
-                    
-                    wait = WebDriverWait(self.driver, 10)
-                    
-                    # อ่านชื่อเดือน
-                    try:
-                        month_el = wait.until(
-                            EC.presence_of_element_located(
-                                (By.XPATH, "//th[contains(text(),'256') or contains(text(),'257')]")
-                            )
-                        )
-                        month_text = month_el.text.strip()
-                        for line in month_text.split("\n"):
-                            if "256" in line or "257" in line:
-                                month_text = line.strip()
-                                break
-                    except:
-                        month_text = ym
-                    
-                    # ดึงวันที่ติดจอง (สีแดง = booking, สีเขียว = waiting)
-                    # แก้ไข: กรองเฉพาะวันที่ของเดือนปัจจุบัน (ไม่ใช่เดือนก่อน/หลัง)
-                    booked_cells = self.driver.find_elements(
-                        By.XPATH,
-                        "//td[(contains(@class,'booking') or contains(@class,'waiting')) and not(contains(@class,'prev')) and not(contains(@class,'next')) and not(contains(@class,'other'))]"
-                    )
-                    
-                    # Debug: บันทึก HTML ถ้าเปิด DEBUG_MODE (สำหรับ Madagascar 4)
-                    if DEBUG_MODE and "2265" in h_id:
-                        debug_file = f"debug_madagascar4_{ym}.html"
-                        with open(debug_file, "w", encoding="utf-8") as f:
-                            f.write(self.driver.page_source)
-                        print(f"  💾 Debug Madagascar 4: บันทึก {debug_file}")
-                    
-                    booked_count = 0
-                    booked_days = []
-                    for cell in booked_cells:
-                        try:
-                            # ตรวจสอบว่า td มี class ที่บ่งบอกว่าเป็นวันของเดือนอื่นหรือไม่
-                            cell_class = cell.get_attribute("class") or ""
-                            
-                            # ข้ามวันที่ของเดือนอื่น
-                            if any(x in cell_class for x in ['prev', 'next', 'other', 'disabled']):
-                                continue
-                            
-                            # ลองหาตัวเลขจาก div ภายใน td ก่อน
-                            try:
-                                day_element = cell.find_element(By.TAG_NAME, "div")
-                                day = day_element.text.strip()
-                            except:
-                                # ถ้าไม่มี div ให้ใช้ text จาก td โดยตรง
-                                day = cell.text.strip()
-                            
-                            # กรองเฉพาะตัวเลข (ไม่รวม header)
-                            if day.isdigit():
-                                day_int = int(day)
-                                # ข้าม header row หรือค่าที่ไม่ใช่วันที่
-                                if 1 <= day_int <= 31 and day_int not in booked_days:
-                                    booked_days.append(day_int)
-                                    results.append({
-                                        "ชื่อบ้าน": house_name,
-                                        "รหัส": dv_code,
-                                        "เดือน": month_text,
-                                        "วันที่": day_int,
-                                        "สถานะ": "ติดจอง"
-                                    })
-                                    booked_count += 1
-                        except Exception as e:
-                            continue
-                    
-                    if booked_days:
-                        days_str = ', '.join(map(str, sorted(booked_days)))
-                        print(f"  📅 {month_text}: {booked_count} วัน → [{days_str}]")
-                    else:
-                        print(f"  📅 {month_text}: ว่าง ✓")
-                        
-                except Exception as e:
-                    print(f"  ⛔ Error ({ym}): {e}")
-        
-        return results
-
-
-    # ========================================================
-    # รูปแบบที่ 2: Pool Villa City (ปฏิทิน FullCalendar + navigation)
-    # ========================================================
-    def scrape_poolvillacity(self, url):
-        """
-        Scrape ปฏิทินจาก poolvillacity.co.th
-        
-        ✅ รองรับ:
-        - ใช้ FullCalendar library
-        - ปฏิทินแสดงทีละหลายเดือน (ต้องกด Next เพื่อดูเดือนถัดไป)
-        - วันที่ติดจอง: มี fc-bg-event + background-color: rgb(248, 229, 231) + สีแดง
-        - วันที่เทศกาล: สีเหลือง
-        - วันที่อยู่ใน data-date attribute
+            return None
+        return site_type
+    
+    def scrape(self, url):
+        """เลือก adapter ตามประเภทเว็บไซต์ -> generator ของ BookingRecord (ทีละเดือน)"""
+        site_type = self._announce(url)
+        if site_type is None:
+            return
+        with span("scrape", site=site_type):
+            yield from self.adapter(site_type).run(url)
+    
+    def discover_units(self, url):
         """
-        print("🔄 กำลังโหลดหน้า Pool Villa City...")
-        
-        results = []
-        
-        # ดึงรหัสบ้านจาก URL (เช่น CITY-743)
-        match = re.search(r'(CITY-\d+)', url)
-        if match:
-            house_code = match.group(1)
-        else:
-            house_code = "Unknown"
-        
-        self.driver.get(url)
-        time.sleep(8)  # รอ JavaScript โหลด
-        
-        try:
-            wait = WebDriverWait(self.driver, 15)
-            
-            # ดึงชื่อบ้าน
-            try:
-                title_el = wait.until(
-                    EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                )
-                house_name = title_el.text.strip()
-                if not house_name:
-                    house_name = house_code
-            except:
-                house_name = house_code
-            
-            print(f"  🏠 บ้าน: {house_name} ({house_code})")
-            
-            # รอให้ FullCalendar โหลด
-            try:
-                wait.until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "fc-daygrid-day"))
-                )
-            except:
-                print("  ⚠️ ไม่พบ FullCalendar - รอเพิ่ม...")
-                time.sleep(5)
-            
-            booked_dates = set()  # ใช้ set เพื่อไม่ซ้ำ
-            
-            month_map = {
-                '01': 'มกราคม', '02': 'กุมภาพันธ์', '03': 'มีนาคม',
-                '04': 'เมษายน', '05': 'พฤษภาคม', '06': 'มิถุนายน',
-                '07': 'กรกฎาคม', '08': 'สิงหาคม', '09': 'กันยายน',
-                '10': 'ตุลาคม', '11': 'พฤศจิกายน', '12': 'ธันวาคม'
-            }
-            
-            current_year = datetime.now().year
-            current_month = datetime.now().month
-            
-            # วนกดปุ่ม Next เพื่อดึงข้อมูลหลายรอบ
-            # FullCalendar อาจแสดงหลายเดือนในหน้าเดียว เราจะกด Next หลายครั้ง
-            for round_num in range(MONTH_TO_SCRAPE):
-                # หา td ที่มี data-date และมี fc-bg-event ด้านใน (วันที่ติดจอง)
-                booked_cells = self.driver.find_elements(
-                    By.XPATH,
-                    "//td[contains(@class,'fc-daygrid-day')]//div[contains(@class,'fc-bg-event') and contains(@style,'rgb(248, 229, 231)')]"
-                )
-                
-                # ถ้าไม่พบ ลองหาจาก parent td
-                if not booked_cells:
-                    all_day_cells = self.driver.find_elements(
-                        By.XPATH,
-                        "//td[contains(@class,'fc-daygrid-day') and .//div[contains(@class,'fc-bg-event')]]"
-                    )
-                    booked_cells = all_day_cells
-                
-                for cell in booked_cells:
-                    try:
-                        data_date = cell.get_attribute("data-date")
-                        if not data_date:
-                            parent_td = cell.find_element(By.XPATH, "./ancestor::td[@data-date]")
-                            data_date = parent_td.get_attribute("data-date")
-                        
-                        if data_date:
-                            booked_dates.add(data_date)
-                    except:
-                        pass
-                
-                # กดปุ่ม Next เพื่อไปเดือนถัดไป (ยกเว้นรอบสุดท้าย)
-                if round_num < MONTH_TO_SCRAPE - 1:
-                    try:
-                        next_btn = self.driver.find_element(
-                            By.XPATH,
-                            "//button[contains(@class,'fc-next-button') or contains(@aria-label,'next') or contains(@title,'Next')]"
-                        )
-                        next_btn.click()
-                        time.sleep(2)
-                    except:
-                        # ถ้าไม่พบปุ่มก็หยุด
-                        break
-            
-            # จัดกลุ่มตามเดือน
-            by_month = {}
-            for date_str in sorted(booked_dates):
-                parts = date_str.split('-')
-                if len(parts) == 3:
-                    year, month, day = parts
-                    year_int = int(year)
-                    month_int = int(month)
-                    
-                    # ข้ามเดือนที่ผ่านมาแล้ว
-                    if year_int < current_year or (year_int == current_year and month_int < current_month):
-                        continue
-                    
-                    # จำกัดแค่ MONTH_TO_SCRAPE เดือน
-                    months_diff = (year_int - current_year) * 12 + (month_int - current_month)
-                    if months_diff >= MONTH_TO_SCRAPE:
-                        continue
-                    
-                    # แปลงปี ค.ศ. เป็น พ.ศ.
-                    thai_year = int(year) + 543
-                    month_name = month_map.get(month, month)
-                    month_key = f"{month_name} {thai_year}"
-                    
-                    if month_key not in by_month:
-                        by_month[month_key] = []
-                    by_month[month_key].append(int(day))
-                    
-                    results.append({
-                        "ชื่อบ้าน": house_name,
-                        "รหัส": house_code,
-                        "เดือน": month_key,
-                        "วันที่": int(day),
-                        "สถานะ": "ติดจอง"
-                    })
-            
-            # แสดงผล
-            if by_month:
-                for month_key, days in sorted(by_month.items()):
-                    days_str = ', '.join(map(str, sorted(days)))
-                    print(f"  📅 {month_key}: {len(days)} วัน → [{days_str}]")
-            else:
-                print("  📅 ไม่พบวันติดจอง (ว่างทั้งหมด หรืออาจต้องปรับ selector)")
-                
-        except Exception as e:
-            print(f"  ⛔ Error: {e}")
-            import traceback
-            traceback.print_exc()
+        แตกงานของ URL เป็นหน่วยย่อย (unit) สำหรับ worker pool
         
-        return results
-
-
-    # ========================================================
-    # รูปแบบที่ 3: Pattaya Party Pool Villa (ปฏิทินเดือนเดียว + navigation)
-    # ========================================================
-    def scrape_pattayaparty(self, url):
-        """
-        Scrape ปฏิทินจาก pattayapartypoolvilla.com
+        - deville: 1 unit ต่อ (บ้าน, เดือน) — แต่ละเดือนเป็นหน้า cld.php แยกกัน
+        - เว็บอื่น: 1 unit ต่อ URL (ต้องกด Next ต่อเนื่องในหน้าเดียว)
         
-        ✅ รองรับ:
-        - ปฏิทินแสดงทีละเดือน
-        - มีปุ่ม Prev/Next สำหรับเปลี่ยนเดือน
-        - สถานะ: แดง = ติดจอง, เขียว/น้ำเงิน = มีจองแต่ยังไม่โอน, เหลือง = วันหยุด
-        - ⚠️ ต้องกรองวันของเดือนอื่นที่แสดงในปฏิทินออก
+        unit = {'url', 'site', 'house', 'ym'} (house/ym เป็น None ถ้าเป็นงานทั้ง URL)
         """
-        print("🔄 กำลังโหลดหน้า Pattaya Party Pool Villa...")
-        
-        results = []
-        
-        # ดึงรหัสบ้านจาก URL
-        match = re.search(r'/v/(\d+)', url)
-        if match:
-            villa_id = match.group(1)
-            dv_code = f"DV-{villa_id}"
-        else:
-            villa_id = "Unknown"
-            dv_code = "Unknown"
-        
-        self.driver.get(url)
-        time.sleep(5)  # รอ JavaScript โหลด
-        
-        try:
-            wait = WebDriverWait(self.driver, 15)
-            
-            # ดึงชื่อบ้านจาก header หรือ title
-            try:
-                # หารหัสที่พัก
-                code_el = self.driver.find_element(By.XPATH, "//*[contains(text(),'รหัสที่พัก')]")
-                house_info = code_el.text
-                # หาชื่อจาก title
-                title = self.driver.title
-                house_name = title.split('|')[0].strip() if '|' in title else title
-            except:
-                house_name = f"Villa {villa_id}"
-            
-            print(f"  🏠 บ้าน: {house_name} ({dv_code})")
-            
-            # กดปุ่ม "📅 วันนี้" เพื่อกลับไปเดือนปัจจุบันก่อน
-            try:
-                today_btn = wait.until(
-                    EC.element_to_be_clickable(
-                        (By.XPATH, "//button[contains(text(),'วันนี้') or contains(@title,'กลับไปเดือนปัจจุบัน')]")
-                    )
-                )
-                today_btn.click()
-                time.sleep(2)
-            except:
-                pass  # ถ้าไม่มีปุ่มก็ข้ามไป
-            
-            # ดึงปฏิทินหลายเดือน
-            start_date = datetime.now()
-            
-            for i in range(MONTH_TO_SCRAPE):
-                try:
-                    if i > 0:
-                        # กดปุ่ม Next เพื่อไปเดือนถัดไป
-                        try:
-                            next_btn = wait.until(
-                                EC.element_to_be_clickable(
-                                    (By.XPATH, "//button[contains(text(),'Next') or contains(text(),'►') or contains(text(),'>')]")
-                                )
-                            )
-                            next_btn.click()
-                            time.sleep(2)  # รอปฏิทินโหลดใหม่
-                        except Exception as e:
-                            print(f"  ⚠️ ไม่สามารถกดปุ่ม Next: {e}")
-                            break
-                    
-                    # คำนวณเดือน/ปีที่คาดหวัง
-                    target_date = start_date + relativedelta(months=i)
-                    expected_month = target_date.month
-                    expected_year = target_date.year
-                    
-                    # อ่านชื่อเดือนจาก header ปฏิทิน
-                    month_text = ""
-                    try:
-                        month_el = self.driver.find_element(
-                            By.XPATH,
-                            "//*[contains(text(),'มกราคม') or contains(text(),'กุมภาพันธ์') or contains(text(),'มีนาคม') or contains(text(),'เมษายน') or contains(text(),'พฤษภาคม') or contains(text(),'มิถุนายน') or contains(text(),'กรกฎาคม') or contains(text(),'สิงหาคม') or contains(text(),'กันยายน') or contains(text(),'ตุลาคม') or contains(text(),'พฤศจิกายน') or contains(text(),'ธันวาคม')]"
-                        )
-                        month_text = month_el.text.strip()
-                        # ดึงเฉพาะส่วนที่มีเดือนและปี
-                        for line in month_text.split('\n'):
-                            if any(m in line for m in ['มกราคม', 'กุมภาพันธ์', 'มีนาคม', 'เมษายน', 'พฤษภาคม', 'มิถุนายน', 'กรกฎาคม', 'สิงหาคม', 'กันยายน', 'ตุลาคม', 'พฤศจิกายน', 'ธันวาคม']):
-                                if '256' in line or '257' in line:
-                                    month_text = line.strip()
-                                    break
-                    except:
-                        month_text = target_date.strftime("%Y-%m")
-                    
-                    # หาจำนวนวันในเดือนปัจจุบัน
-                    import calendar
-                    days_in_month = calendar.monthrange(expected_year, expected_month)[1]
-                    
-                    # ดึงวันที่ติดจอง - หา div ที่มีสีแดงและเป็นวันของเดือนปัจจุบัน
-                    booked_days = []
-                    
-                    # เว็บนี้ใช้ div แทน table!
-                    # วันที่ติดจอง = มี class bg-red-500 และ text-white
-                    # วันของเดือนอื่น = มี class text-gray-400
-                    
-                    # หา div ที่เป็นวันในปฏิทิน (มี class grid และ grid-cols-7)
-                    # มี 2 อัน: อันแรก = header (อา.จ.อ.พ.พฤ.ศ.ส.), อันที่สอง = ตัวเลขวัน
-                    try:
-                        calendar_grids = self.driver.find_elements(
-                            By.CSS_SELECTOR,
-                            "div.grid.grid-cols-7"
-                        )
-                        # ใช้ grid ที่สอง (index 1) ถ้ามี
-                        calendar_grid = calendar_grids[1] if len(calendar_grids) > 1 else calendar_grids[0]
-                        
-                        # หา cell ทั้งหมดที่เป็นวัน
-                        day_cells = calendar_grid.find_elements(
-                            By.CSS_SELECTOR,
-                            "div.aspect-square"
-                        )
-                    except:
-                        # fallback - หา div ที่มี bg-red-500
-                        day_cells = self.driver.find_elements(
-                            By.CSS_SELECTOR,
-                            "div.aspect-square"
-                        )
-                    
-                    booked_days = []  # สีแดง = ติดจอง
-                    pending_days = []  # สีเขียว = รอโอน
-                    
-                    for cell in day_cells:
-                        try:
-                            class_attr = cell.get_attribute("class") or ""
-                            cell_text = cell.text.strip()
-                            
-                            # ข้ามถ้าเป็นวันของเดือนอื่น (มี text-gray-400)
-                            if "text-gray-400" in class_attr or "text-gray" in class_attr:
-                                continue
-                            
-                            # ตรวจสอบสถานะ
-                            is_booked = "bg-red" in class_attr  # สีแดง = ติดจอง
-                            is_pending = "bg-green" in class_attr  # สีเขียว = รอโอน
-                            
-                            if cell_text:
-                                numbers = re.findall(r'\d+', cell_text)
-                                if numbers:
-                                    day = int(numbers[0])
-                                    if 1 <= day <= days_in_month:
-                                        if is_booked:
-                                            booked_days.append(day)
-                                        elif is_pending:
-                                            pending_days.append(day)
-                        except:
-                            pass
-                    
-                    # ลบรายการซ้ำ
-                    booked_days = sorted(set(booked_days))
-                    pending_days = sorted(set(pending_days))
-                    
-                    # เพิ่มลง results - สีแดง (ติดจอง)
-                    for day in booked_days:
-                        results.append({
-                            "ชื่อบ้าน": house_name,
-                            "รหัส": dv_code,
-                            "เดือน": month_text,
-                            "วันที่": day,
-                            "สถานะ": "ติดจอง"
-                        })
-                    
-                    # เพิ่มลง results - สีเขียว (รอโอน)
-                    for day in pending_days:
-                        results.append({
-                            "ชื่อบ้าน": house_name,
-                            "รหัส": dv_code,
-                            "เดือน": month_text,
-                            "วันที่": day,
-                            "สถานะ": "รอโอน"
-                        })
-                    
-                    total_days = len(booked_days) + len(pending_days)
-                    if total_days > 0:
-                        booked_str = ', '.join(map(str, booked_days)) if booked_days else '-'
-                        pending_str = ', '.join(map(str, pending_days)) if pending_days else '-'
-                        print(f"  📅 {month_text}: ติดจอง [{booked_str}], รอโอน [{pending_str}]")
-                    else:
-                        print(f"  📅 {month_text}: ว่าง ✓")
-                        
-                except Exception as e:
-                    print(f"  ⛔ Error เดือนที่ {i+1}: {e}")
-            
-            # ถ้าไม่พบข้อมูล แสดง debug info
-            if not results:
-                print("\n  ⚠️ ไม่พบข้อมูลการจอง - กำลัง debug...")
-                self._debug_calendar_structure()
-                
-        except Exception as e:
-            print(f"  ⛔ Error: {e}")
-        
-        return results
+        site_type = self._announce(url)
+        if site_type is None:
+            return []
+        return self.adapter(site_type).discover_units(url)
     
+    def scrape_unit(self, unit):
+        """Scrape unit เดียว (จาก discover_units) -> iterable ของ BookingRecord"""
+        return self.adapter(unit['site']).scrape_unit(unit)
     
-    def _debug_calendar_structure(self):
-        """แสดง debug info สำหรับวิเคราะห์โครงสร้างปฏิทิน"""
-        print("\n  📋 Debug: กำลังวิเคราะห์โครงสร้าง HTML...")
-        
-        # หา elements ที่อาจเป็นปฏิทิน
-        tables = self.driver.find_elements(By.TAG_NAME, "table")
-        print(f"  - พบ table: {len(tables)} อัน")
-        
-        # หา td ทั้งหมด
-        tds = self.driver.find_elements(By.TAG_NAME, "td")
-        print(f"  - พบ td: {len(tds)} อัน")
-        
-        # หา class ที่มี bg-
-        bg_elements = self.driver.find_elements(By.XPATH, "//*[contains(@class,'bg-')]")
-        classes = set()
-        for el in bg_elements[:50]:  # จำกัด 50 อัน
-            class_attr = el.get_attribute("class")
-            if class_attr:
-                for c in class_attr.split():
-                    if 'bg-' in c:
-                        classes.add(c)
-        
-        if classes:
-            print(f"  - พบ background classes: {list(classes)[:10]}")
-        
-        # Save HTML สำหรับ debug
-        try:
-            with open("debug_calendar.html", "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-            print("  💾 บันทึก HTML ไว้ที่ debug_calendar.html")
-        except:
-            pass
+    def months_to_scrape(self):
+        """รายการเดือน (YYYY-MM) ที่ต้องดึง เริ่มจากเดือนปัจจุบัน"""
+        start_date = datetime.now()
+        return [
+            (start_date + relativedelta(months=i)).strftime("%Y-%m")
+            for i in range(self.month_count)
+        ]
 
 
-def main():
-    print("=" * 60)
-    print("🏠 Pool Villa Calendar Scraper")
-    print("📅 รองรับ 3 เว็บไซต์:")
-    print("   1. devillegroups.com")
-    print("   2. poolvillacity.co.th")
-    print("   3. pattayapartypoolvilla.com")
-    print("=" * 60)
+def make_driver(profile=BROWSER_PROFILE):
+    """สร้าง headless Chrome ตามโปรไฟล์ (import Selenium เฉพาะตอนต้องเปิด Chrome จริง)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
     
-    # ตั้งค่า Chrome
     options = webdriver.ChromeOptions()
     options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1920,1080")
+    configure_options(options, profile)
     
     driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+        service=Service(resolve_chromedriver(CHROMEDRIVER_CACHE_FILE)),
         options=options
     )
-    
-    scraper = CalendarScraper(driver)
-    all_results = []
-
-    # โหลด URL จากไฟล์ webpath หากมี มิฉะนั้นใช้ URLS (fallback)
-    urls_from_file = load_urls_from_webpath()
-    urls_to_scrape = urls_from_file if urls_from_file else URLS
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)  # เว็บที่ค้างให้ error (แล้วลองใหม่ / ข้าม) แทนการรอ 5 นาที
+    return apply_profile(driver, profile)
 
-    print("\nURLs ที่จะดึง:")
-    for i, u in enumerate(urls_to_scrape, 1):
-        print(f"  {i}. {u}")
 
-    # วน scrape แต่ละ URL
-    for url in urls_to_scrape:
+def scrape_all(scraper, urls):
+    """scrape ทีละ URL -> generator ของ BookingRecord (URL ที่ error ข้ามไป แต่ row ที่ได้แล้วยังอยู่)"""
+    for url in urls:
         try:
-            results = scraper.scrape(url)
-            all_results.extend(results)
+            yield from scraper.scrape(url)
         except Exception as e:
             print(f"❌ Error scraping {url}: {e}")
 
+
+def _print_dropped(chain, dedupe):
+    if chain.dropped > 0:
+        print(f"\n🗑️ กรองวันที่ผ่านมาแล้วออก: {chain.dropped} รายการ")
+    if dedupe.dropped > 0:
+        print(f"🗑️ ตัดรายการซ้ำ: {dedupe.dropped} รายการ")
+
+
+def publish_shard(records, today, shard):
+    """
+    เขียน row ของ shard เดียวลง booking_result.shard-i-of-N.csv / .ndjson -> Stats
+
+    ไม่เทียบ snapshot / ไม่ทำตาราง .avm / Excel (ทำตอน shards.py merge จากผลครบทุก shard)
+    """
+    csv_file, ndjson_file = shard.path(RESULT_CSV_FILE), shard.path(RESULT_NDJSON_FILE)
+    stats = Stats(Fanout(CsvWriter(csv_file), NdjsonWriter(ndjson_file)))
+    dedupe = Dedupe(stats)
+    chain = PastDateFilter(today, dedupe)
+    ok = False
+    try:
+        for rec in records:
+            chain.send(rec)
+        ok = True
+    finally:
+        with span("flush"):
+            chain.close(ok)
+
+    if stats.houses:
+        print(f"\n🏠 ดึงข้อมูลได้ทั้งหมด {len(stats.houses)} หลัง")
+    _print_dropped(chain, dedupe)
+    print(f"\n{'='*60}")
+    print(f"✅ shard {shard} เสร็จสิ้น: {stats.count} รายการ → {csv_file}, {ndjson_file}")
+    print("💡 รวมทุก shard ด้วย: python shards.py merge")
+    print(f"{'='*60}")
+    return stats
+
+
+def publish(records, today, track_changes=True, failed=None):
+    """
+    ส่ง record ต่อเป็นสายทันทีที่ได้มา แล้วสรุปผล -> Stats
+
+    กรองวันที่ผ่านมาแล้ว -> ตัดซ้ำ -> นับ -> CSV / NDJSON / JSON / ตาราง bit-packed / change log
+    จากนั้นบันทึก change log, ส่งให้ availability service และ export Excel
+    ใช้ทั้งรอบ scrape ปกติ และ shards.py merge — เขียน booking_result.json ทุกครั้ง
+    (snapshot ที่รอบถัดไปใช้เทียบ ต้องเป็นผลของรอบนี้ ไม่เช่นนั้น event เดิมจะถูกบันทึกซ้ำทุกรอบ)
+    failed = unit ที่ไม่ได้ข้อมูลรอบนี้ (HostHealth.failed) — ใช้ row ของบ้าน/เดือนนั้นจาก snapshot รอบก่อนแทน
+    (ยังอยู่ใน baseline ของรอบถัดไป จึงไม่เป็น released รอบนี้ และไม่เป็น booked ซ้ำเมื่อดึงได้อีกครั้ง)
+    """
+    # snapshot รอบก่อน (โหลดก่อนเปิด CSV / JSON ใหม่ทับ) สำหรับบันทึกการเปลี่ยนแปลง
+    # และเป็นที่มาของ row ของ unit ที่ไม่ได้ข้อมูลรอบนี้
+    tracker = None
+    held = failed_filter(failed) if failed else None
+    carried = []
+    if track_changes or held is not None:
+        with span("change_log.load"):
+            previous = load_snapshot(SNAPSHOT_FILE, RESULT_CSV_FILE)
+            # วันที่ผ่านไปแล้วไม่นับเป็น released
+            old = [rec for rec in records_from_rows(previous or []) if rec.day >= today]
+        if held is not None:
+            carried = [rec for rec in old if held(rec.to_row())]
+        if track_changes and previous is None:
+            print(f"\n📝 ไม่พบ snapshot รอบก่อน ({SNAPSHOT_FILE}) - ข้ามการบันทึกการเปลี่ยนแปลง")
+        elif track_changes:
+            tracker = ChangeTracker(to_rows(old))
+        previous = old = None
+
+    start = today
+    end = start.replace(day=1) + relativedelta(months=MONTH_TO_SCRAPE)
+    matrix = MatrixSink(MatrixBuilder(start, (end - start).days), MATRIX_FILE)
+    outputs = [CsvWriter(RESULT_CSV_FILE), NdjsonWriter(RESULT_NDJSON_FILE), JsonWriter(SNAPSHOT_FILE), matrix]
+    changes = ChangeSink(tracker) if tracker is not None else None
+    if changes is not None:
+        outputs.append(changes)
+    stats = Stats(Fanout(*outputs))
+    dedupe = Dedupe(stats)
+    chain = PastDateFilter(today, dedupe)
+    seen = set()   # (รหัส, วันที่) ที่ดึงได้รอบนี้ของ unit ที่ล้มเหลว (ไม่ใช้ row รอบก่อนทับ)
+    ok = False
+    try:
+        for rec in records:
+            if carried and held(rec.to_row()):
+                seen.add((rec.code, rec.day))
+            chain.send(rec)
+        carried = [rec for rec in carried if (rec.code, rec.day) not in seen]
+        for rec in carried:
+            chain.send(rec)
+        ok = True
+    finally:
+        with span("flush"):
+            chain.close(ok)
+    if carried:
+        print(f"\n📦 ใช้ข้อมูลรอบก่อน {len(carried)} วัน ของ {len(failed)} unit ที่ดึงไม่สำเร็จ")
+
     # สรุปจำนวนบ้านที่ดึงได้ทั้งหมด (นับแบบไม่ซ้ำ)
-    unique_houses = set()
-    for row in all_results:
-        name = str(row.get("ชื่อบ้าน", "")).strip()
-        code = str(row.get("รหัส", "")).strip()
-        key = f"{code}|{name}" if code or name else ""
-        if key:
-            unique_houses.add(key)
-    if unique_houses:
-        print(f"\n🏠 ดึงข้อมูลได้ทั้งหมด {len(unique_houses)} หลัง")
-
-    driver.quit()
-
-    # กรองวันที่ก่อนวันปัจจุบันออก
-    if all_results:
-        original_count = len(all_results)
-        all_results = scraper.filter_past_dates(all_results)
-        filtered_count = original_count - len(all_results)
-        if filtered_count > 0:
-            print(f"\n🗑️ กรองวันที่ผ่านมาแล้วออก: {filtered_count} รายการ")
-
-    # Export ผลลัพธ์
-    if all_results:
-        df = pd.DataFrame(all_results)
-        
-        # บันทึก CSV
-        df.to_csv("booking_result.csv", index=False, encoding="utf-8-sig")
-        
-        # บันทึก Excel พร้อมจัดรูปแบบ
+    if stats.houses:
+        print(f"\n🏠 ดึงข้อมูลได้ทั้งหมด {len(stats.houses)} หลัง")
+    _print_dropped(chain, dedupe)
+
+    # บันทึกการเปลี่ยนแปลงเทียบกับ snapshot รอบก่อน (booked / released / status_changed)
+    # รอบที่ไม่ได้ข้อมูลเลยไม่บันทึก (ไม่ให้ทุกวันกลายเป็น released)
+    if stats.count and changes is not None:
+        events = changes.events
+        if failed:
+            # บ้าน/เดือนที่ดึงไม่สำเร็จไม่ใช่วันที่ว่างลงจริง
+            held = failed_filter(failed)
+            kept = [event for event in events if not (event["event"] == "released" and held(event))]
+            if len(kept) < len(events):
+                print(f"\n⏭️ ไม่นับ released {len(events) - len(kept)} วัน ของ {len(failed)} unit ที่ดึงไม่สำเร็จ → {SKIPPED_FILE}")
+            events = kept
+        append_events(CHANGE_LOG_FILE, events)
+        counts = summarize(events)
+        print(
+            f"\n📝 การเปลี่ยนแปลง: จองใหม่ {counts['booked']}, ว่างลง {counts['released']}, "
+            f"เปลี่ยนสถานะ {counts['status_changed']} → {CHANGE_LOG_FILE}"
+        )
+
+    # ตารางว่าง/ไม่ว่างแบบ bit-packed (บ้าน × วัน) ตั้งแต่วันนี้ถึงสิ้นเดือนสุดท้ายที่ดึง
+    if matrix.house_count:
+        print(f"\n🧮 บันทึกตาราง {matrix.house_count} หลัง × {(end - start).days} วัน → {MATRIX_FILE} ({os.path.getsize(MATRIX_FILE):,} bytes)")
+
+    # ส่งผลลัพธ์ให้ availability service (ถ้าเปิดใช้) - service สลับ index ใหม่ทันที
+    if stats.count and AVAILABILITY_SERVICE_URL:
         try:
-            # ลองใช้ xlsxwriter ก่อน ถ้าไม่มีค่อยใช้ openpyxl
-            try:
-                import xlsxwriter
-                engine = "xlsxwriter"
-            except ImportError:
-                try:
-                    import openpyxl
-                    engine = "openpyxl"
-                except ImportError:
-                    engine = None
-                    print("⚠️ ไม่พบ openpyxl/xlsxwriter - ข้ามการสร้าง Excel")
-            
-            if engine:
-                xlsx_file = "booking_result.xlsx"
-                with pd.ExcelWriter(xlsx_file, engine=engine) as writer:
-                    sheet_name = "Bookings"
-                    df.to_excel(writer, index=False, sheet_name=sheet_name)
-                    
-                    # จัดรูปแบบ
-                    try:
-                        worksheet = writer.sheets[sheet_name]
-                        
-                        # Freeze หัวตาราง
-                        if engine == "xlsxwriter":
-                            worksheet.freeze_panes(1, 0)
-                        else:  # openpyxl
-                            worksheet.freeze_panes = "A2"
-                        
-                        # ตั้งความกว้างคอลัมน์
-                        col_widths = {
-                            "เว็บไซต์": 22,
-                            "ชื่อบ้าน": 30,
-                            "รหัส": 14,
-                            "เดือน": 18,
-                            "วันที่": 10,
-                            "สถานะ": 12,
-                        }
-                        
-                        for idx, col in enumerate(df.columns):
-                            width = col_widths.get(col, max(10, min(40, len(col) + 2)))
-                            if engine == "xlsxwriter":
-                                worksheet.set_column(idx, idx, width)
-                            else:
-                                from openpyxl.utils import get_column_letter
-                                worksheet.column_dimensions[get_column_letter(idx + 1)].width = width
-                        
-                        # AutoFilter
-                        if engine == "xlsxwriter":
-                            worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
-                        else:
-                            from openpyxl.utils import get_column_letter
-                            last_col = get_column_letter(len(df.columns))
-                            last_row = len(df) + 1
-                            worksheet.auto_filter.ref = f"A1:{last_col}{last_row}"
-                    except Exception as e:
-                        print(f"⚠️ จัดรูปแบบ Excel ไม่สำเร็จ: {e}")
-                
-                print(f"\n{'='*60}")
-                print(f"✅ เสร็จสิ้น!")
-                print(f"📊 รวมข้อมูล: {len(all_results)} รายการ (หลังกรอง)")
-                print(f"💾 บันทึกไฟล์:")
-                print(f"   📄 booking_result.csv")
-                print(f"   📊 booking_result.xlsx")
-                print(f"{'='*60}")
-            else:
-                print(f"\n{'='*60}")
-                print(f"✅ เสร็จสิ้น!")
-                print(f"📊 รวมข้อมูล: {len(all_results)} รายการ (หลังกรอง)")
-                print(f"💾 บันทึกไฟล์: booking_result.csv")
-                print(f"{'='*60}")
+            reply = push_rows(AVAILABILITY_SERVICE_URL, load_rows(RESULT_NDJSON_FILE))
+            print(f"\n🌐 ส่งผลลัพธ์ให้ {AVAILABILITY_SERVICE_URL} ({'อัปเดตแล้ว' if reply.get('changed') else 'ข้อมูลเดิม'})")
+        except Exception as e:
+            print(f"\n⚠️ ส่งผลลัพธ์ให้ {AVAILABILITY_SERVICE_URL} ไม่สำเร็จ: {e}")
+
+    # Export Excel (CSV / NDJSON เขียนไปแล้วระหว่าง scrape) - อ่าน CSV ทีละบรรทัด
+    if stats.count:
+        saved = [f"{RESULT_CSV_FILE}, {RESULT_NDJSON_FILE}, {SNAPSHOT_FILE}"]
+        try:
+            with span("export.excel"):
+                excel_houses = export_excel(
+                    RESULT_CSV_FILE, RESULT_XLSX_FILE, start, (end - start).days, per_site=EXCEL_PER_SITE
+                )
+            if excel_houses is not None:
+                saved.append(f"{RESULT_XLSX_FILE} (Bookings + Calendar {excel_houses} หลัง)")
         except Exception as e:
             print(f"⚠️ สร้าง Excel ไม่สำเร็จ: {e}")
-            print(f"\n{'='*60}")
-            print(f"✅ เสร็จสิ้น!")
-            print(f"📊 รวมข้อมูล: {len(all_results)} รายการ (หลังกรอง)")
-            print(f"💾 บันทึกไฟล์: booking_result.csv")
-            print(f"{'='*60}")
-        
-        print(df.head(20))
+
+        print(f"\n{'='*60}")
+        print("✅ เสร็จสิ้น!")
+        print(f"📊 รวมข้อมูล: {stats.count} รายการ (หลังกรอง)")
+        print("💾 บันทึกไฟล์:")
+        for name in saved:
+            print(f"   📄 {name}")
+        print(f"{'='*60}")
     else:
         print(f"\n{'='*60}")
         print("⚠️ ไม่พบข้อมูลการจอง")
         print("💡 อาจต้องปรับ CSS selector ให้ตรงกับโครงสร้าง HTML ของเว็บ")
         print(f"{'='*60}")
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pool Villa Calendar Scraper")
+    parser.add_argument(
+        "--workers", type=int, default=WORKERS,
+        help=f"จำนวน worker ที่ scrape พร้อมกัน (ค่าเริ่มต้น {WORKERS})",
+    )
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="โหมด asyncio: ดึงทุกเว็บพร้อมกันใน event loop เดียว (จำกัดต่อ host ด้วย --max-per-host)",
+    )
+    parser.add_argument(
+        "--max-per-host", type=int, default=MAX_PER_HOST,
+        help=f"จำนวน request ค้างสูงสุดต่อ host ในโหมด --async (ค่าเริ่มต้น {MAX_PER_HOST})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"ไม่ใช้ cache ({CACHE_FILE}) — parse ทุกหน้าใหม่",
+    )
+    parser.add_argument(
+        "--browser-profile", choices=PROFILES, default=BROWSER_PROFILE,
+        help=f"lean = บล็อกรูป/ฟอนต์/CSS/analytics + eager page load, full = โหลดทุกอย่าง (ค่าเริ่มต้น {BROWSER_PROFILE})",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help=f"ข้าม unit ที่เสร็จแล้วใน {CHECKPOINT_FILE} ของรอบที่ล้มกลางทาง (ใช้ row ที่บันทึกไว้)",
+    )
+    parser.add_argument(
+        "--schedule", action="store_true", default=REFRESH_SCHEDULE,
+        help=f"ดึงเฉพาะ (บ้าน, เดือน) ที่ถึงรอบตาม {REFRESH_STATE_FILE} ที่เหลือใช้ row เดิมจาก cache",
+    )
+    parser.add_argument(
+        "--page-budget", type=int, default=PAGE_BUDGET, metavar="N",
+        help=f"จำนวนหน้าปฏิทินสูงสุดต่อรอบเมื่อใช้ --schedule (0 = ไม่จำกัด, ค่าเริ่มต้น {PAGE_BUDGET})",
+    )
+    parser.add_argument(
+        "--shard", type=Shard.parse, metavar="i/N",
+        help="ดึงเฉพาะบ้านของ shard i จาก N (เขียน booking_result.shard-i-of-N.*) แล้วรวมด้วย python shards.py merge",
+    )
+    parser.add_argument(
+        "--record", metavar="DIR",
+        help="บันทึกทุกหน้าที่ดึงลงโฟลเดอร์ DIR (เล่นซ้ำได้ด้วย replay.py)",
+    )
+    parser.add_argument(
+        "--replay", metavar="URL",
+        help="ดึงทุกหน้าจาก replay server (เช่น http://127.0.0.1:8800) แทนเว็บจริง",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    print("=" * 60)
+    print("🏠 Pool Villa Calendar Scraper")
+    print(f"📅 รองรับ {len(sites.SITES)} เว็บไซต์:")
+    for i, site in enumerate(sites.SITES, 1):
+        print(f"   {i}. {', '.join(site.domains)} ({site.engine})")
+    print("=" * 60)
+    
+    metrics.reset()
+    if args.record:
+        start_recording(args.record)
+        print(f"⏺️ บันทึกทุกหน้าลง {args.record}")
+    if args.replay:
+        use_replay(args.replay)
+        print(f"🔁 ดึงจาก replay server {args.replay}")
+    
+    cache = None if args.no_cache else CalendarCache(
+        CACHE_FILE, max_age_days=CACHE_MAX_AGE_DAYS, max_entries=CACHE_MAX_ENTRIES
+    )
+    shard = args.shard
+    checkpoint = Checkpoint(shard.path(CHECKPOINT_FILE) if shard else CHECKPOINT_FILE, resume=args.resume)
+    scheduler = None
+    if args.schedule:
+        if cache is None:
+            print("⚠️ --schedule ต้องใช้ cache (row เดิมของ unit ที่ยังไม่ถึงรอบ) - ดึงทุก unit แทน")
+        else:
+            scheduler = RefreshScheduler(
+                shard.path(REFRESH_STATE_FILE) if shard else REFRESH_STATE_FILE, cache,
+                intervals=REFRESH_INTERVAL_HOURS, budget=args.page_budget,
+            )
+    health = HostHealth(
+        retries=RETRIES, retry_budget=RETRY_BUDGET,
+        base_delay=BACKOFF_SECONDS[0], max_delay=BACKOFF_SECONDS[1],
+        failure_threshold=CIRCUIT_FAILURES, window=CIRCUIT_WINDOW_SECONDS, cooldown=CIRCUIT_COOLDOWN_SECONDS,
+    )
+    driver_factory = lambda: make_driver(args.browser_profile)
+    make_scraper = lambda: CalendarScraper(
+        driver_factory=driver_factory, cache=cache, checkpoint=checkpoint, shard=shard,
+        scheduler=scheduler, health=health,
+    )
+    scraper = make_scraper()
+
+    # โหลด URL จากไฟล์ webpath หากมี มิฉะนั้นใช้ URLS (fallback)
+    urls_from_file = load_urls_from_webpath()
+    urls_to_scrape = urls_from_file if urls_from_file else URLS
+    if shard:
+        urls_to_scrape = shard.filter_urls(urls_to_scrape)
+        print(f"\n🧩 shard {shard}: หน้ารวมแบ่งตามรหัสบ้าน, URL บ้านเดี่ยวแบ่งตาม URL")
+
+    print("\nURLs ที่จะดึง:")
+    for i, u in enumerate(urls_to_scrape, 1):
+        print(f"  {i}. {u}")
+
+    if args.use_async:
+        # โหมด asyncio: HTTP ทุก host พร้อมกัน + Chrome ใน thread pool (args.workers ตัว)
+        from async_crawler import AsyncCrawler
+        print(f"\n⚙️ โหมด asyncio: สูงสุด {args.max_per_host} request ต่อ host")
+        crawler = AsyncCrawler(
+            make_scraper,
+            scraper.detect_site_type,
+            scraper.months_to_scrape(),
+            max_per_host=args.max_per_host,
+            browser_workers=args.workers,
+            max_houses=MAX_HOUSES,
+            cache=cache,
+            checkpoint=checkpoint,
+            shard=shard,
+            scheduler=scheduler,
+            health=health,
+        )
+        records = crawler.crawl(urls_to_scrape)
+    elif args.workers > 1:
+        # scrape พร้อมกันด้วย worker pool (แต่ละ worker มี Chrome ของตัวเอง)
+        print(f"\n⚙️ ใช้ worker pool: {args.workers} workers")
+        records = run_pool(
+            urls_to_scrape,
+            make_scraper,
+            args.workers,
+        )
+    else:
+        # วน scrape แต่ละ URL
+        records = scrape_all(scraper, urls_to_scrape)
+
+    if shard:
+        stats = publish_shard(records, scraper.today, shard)
+    else:
+        stats = publish(records, scraper.today, failed=health.failed)
+    # ถึงตรงนี้ได้แปลว่าไม่ล้มกลางทาง (ถ้าล้ม ไฟล์ checkpoint ยังอยู่ให้ --resume)
+    checkpoint.close()
+    write_failed(shard.path(SKIPPED_FILE) if shard else SKIPPED_FILE, health.failed)
+    health.print_summary()
+
+    scraper.close()
+    print_wait_summary()
+    recorded = stop_recording()
+    if recorded is not None:
+        print(f"\n⏺️ บันทึกแล้ว {recorded} หน้า → {args.record}")
+    if scheduler is not None:
+        scheduler.save()
+        scheduler.print_stats()
+    if cache is not None:
+        cache.save()
+        cache.print_stats()
+
+    # เวลาแต่ละขั้นตอน (p50/p95) + หน้า/นาที ของรอบนี้ และต่อท้ายประวัติ
+    metrics_file = shard.path(METRICS_FILE) if shard else METRICS_FILE
+    history_file = shard.path(METRICS_HISTORY_FILE) if shard else METRICS_HISTORY_FILE
+    run_metrics = metrics.write_metrics(
+        metrics_file, history_file,
+        extra={
+            'rows': stats.count, 'waits': wait_summary(),
+            'skipped_units': len(health.failed), 'hosts': health.summary(),
+        },
+    )
+    metrics.print_summary(run_metrics)
+    print(f"📈 บันทึก metrics → {metrics_file}, {history_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+"""
+แบ่งงาน scrape เป็น N shard (รันพร้อมกันหลายเครื่อง / หลาย process) แล้วรวมผล
+
+    python scrape_calendar.py --shard 1/4      # ได้ booking_result.shard-1-of-4.csv / .ndjson
+    ...
+    python scrape_calendar.py --shard 4/4
+    python shards.py merge                     # รวม booking_result.shard-*-of-*.ndjson
+
+- บ้านแต่ละหลังอยู่ shard เดียวเสมอ: crc32(key) % N (ไม่ขึ้นกับลำดับ URL หรือ PYTHONHASHSEED)
+  key = รหัสบ้าน สำหรับหน้ารวมหลายบ้าน (Deville) / URL สำหรับเว็บที่ 1 URL = 1 บ้าน
+- หน้ารวมหลายบ้านถูกโหลดในทุก shard (1 หน้า) แล้วแต่ละ shard ดึงเฉพาะบ้านของตัวเอง
+- shard เขียนเฉพาะ row ของตัวเอง — การเทียบ snapshot / change log / ตาราง .avm / Excel
+  ทำตอน merge ครั้งเดียวจากผลครบทุก shard
+- merge ตัดรายการซ้ำและเรียง (รหัส, ชื่อบ้าน, วันที่, สถานะ) ผลจึงเหมือนเดิมทุกครั้งไม่ว่า shard ไหนเสร็จก่อน
+- unit ที่ไม่ได้ข้อมูลของแต่ละ shard (booking_skipped.shard-i-of-N.json) ถูกรวมเป็น booking_skipped.json
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import zlib
+from datetime import date
+
+import sites
+from booking_record import BookingRecord
+from host_health import read_failed, write_failed
+
+SHARD_GLOB = "booking_result.shard-*-of-*.ndjson"
+_SHARD_NAME = re.compile(r"\.shard-(\d+)-of-(\d+)\.")
+
+
+class Shard:
+    """shard ที่ index (1..count) จาก count shard"""
+
+    def __init__(self, index, count):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"shard {index}/{count} ไม่ถูกต้อง (ต้องเป็น 1..N/N)")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, text):
+        """ "2/4" -> Shard(2, 4) (ใช้เป็น type ของ argparse ได้) """
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", str(text))
+        if not match:
+            raise argparse.ArgumentTypeError(f"รูปแบบ shard ต้องเป็น i/N เช่น 1/4 (ได้ {text!r})")
+        try:
+            return cls(int(match.group(1)), int(match.group(2)))
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+    def owns(self, key):
+        """key (รหัสบ้าน / URL) อยู่ใน shard นี้หรือไม่"""
+        return zlib.crc32(str(key).strip().encode("utf-8")) % self.count == self.index - 1
+
+    def path(self, path):
+        """booking_result.csv -> booking_result.shard-1-of-4.csv"""
+        root, ext = os.path.splitext(path)
+        return f"{root}.shard-{self.index}-of-{self.count}{ext}"
+
+    def filter_urls(self, urls):
+        """URL ที่ shard นี้ต้องดึง: หน้ารวมหลายบ้านทุกหน้า (แบ่งตามบ้านทีหลัง) + URL บ้านเดี่ยวของ shard นี้"""
+        kept = []
+        for url in urls:
+            spec = sites.spec(sites.detect(url))
+            if (spec is not None and spec.listing) or self.owns(url.rstrip("/")):
+                kept.append(url)
+        return kept
+
+    def filter_houses(self, houses):
+        """บ้าน (dict ที่มี 'dv_code') ของ shard นี้"""
+        return [house for house in houses if self.owns(house['dv_code'])]
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+
+# ========================================================
+# merge
+# ========================================================
+def shard_files(paths):
+    """
+    ตรวจว่าไฟล์ shard ครบทุก shard -> (ไฟล์เรียงตาม shard, รายการ shard ที่ขาด)
+    (ValueError ถ้าชื่อไฟล์ไม่ใช่ไฟล์ shard หรือจำนวน shard ไม่ตรงกัน)
+    """
+    found = {}
+    counts = set()
+    for path in paths:
+        match = _SHARD_NAME.search(os.path.basename(path))
+        if not match:
+            raise ValueError(f"{path}: ไม่ใช่ไฟล์ shard (*.shard-i-of-N.ndjson)")
+        index, count = int(match.group(1)), int(match.group(2))
+        counts.add(count)
+        found[index] = path
+    if len(counts) > 1:
+        raise ValueError(f"ไฟล์มาจากการแบ่ง shard ต่างกัน: {sorted(counts)}")
+    count = counts.pop() if counts else 0
+    missing = [i for i in range(1, count + 1) if i not in found]
+    return [found[i] for i in sorted(found)], missing
+
+
+def read_records(paths):
+    """อ่าน row จากไฟล์ NDJSON ของทุก shard -> list ของ BookingRecord เรียงแบบ deterministic"""
+    records = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = BookingRecord.from_row(json.loads(line))
+                if record is not None:
+                    records.append(record)
+    records.sort(key=lambda r: (r.code, r.name, r.day, r.status.value, r.site))
+    return records
+
+
+def read_shard_failed(paths, skipped_file):
+    """unit ที่ไม่ได้ข้อมูลของทุก shard (booking_skipped.shard-i-of-N.json คู่กับไฟล์ NDJSON ของ shard)"""
+    failed = []
+    for path in paths:
+        match = _SHARD_NAME.search(os.path.basename(path))
+        failed.extend(read_failed(Shard(int(match.group(1)), int(match.group(2))).path(skipped_file)))
+    return failed
+
+
+def merge(argv=None):
+    parser = argparse.ArgumentParser(description="รวมผลของทุก shard เป็น booking_result.csv / .json / .xlsx")
+    parser.add_argument("files", nargs="*", help=f"ไฟล์ NDJSON ของแต่ละ shard (ค่าเริ่มต้น {SHARD_GLOB})")
+    parser.add_argument(
+        "--allow-missing", action="store_true",
+        help="รวมแม้ shard ไม่ครบ (ไม่บันทึก change log — บ้านของ shard ที่ขาดจะกลายเป็น released)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        paths, missing = shard_files(args.files or sorted(glob.glob(SHARD_GLOB)))
+    except ValueError as e:
+        print(f"⛔ {e}")
+        return 1
+    if not paths:
+        print(f"⛔ ไม่พบไฟล์ shard ({SHARD_GLOB})")
+        return 1
+    if missing:
+        print(f"⚠️ ขาด shard: {', '.join(map(str, missing))}")
+        if not args.allow_missing:
+            print("⛔ ยกเลิกการรวม (ใช้ --allow-missing ถ้าต้องการรวมเท่าที่มี)")
+            return 1
+
+    import scrape_calendar  # import เฉพาะตอน merge (scrape_calendar import shards)
+
+    print(f"🧩 รวม {len(paths)} shard:")
+    for path in paths:
+        print(f"   📄 {path}")
+    records = read_records(paths)
+    failed = read_shard_failed(paths, scrape_calendar.SKIPPED_FILE)
+    write_failed(scrape_calendar.SKIPPED_FILE, failed)
+    stats = scrape_calendar.publish(
+        records, date.today(), track_changes=not missing, failed=failed,
+    )
+    return 0 if stats.count else 1
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "merge":
+        print("ใช้: python shards.py merge [ไฟล์ shard ...] [--allow-missing]")
+        return 2
+    return merge(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+ส่ง BookingRecord ต่อกันเป็นสาย (sink chain) และเขียนผลทันทีที่ได้มา
+
+    chain = PastDateFilter(today, Dedupe(Fanout(
+        CsvWriter("booking_result.csv"),
+        NdjsonWriter("booking_result.ndjson"),
+        MatrixSink(builder),
+    )))
+    for record in scraper.scrape(url):
+        chain.send(record)
+    chain.close()   # close(ok=False) ถ้าการรันล้มกลางทาง
+
+แต่ละ sink เก็บเฉพาะสถานะของตัวเอง (ไม่มีตัวไหนเก็บ row ทั้งหมด) หน่วยความจำจึงไม่โตตาม
+จำนวนบ้าน — ถ้าการรันล้มกลางทาง ไฟล์ CSV / NDJSON ยังมีผลถึงเดือนล่าสุดที่ parse เสร็จ
+"""
+import csv
+import json
+import os
+import time
+
+from metrics import add_span
+
+ROW_FIELDS = ["ชื่อบ้าน", "รหัส", "เดือน", "วันที่", "สถานะ", "เว็บ"]
+
+
+class Sink:
+    """ส่ง record ต่อให้ next_sink (ถ้ามี)"""
+
+    def __init__(self, next_sink=None):
+        self.next_sink = next_sink
+
+    def send(self, record):
+        self.emit(record)
+
+    def emit(self, record):
+        if self.next_sink is not None:
+            self.next_sink.send(record)
+
+    def close(self, ok=True):
+        """ok = False: การรันล้มกลางทาง (sink ที่เขียนแบบแทนที่ทั้งไฟล์จะไม่ทับไฟล์เดิม)"""
+        if self.next_sink is not None:
+            self.next_sink.close(ok)
+
+
+class Fanout(Sink):
+    """ส่ง record เดียวกันให้หลาย sink"""
+
+    def __init__(self, *sinks):
+        super().__init__()
+        self.sinks = sinks
+
+    def send(self, record):
+        for sink in self.sinks:
+            sink.send(record)
+
+    def close(self, ok=True):
+        for sink in self.sinks:
+            sink.close(ok)
+
+
+class PastDateFilter(Sink):
+    """ทิ้ง record ที่วันที่ก่อน today (เวลาที่ใช้กรองรวมเป็น span "filter" ตอน close)"""
+
+    def __init__(self, today, next_sink=None):
+        super().__init__(next_sink)
+        self.today = today
+        self.dropped = 0
+        self.seconds = 0.0
+
+    def send(self, record):
+        started = time.perf_counter()
+        keep = record.day >= self.today
+        self.seconds += time.perf_counter() - started
+        if keep:
+            self.emit(record)
+        else:
+            self.dropped += 1
+
+    def close(self, ok=True):
+        add_span("filter", self.seconds)
+        super().close(ok)
+
+
+class Dedupe(Sink):
+    """
+    ทิ้ง record ที่ซ้ำ (บ้าน, วันที่, สถานะ เดียวกัน เช่น บ้านที่อยู่ในหลาย URL)
+    เก็บเฉพาะ hash ของ key (int) ไม่เก็บ record
+    """
+
+    def __init__(self, next_sink=None):
+        super().__init__(next_sink)
+        self.seen = set()
+        self.dropped = 0
+
+    def send(self, record):
+        key = hash(record)
+        if key in self.seen:
+            self.dropped += 1
+            return
+        self.seen.add(key)
+        self.emit(record)
+
+
+class Stats(Sink):
+    """นับ record และบ้าน (รหัส, ชื่อ) ที่ผ่านมา"""
+
+    def __init__(self, next_sink=None):
+        super().__init__(next_sink)
+        self.count = 0
+        self.houses = set()
+
+    def send(self, record):
+        self.count += 1
+        if record.code or record.name:
+            self.houses.add((record.code, record.name))
+        self.emit(record)
+
+
+class CsvWriter(Sink):
+    """เขียน row แบบเดิมลง CSV (utf-8-sig ให้ Excel อ่านภาษาไทยได้) ทีละ record"""
+
+    def __init__(self, path, next_sink=None):
+        super().__init__(next_sink)
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=ROW_FIELDS)
+        self._writer.writeheader()
+        self.count = 0
+
+    def send(self, record):
+        self._writer.writerow(record.to_row())
+        self.count += 1
+        self.emit(record)
+
+    def close(self, ok=True):
+        self._file.close()
+        super().close(ok)
+
+
+class NdjsonWriter(Sink):
+    """เขียน row แบบเดิมลง NDJSON (1 บรรทัด = 1 row) ทีละ record"""
+
+    def __init__(self, path, next_sink=None):
+        super().__init__(next_sink)
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self.count = 0
+
+    def send(self, record):
+        self._file.write(json.dumps(record.to_row(), ensure_ascii=False) + "\n")
+        self.count += 1
+        self.emit(record)
+
+    def close(self, ok=True):
+        self._file.close()
+        super().close(ok)
+
+
+class JsonWriter(Sink):
+    """
+    เขียน row แบบเดิมเป็น JSON array (เหมือน booking_result.json) ทีละ record
+
+    เขียนลง path.tmp แล้วแทนที่ path ตอน close เมื่อสำเร็จเท่านั้น — booking_result.json
+    เป็น snapshot ที่รอบถัดไปใช้เทียบ การรันที่ล้มกลางทาง (หรือถูก kill) จึงไม่ทับด้วยผลครึ่งเดียว
+    """
+
+    def __init__(self, path, next_sink=None):
+        super().__init__(next_sink)
+        self.path = path
+        self._tmp = f"{path}.tmp"
+        self._file = open(self._tmp, "w", encoding="utf-8")
+        self._file.write("[")
+        self.count = 0
+
+    def send(self, record):
+        self._file.write(("," if self.count else "") + "\n  " + json.dumps(record.to_row(), ensure_ascii=False))
+        self.count += 1
+        self.emit(record)
+
+    def close(self, ok=True):
+        if ok:
+            self._file.write("\n]\n" if self.count else "]\n")
+        self._file.close()
+        if ok:
+            os.replace(self._tmp, self.path)
+        else:
+            os.remove(self._tmp)
+        super().close(ok)
+
+
+class MatrixSink(Sink):
+    """ใส่ record ลง availability_matrix.MatrixBuilder (เขียนไฟล์ตอน close)"""
+
+    def __init__(self, builder, path, next_sink=None):
+        super().__init__(next_sink)
+        self.builder = builder
+        self.path = path
+        self.house_count = None
+
+    def send(self, record):
+        self.builder.add(record.code, record.name, record.day, record.status.value)
+        self.emit(record)
+
+    def close(self, ok=True):
+        if self.builder.rows:
+            self.house_count = self.builder.write(self.path)
+        super().close(ok)
+
+
+class ChangeSink(Sink):
+    """เทียบกับ snapshot รอบก่อนด้วย change_log.ChangeTracker (ได้ event ตอน close)"""
+
+    def __init__(self, tracker, next_sink=None):
+        super().__init__(next_sink)
+        self.tracker = tracker
+        self.events = None
+
+    def send(self, record):
+        self.tracker.add(record.to_row())
+        self.emit(record)
+
+    def close(self, ok=True):
+        self.events = self.tracker.finish()
+        super().close(ok)
@@ -0,0 +1,101 @@
+"""
+Registry ของ adapter แต่ละเว็บ
+
+แต่ละเว็บประกาศใน SITES ว่า URL แบบไหนเป็นของเว็บนั้น (domains) ต้องใช้ engine อะไร
+และ adapter อยู่ที่โมดูลไหน — โมดูลของ adapter ถูก import เมื่อใช้ครั้งแรกเท่านั้น
+รอบที่มีแต่เว็บ engine "http" จึงไม่ import Selenium และไม่เปิด Chrome
+
+    engine "http"    = ดึงผ่าน HTTP ได้ (ใช้ Chrome เฉพาะตอน HTTP ล้มเหลว)
+    engine "browser" = ต้องเปิดด้วย Chrome
+    listing=True      = 1 URL มีหลายบ้าน (--shard แบ่งตามรหัสบ้าน ไม่ใช่ตาม URL)
+
+เพิ่มเว็บใหม่: เขียนโมดูลใน sites/ ที่มี class สืบจาก SiteAdapter แล้วเพิ่ม SiteSpec ใน SITES
+(ตัว dispatch ใน CalendarScraper / worker pool / async crawler ไม่ต้องแก้)
+"""
+import importlib
+import threading
+from collections import namedtuple
+from urllib.parse import urlparse
+
+UNKNOWN = "unknown"
+
+SiteSpec = namedtuple("SiteSpec", ["name", "domains", "engine", "adapter", "listing"], defaults=(False,))
+
+SITES = [
+    SiteSpec("deville", ("devillegroups.com",), "http", "sites.deville:DevilleAdapter", listing=True),
+    SiteSpec("poolvillacity", ("poolvillacity.co.th",), "browser", "sites.poolvillacity:PoolVillaCityAdapter"),
+    SiteSpec("pattayaparty", ("pattayapartypoolvilla.com",), "browser", "sites.pattayaparty:PattayaPartyAdapter"),
+]
+
+_BY_NAME = {spec.name: spec for spec in SITES}
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def detect(url):
+    """ชื่อเว็บของ url (UNKNOWN ถ้าไม่ตรงกับเว็บไหน)"""
+    domain = urlparse(url).netloc.lower()
+    for spec in SITES:
+        if any(d in domain for d in spec.domains):
+            return spec.name
+    return UNKNOWN
+
+
+def spec(name):
+    """SiteSpec ของเว็บ name (None ถ้าไม่รู้จัก)"""
+    return _BY_NAME.get(name)
+
+
+def load(name):
+    """class ของ adapter เว็บ name (import โมดูลครั้งแรกที่เรียก)"""
+    cls = _loaded.get(name)
+    if cls is None:
+        with _load_lock:
+            cls = _loaded.get(name)
+            if cls is None:
+                module_name, class_name = _BY_NAME[name].adapter.split(":")
+                cls = getattr(importlib.import_module(module_name), class_name)
+                _loaded[name] = cls
+    return cls
+
+
+class SiteAdapter:
+    """
+    วิธี scrape ของเว็บหนึ่งเว็บ (1 instance ต่อ CalendarScraper)
+
+    ใช้ driver / cache / config ผ่าน self.scraper จึงไม่ต้อง import scrape_calendar
+    """
+    name = None
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    @property
+    def driver(self):
+        return self.scraper.driver
+
+    @property
+    def ready(self):
+        return self.scraper.ready
+
+    def scrape(self, url):
+        """Scrape ทั้ง URL -> iterable ของ BookingRecord"""
+        raise NotImplementedError
+
+    def run(self, url):
+        """scrape ทั้ง URL เป็น unit เดียวผ่าน checkpoint (override ถ้าแยก unit ย่อยได้)"""
+        return self.scraper.run_unit((url, None, None), url, lambda: self.scrape(url))
+
+    def house_code(self, url):
+        """รหัสบ้านของ URL บ้านเดี่ยว (None ถ้า URL ไม่บอกรหัส เช่น หน้ารวมหลายบ้าน)"""
+        return None
+
+    def discover_units(self, url):
+        """แตกงานของ URL เป็น unit สำหรับ worker pool (ค่าเริ่มต้น: 1 unit ต่อ URL)"""
+        return [{'url': url, 'site': self.name, 'house': None, 'ym': None}]
+
+    def scrape_unit(self, unit):
+        return self.scraper.scrape(unit['url'])
+
+    def close(self):
+        pass
@@ -0,0 +1,250 @@
+"""
+รูปแบบที่ 1: Deville Groups (หลายบ้านในหน้าเดียว + iframe cld.php)
+
+engine "http": ดึงหน้ารวมและ cld.php ผ่าน HTTP — เปิด Chrome เฉพาะตอน HTTP ล้มเหลว
+"""
+from calendar_cache import cache_key
+from deville_http import (
+    BASE_IFRAME_URL, DevilleHttpClient, http_listing, month_rows, parse_cld_html, parse_deville_listing,
+    print_unmatched,
+)
+from dom_extract import DEVILLE_CELLS_JS, classify_deville, extract
+from host_health import FAILED, SKIPPED, HostDown, host_of
+from metrics import count_page, span
+from sites import SiteAdapter
+
+
+class DevilleAdapter(SiteAdapter):
+    name = "deville"
+
+    def __init__(self, scraper):
+        super().__init__(scraper)
+        self.http = DevilleHttpClient() if scraper.deville_engine == "http" else None
+
+    def close(self):
+        if self.http:
+            self.http.close()
+
+    def scrape(self, url):
+        """Scrape ปฏิทินจาก devillegroups.com (yield ทีละเดือนที่ parse เสร็จ)"""
+        print("🔄 กำลังโหลดหน้าหลัก Deville Groups...")
+
+        houses = self.find_houses(url)
+        if not houses:
+            return
+
+        # วนดึงข้อมูลแต่ละบ้าน
+        months = self.scraper.months_to_scrape()
+        self.plan(houses, months)
+        total_houses = len(houses)
+
+        for house_idx, house in enumerate(houses, 1):
+            print(f"\n{'='*50}")
+            print(f"🏠 [{house_idx}/{total_houses}] กำลังดึง: {house['name']} ({house['dv_code']})")
+            print(f"{'='*50}")
+
+            for ym in months:
+                yield from self.run_month(url, house, ym)
+
+    def run(self, url):
+        """แต่ละ (บ้าน, เดือน) เป็น unit ของ checkpoint อยู่แล้วใน scrape()"""
+        return self.scrape(url)
+
+    def discover_units(self, url):
+        """1 unit ต่อ (บ้าน, เดือน) — แต่ละเดือนเป็นหน้า cld.php แยกกัน"""
+        print("🔄 กำลังโหลดหน้าหลัก Deville Groups...")
+        houses = self.find_houses(url)
+        months = self.scraper.months_to_scrape()
+        self.plan(houses, months)
+        return [
+            {'url': url, 'site': self.name, 'house': house, 'ym': ym}
+            for house in houses
+            for ym in months
+        ]
+
+    def scrape_unit(self, unit):
+        return self.run_month(unit['url'], unit['house'], unit['ym'])
+
+    def plan(self, houses, months):
+        """เลือก (บ้าน, เดือน) ที่ต้องดึงรอบนี้ตาม RefreshScheduler (ถ้าเปิด --schedule)"""
+        scheduler = self.scraper.scheduler
+        if scheduler is None:
+            return
+        units = [(house['dv_code'], ym) for house in houses for ym in months]
+        chosen = scheduler.plan(self.name, units)
+        print(f"🗓️ ดึงใหม่ {chosen}/{len(units)} unit (ที่เหลือใช้ข้อมูลเดิม)")
+
+    def run_month(self, url, house, ym):
+        """scrape_month ผ่าน checkpoint (unit = url, รหัสบ้าน, เดือน) — unit ที่ยังไม่ถึงรอบใช้ row เดิม"""
+        scheduler = self.scraper.scheduler
+        if scheduler is not None:
+            rows = scheduler.carried(self.name, house['dv_code'], ym)
+            if rows is not None:
+                return rows
+
+        def scrape():
+            rows = self.scrape_month(house, ym)
+            if scheduler is not None:
+                scheduler.observe(self.name, house['dv_code'], ym, rows)
+            return rows
+
+        return self.scraper.run_unit((url, house['dv_code'], ym), f"{house['dv_code']} {ym}", scrape)
+
+    def find_houses(self, url):
+        """หารายชื่อบ้าน (hId, ชื่อ, รหัส DV) จากหน้ารวมปฏิทิน Deville"""
+        try:
+            with span("deville.listing", site="deville"):
+                listing = self._load_listing(url)
+        except HostDown as e:
+            print(f"  ⏭️ ข้าม ({url}): {e}")
+            self.scraper.unit_failed((url, None, None), SKIPPED, e)
+            return []
+        count_page("deville")
+        houses = listing.houses
+
+        for house in houses:
+            print(f"  🏠 พบบ้าน: {house['name']} ({house['dv_code']}, hId={house['id']})")
+        print_unmatched(listing)
+
+        print(f"\n📊 พบบ้านทั้งหมด: {len(houses)} หลัง")
+
+        if not houses:
+            print("❌ ไม่พบข้อมูลบ้าน")
+            # หน้ารวมโหลดไม่สำเร็จ: ไม่รู้ว่าบ้านไหนหายไปจริง -> ไม่นับ released รอบนี้
+            self.scraper.unit_failed((url, None, None), FAILED, "ไม่พบบ้านในหน้ารวม")
+            return houses
+
+        # เฉพาะบ้านของ shard นี้ (--shard i/N)
+        shard = self.scraper.shard
+        if shard is not None:
+            houses = shard.filter_houses(houses)
+            print(f"🧩 shard {shard}: ดึง {len(houses)} หลัง")
+
+        # จำกัดจำนวนบ้าน
+        max_houses = self.scraper.max_houses
+        if max_houses > 0:
+            houses = houses[:max_houses]
+            print(f"🔧 จำกัดดึงแค่ {max_houses} หลังแรก")
+
+        return houses
+
+    def scrape_month(self, house, ym):
+        """ดึงวันติดจองของบ้านหนึ่งหลังในเดือน ym -> list ของ BookingRecord (raise ถ้าดึงไม่สำเร็จ)"""
+        h_id = house['id']
+
+        with span("deville.fetch", site="deville", house=house['dv_code'], month=ym):
+            page_html, parse = self._fetch_month(h_id, ym)
+        count_page("deville")
+
+        # Debug: บันทึก HTML ถ้าเปิด DEBUG_MODE (สำหรับ Madagascar 4)
+        if self.scraper.debug and "2265" in h_id:
+            debug_file = f"debug_madagascar4_{ym}.html"
+            with open(debug_file, "w", encoding="utf-8") as f:
+                f.write(page_html)
+            print(f"  💾 Debug Madagascar 4: บันทึก {debug_file}")
+
+        parsed = {}
+
+        def build():
+            parsed['month_text'], booked = parse()
+            return month_rows(house, ym, parsed['month_text'], booked)
+
+        with span("deville.parse", site="deville", house=house['dv_code'], month=ym):
+            rows, hit = self.scraper.cached_rows(
+                cache_key('deville', house['dv_code'], ym), [house['name'], page_html], build
+            )
+
+        booked_days = [row.day.day for row in rows]
+        month_text = parsed.get('month_text') or (rows[0].month if rows else ym)
+        cached = " (cache)" if hit else ""
+        if booked_days:
+            days_str = ', '.join(map(str, sorted(booked_days)))
+            print(f"  📅 {house['dv_code']} {month_text}: {len(booked_days)} วัน → [{days_str}]{cached}")
+        else:
+            print(f"  📅 {house['dv_code']} {month_text}: ว่าง ✓{cached}")
+
+        return rows
+
+    def _load_listing(self, url):
+        """
+        โหลดหน้ารวมปฏิทิน Deville -> DevilleListing
+
+        ถ้าใช้ engine "http" จะลองดึงผ่าน HTTP ก่อน ถ้าไม่พบบ้านใน HTML
+        (เช่น หน้าเว็บ render ด้วย JavaScript) ค่อยใช้ Chrome
+        """
+        if self.http:
+            try:
+                listing = http_listing(self._http_call(url, lambda: self.http.get(url), "deville listing"))
+                if listing is not None:
+                    return listing
+                print("  ⚠️ HTTP ไม่พบบ้านในหน้ารวม - ใช้ Chrome แทน")
+            except HostDown:
+                raise
+            except Exception as e:
+                self._check_host(url, e)
+                print(f"  ⚠️ HTTP โหลดหน้าหลักไม่สำเร็จ ({e}) - ใช้ Chrome แทน")
+
+        self.scraper.open(url)
+        self.ready.deville_listing()
+        return parse_deville_listing(self.scraper.record_page(url))
+
+    def _fetch_month(self, h_id, ym):
+        """
+        ดึงปฏิทิน cld.php ของบ้าน h_id เดือน ym
+
+        คืนค่า (page_html, parse) — parse() -> (month_text, booked_days)
+        แยกการ parse ออกมาเพื่อข้ามได้เมื่อ HTML ตรงกับ cache
+        - engine "http": ดึงผ่าน requests + parse ด้วย html.parser (ไม่ต้องรอ Chrome)
+        - engine "selenium" (หรือ HTTP ล้มเหลว): เปิดด้วย Chrome เหมือนเดิม
+        """
+        calendar_url = f"{BASE_IFRAME_URL}?ym={ym}&hId={h_id}"
+
+        if self.http:
+            try:
+                page_html = self.http.fetch_month_html(h_id, ym)
+                return page_html, lambda: parse_cld_html(page_html, ym)
+            except Exception as e:
+                # unit นี้อยู่ใน HostHealth.call ของ run_unit แล้ว: บันทึกแค่ความล้มเหลวของ HTTP
+                if self.scraper.health is not None:
+                    self.scraper.health.failure(host_of(calendar_url), h_id)
+                self._check_host(calendar_url, e)
+                print(f"  ⚠️ HTTP ({ym}) ไม่สำเร็จ: {e} - ใช้ Chrome แทน")
+
+        self.scraper.open(calendar_url)
+
+        # รอจนมี <th> หัวเดือน แทนการ sleep
+        month_el = self.ready.deville_month()
+        if month_el is None:
+            raise RuntimeError(f"cld.php ({ym}) ไม่แสดงหัวเดือนภายในเวลาที่กำหนด")
+        page_html = self.scraper.record_page(calendar_url)
+
+        def parse():
+            # อ่านชื่อเดือน
+            try:
+                month_text = month_el.text.strip()
+                for line in month_text.split("\n"):
+                    if "256" in line or "257" in line:
+                        month_text = line.strip()
+                        break
+            except:
+                month_text = ym
+
+            # ดึงวันที่ติดจอง (สีแดง = booking, สีเขียว = waiting)
+            # อ่านทุก td ด้วย execute_script ครั้งเดียว แล้วกรองวันของเดือนอื่นใน Python
+            booked_days = classify_deville(extract(self.driver, DEVILLE_CELLS_JS))
+            return month_text, booked_days
+
+        return page_html, parse
+
+    def _http_call(self, url, fetch, label):
+        """fetch() ผ่าน HostHealth ของ host (ลองใหม่ + circuit breaker) ถ้าเปิดใช้"""
+        health = self.scraper.health
+        if health is None:
+            return fetch()
+        return health.call(host_of(url), fetch, label, source=url)
+
+    def _check_host(self, url, error):
+        """HTTP ล้มเหลว: raise HostDown ถ้า circuit ของ host เปิด (host ที่ล่มไม่ต้องรอ Chrome timeout ทีละหน้า)"""
+        health = self.scraper.health
+        if health is not None and health.is_open(host_of(url)):
+            raise HostDown(f"{host_of(url)} ล้มเหลวติดกัน - ไม่ใช้ Chrome แทน ({error})")
@@ -0,0 +1,227 @@
+"""
+รูปแบบที่ 3: Pattaya Party Pool Villa (ปฏิทินเดือนเดียว + navigation)
+
+engine "browser": ต้องเปิดด้วย Chrome (grid วันที่ render ด้วย JavaScript)
+"""
+import calendar
+import re
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from booking_record import BookingStatus, month_records
+from calendar_cache import cache_key
+from dom_extract import PATTAYA_CELLS_JS, classify_pattaya, extract
+from metrics import count_page, span
+from readiness import THAI_MONTH_XPATH
+from sites import SiteAdapter
+from thai_dates import month_label, parse_month_label
+
+
+class PattayaPartyAdapter(SiteAdapter):
+    name = "pattayaparty"
+
+    def house_code(self, url):
+        """รหัสบ้านจาก URL (/v/2606 -> DV-2606)"""
+        match = re.search(r'/v/(\d+)', url)
+        return f"DV-{match.group(1)}" if match else None
+
+    def scrape(self, url):
+        """
+        Scrape ปฏิทินจาก pattayapartypoolvilla.com
+
+        ✅ รองรับ:
+        - ปฏิทินแสดงทีละเดือน
+        - มีปุ่ม Prev/Next สำหรับเปลี่ยนเดือน
+        - สถานะ: แดง = ติดจอง, เขียว/น้ำเงิน = มีจองแต่ยังไม่โอน, เหลือง = วันหยุด
+        - ⚠️ ต้องกรองวันของเดือนอื่นที่แสดงในปฏิทินออก
+
+        yield BookingRecord ทีละเดือน
+        """
+        print("🔄 กำลังโหลดหน้า Pattaya Party Pool Villa...")
+
+        found = 0
+        failed_months = 0
+
+        # ดึงรหัสบ้านจาก URL
+        match = re.search(r'/v/(\d+)', url)
+        villa_id = match.group(1) if match else "Unknown"
+        dv_code = self.house_code(url) or "Unknown"
+
+        with span("pattayaparty.load", site="pattayaparty", house=dv_code):
+            self.scraper.open(url)
+            calendar_ready = self.ready.pattaya_calendar()  # รอจนปฏิทิน render (แทน sleep)
+        count_page("pattayaparty")
+        self.scraper.record_page(url)
+        if not calendar_ready:
+            # ไม่ถือว่าว่างทุกเดือน (ไม่เช่นนั้นทุกวันที่เคยจองจะกลายเป็น released)
+            raise RuntimeError("ปฏิทินไม่แสดงภายในเวลาที่กำหนด")
+
+        wait = WebDriverWait(self.driver, 15)
+
+        # ดึงชื่อบ้านจาก header หรือ title
+        try:
+            # หารหัสที่พัก (ไม่พบ = หน้าไม่ใช่บ้านพัก -> ใช้ชื่อสำรอง)
+            self.driver.find_element(By.XPATH, "//*[contains(text(),'รหัสที่พัก')]")
+            # หาชื่อจาก title
+            title = self.driver.title
+            house_name = title.split('|')[0].strip() if '|' in title else title
+        except:
+            house_name = f"Villa {villa_id}"
+
+        print(f"  🏠 บ้าน: {house_name} ({dv_code})")
+
+        # กดปุ่ม "📅 วันนี้" เพื่อกลับไปเดือนปัจจุบันก่อน
+        try:
+            today_btn = wait.until(
+                EC.element_to_be_clickable(
+                    (By.XPATH, "//button[contains(text(),'วันนี้') or contains(@title,'กลับไปเดือนปัจจุบัน')]")
+                )
+            )
+            today_btn.click()
+        except:
+            today_btn = None  # ถ้าไม่มีปุ่มก็ข้ามไป
+        now = datetime.now()
+        if today_btn is not None and not self.ready.pattaya_month_shown(*month_label(now.year, now.month).split()):
+            # ไม่รู้ว่าปฏิทินอยู่เดือนไหน -> ทุกเดือนไม่สำเร็จ (ไม่ใช่ว่าง)
+            raise RuntimeError("ปฏิทินไม่กลับไปเดือนปัจจุบันหลังกด 'วันนี้'")
+
+        # ดึงปฏิทินหลายเดือน
+        start_date = datetime.now()
+
+        for i in range(self.scraper.month_count):
+            try:
+                if i > 0:
+                    # กดปุ่ม Next เพื่อไปเดือนถัดไป
+                    with span("pattayaparty.navigate", site="pattayaparty", house=dv_code,
+                              month=(start_date + relativedelta(months=i)).strftime("%Y-%m")):
+                        try:
+                            next_btn = wait.until(
+                                EC.element_to_be_clickable(
+                                    (By.XPATH, "//button[contains(text(),'Next') or contains(text(),'►') or contains(text(),'>')]")
+                                )
+                            )
+                            old_header = self.ready.pattaya_header()
+                            next_btn.click()
+                            # รอ header เดือนเปลี่ยน (ไม่เปลี่ยน = จะอ่านเดือนเดิมซ้ำโดยติดป้ายเดือนผิด)
+                            if self.ready.pattaya_month_changed(old_header) is None:
+                                raise TimeoutError("header เดือนไม่เปลี่ยนหลังกด Next")
+                        except Exception as e:
+                            print(f"  ⚠️ ไม่สามารถกดปุ่ม Next: {e}")
+                            # เดือนที่เหลือไม่ได้อ่าน = ไม่สำเร็จ (ไม่ใช่ว่าง) -> ลองใหม่ / ไม่นับ released
+                            failed_months += self.scraper.month_count - i
+                            break
+
+                # คำนวณเดือน/ปีที่คาดหวัง
+                target_date = start_date + relativedelta(months=i)
+                expected_month = target_date.month
+                expected_year = target_date.year
+
+                # อ่านชื่อเดือนจาก header ปฏิทิน
+                month_text = ""
+                try:
+                    month_el = self.driver.find_element(By.XPATH, THAI_MONTH_XPATH)
+                    month_text = month_el.text.strip()
+                    # ดึงเฉพาะส่วนที่มีเดือนและปี พ.ศ.
+                    for line in month_text.split('\n'):
+                        if parse_month_label(line)[0] is not None:
+                            month_text = line.strip()
+                            break
+                except:
+                    month_text = target_date.strftime("%Y-%m")
+
+                # หาจำนวนวันในเดือนปัจจุบัน
+                days_in_month = calendar.monthrange(expected_year, expected_month)[1]
+
+                # เว็บนี้ใช้ div แทน table!
+                # วันที่ติดจอง = มี class bg-red-500 และ text-white (สีแดง = ติดจอง)
+                # วันที่รอโอน = มี class bg-green (สีเขียว = รอโอน)
+                # วันของเดือนอื่น = มี class text-gray-400
+                # อ่าน cell ทั้งหมดใน grid ตัวเลขวันด้วย execute_script ครั้งเดียว
+                ym = f"{expected_year}-{expected_month:02d}"
+                with span("pattayaparty.extract", site="pattayaparty", house=dv_code, month=ym):
+                    cells = extract(self.driver, PATTAYA_CELLS_JS)
+                if i > 0:
+                    count_page("pattayaparty")
+
+                # ใช้เดือนจาก header ถ้าอ่านได้ ไม่เช่นนั้นใช้เดือนที่คาดหวัง
+                year, month = parse_month_label(month_text)
+                if year is None:
+                    year, month = expected_year, expected_month
+
+                def build():
+                    booked, pending = classify_pattaya(cells, days_in_month)
+                    # สีแดง (ติดจอง) ก่อน แล้วตามด้วยสีเขียว (รอโอน)
+                    return (
+                        month_records(house_name, dv_code, year, month, booked, BookingStatus.BOOKED, self.name)
+                        + month_records(house_name, dv_code, year, month, pending, BookingStatus.PENDING, self.name)
+                    )
+
+                with span("pattayaparty.parse", site="pattayaparty", house=dv_code, month=ym):
+                    month_results, hit = self.scraper.cached_rows(
+                        cache_key('pattayaparty', dv_code, ym),
+                        [house_name, month_text, cells],
+                        build,
+                    )
+                found += len(month_results)
+                yield from month_results
+
+                booked_days = [r.day.day for r in month_results if r.status is BookingStatus.BOOKED]
+                pending_days = [r.day.day for r in month_results if r.status is BookingStatus.PENDING]
+
+                total_days = len(booked_days) + len(pending_days)
+                if total_days > 0:
+                    booked_str = ', '.join(map(str, booked_days)) if booked_days else '-'
+                    pending_str = ', '.join(map(str, pending_days)) if pending_days else '-'
+                    print(f"  📅 {month_text}: ติดจอง [{booked_str}], รอโอน [{pending_str}]{' (cache)' if hit else ''}")
+                else:
+                    print(f"  📅 {month_text}: ว่าง ✓{' (cache)' if hit else ''}")
+
+            except Exception as e:
+                print(f"  ⛔ Error เดือนที่ {i+1}: {e}")
+                failed_months += 1
+
+        # ถ้าไม่พบข้อมูล แสดง debug info
+        if not found:
+            print("\n  ⚠️ ไม่พบข้อมูลการจอง - กำลัง debug...")
+            self._debug_calendar_structure()
+
+        if failed_months:
+            # ไม่ให้ checkpoint บันทึกบ้านที่ได้ไม่ครบทุกเดือน (รอบ --resume จะดึงใหม่)
+            raise RuntimeError(f"ดึงไม่สำเร็จ {failed_months} เดือน")
+
+    def _debug_calendar_structure(self):
+        """แสดง debug info สำหรับวิเคราะห์โครงสร้างปฏิทิน"""
+        print("\n  📋 Debug: กำลังวิเคราะห์โครงสร้าง HTML...")
+
+        # หา elements ที่อาจเป็นปฏิทิน
+        tables = self.driver.find_elements(By.TAG_NAME, "table")
+        print(f"  - พบ table: {len(tables)} อัน")
+
+        # หา td ทั้งหมด
+        tds = self.driver.find_elements(By.TAG_NAME, "td")
+        print(f"  - พบ td: {len(tds)} อัน")
+
+        # หา class ที่มี bg-
+        bg_elements = self.driver.find_elements(By.XPATH, "//*[contains(@class,'bg-')]")
+        classes = set()
+        for el in bg_elements[:50]:  # จำกัด 50 อัน
+            class_attr = el.get_attribute("class")
+            if class_attr:
+                for c in class_attr.split():
+                    if 'bg-' in c:
+                        classes.add(c)
+
+        if classes:
+            print(f"  - พบ background classes: {list(classes)[:10]}")
+
+        # Save HTML สำหรับ debug
+        try:
+            with open("debug_calendar.html", "w", encoding="utf-8") as f:
+                f.write(self.driver.page_source)
+            print("  💾 บันทึก HTML ไว้ที่ debug_calendar.html")
+        except:
+            pass
@@ -0,0 +1,203 @@
+"""
+รูปแบบที่ 2: Pool Villa City (ปฏิทิน FullCalendar + navigation)
+
+engine "browser": ต้องเปิดด้วย Chrome (ปฏิทิน render ด้วย JavaScript)
+"""
+import re
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from booking_record import month_records
+from calendar_cache import cache_key
+from dom_extract import (
+    FULLCALENDAR_CELLS_JS, FULLCALENDAR_EVENTS_JS, classify_fullcalendar,
+    expand_fullcalendar_events, extract,
+)
+from metrics import count_page, span
+from sites import SiteAdapter
+from thai_dates import month_label, parse_month_label
+
+
+class PoolVillaCityAdapter(SiteAdapter):
+    name = "poolvillacity"
+
+    def house_code(self, url):
+        """รหัสบ้านจาก URL (เช่น CITY-743)"""
+        match = re.search(r'(CITY-\d+)', url)
+        return match.group(1) if match else None
+
+    def scrape(self, url):
+        """
+        Scrape ปฏิทินจาก poolvillacity.co.th
+
+        ✅ รองรับ:
+        - ใช้ FullCalendar library
+        - ปฏิทินแสดงทีละหลายเดือน (ต้องกด Next เพื่อดูเดือนถัดไป)
+        - วันที่ติดจอง: มี fc-bg-event + background-color: rgb(248, 229, 231) + สีแดง
+        - วันที่เทศกาล: สีเหลือง
+        - วันที่อยู่ใน data-date attribute
+
+        yield BookingRecord ทีละเดือน
+        """
+        print("🔄 กำลังโหลดหน้า Pool Villa City...")
+
+        found = 0
+        month_count = self.scraper.month_count
+
+        house_code = self.house_code(url) or "Unknown"
+
+        with span("poolvillacity.load", site="poolvillacity", house=house_code):
+            self.scraper.open(url)
+        count_page("poolvillacity")
+
+        # รอให้ FullCalendar โหลด (คืนค่าทันทีที่มีตารางวัน) ก่อนอ่านชื่อบ้าน
+        # หน้าที่โหลดไม่ขึ้นจึงเสียเวลารอแค่ครั้งเดียว
+        if not self.ready.fullcalendar():
+            # ไม่ถือว่าว่างทั้งเดือน (ไม่เช่นนั้นทุกวันที่เคยจองจะกลายเป็น released)
+            raise RuntimeError("ไม่พบ FullCalendar ภายในเวลาที่กำหนด")
+
+        wait = WebDriverWait(self.driver, 15)
+
+        # ดึงชื่อบ้าน
+        try:
+            title_el = wait.until(
+                EC.presence_of_element_located((By.TAG_NAME, "h1"))
+            )
+            house_name = title_el.text.strip()
+            if not house_name:
+                house_name = house_code
+        except:
+            house_name = house_code
+
+        print(f"  🏠 บ้าน: {house_name} ({house_code})")
+        self.scraper.record_page(url)
+
+        current_year = datetime.now().year
+        current_month = datetime.now().month
+
+        with span("poolvillacity.events", site="poolvillacity", house=house_code):
+            booked_dates = None
+            if self.scraper.poolvilla_mode == "api":
+                # อ่าน event ทั้งช่วงจาก FullCalendar API ในครั้งเดียว (ไม่ต้องกด Next)
+                booked_dates = self._read_events()
+                if booked_dates is None:
+                    print("  ⚠️ ไม่พบ FullCalendar API - ใช้การกด Next แทน")
+
+            if booked_dates is None:
+                booked_dates = self._collect_by_clicking()
+
+        # จัดกลุ่มตามเดือน
+        by_month = {}
+        for date_str in sorted(booked_dates):
+            parts = date_str.split('-')
+            if len(parts) == 3:
+                year, month, day = parts
+                year_int = int(year)
+                month_int = int(month)
+
+                # ข้ามเดือนที่ผ่านมาแล้ว
+                if year_int < current_year or (year_int == current_year and month_int < current_month):
+                    continue
+
+                # จำกัดแค่ MONTH_TO_SCRAPE เดือน
+                months_diff = (year_int - current_year) * 12 + (month_int - current_month)
+                if months_diff >= month_count:
+                    continue
+
+                by_month.setdefault(f"{year}-{month}", []).append(int(day))
+
+        # สร้าง row ทีละเดือน (เก็บลง cache แยกตามเดือน)
+        for ym in self.scraper.months_to_scrape():
+            year, month = parse_month_label(ym)
+            days = by_month.get(ym, [])
+            month_key = month_label(year, month)
+
+            with span("poolvillacity.parse", site="poolvillacity", house=house_code, month=ym):
+                month_results, hit = self.scraper.cached_rows(
+                    cache_key('poolvillacity', house_code, ym),
+                    [house_name, days],
+                    lambda: month_records(house_name, house_code, year, month, days, site=self.name),
+                )
+            found += len(month_results)
+            yield from month_results
+
+            # แสดงผล
+            if days:
+                days_str = ', '.join(map(str, sorted(days)))
+                print(f"  📅 {month_key}: {len(days)} วัน → [{days_str}]{' (cache)' if hit else ''}")
+
+        if not found:
+            print("  📅 ไม่พบวันติดจอง (ว่างทั้งหมด หรืออาจต้องปรับ selector)")
+
+    def _collect_by_clicking(self):
+        """อ่านวันติดจองจาก DOM ทีละ view แล้วกด Next (MONTH_TO_SCRAPE รอบ) -> set ของ 'YYYY-MM-DD'"""
+        booked_dates = set()  # ใช้ set เพื่อไม่ซ้ำ
+        month_count = self.scraper.month_count
+
+        # วนกดปุ่ม Next เพื่อดึงข้อมูลหลายรอบ
+        # FullCalendar อาจแสดงหลายเดือนในหน้าเดียว เราจะกด Next หลายครั้ง
+        views = 0
+        for round_num in range(month_count):
+            # หา td ที่มี data-date และมี fc-bg-event ด้านใน (วันที่ติดจอง)
+            # อ่านทั้ง view ด้วย execute_script ครั้งเดียว
+            booked_dates.update(
+                classify_fullcalendar(extract(self.driver, FULLCALENDAR_CELLS_JS))
+            )
+            views += 1
+
+            # กดปุ่ม Next เพื่อไปเดือนถัดไป (ยกเว้นรอบสุดท้าย)
+            if round_num < month_count - 1:
+                try:
+                    next_btn = self.driver.find_element(
+                        By.XPATH,
+                        "//button[contains(@class,'fc-next-button') or contains(@aria-label,'next') or contains(@title,'Next')]"
+                    )
+                    state = self.ready.fullcalendar_state()
+                    next_btn.click()
+                    if not self.ready.fullcalendar_changed(state):
+                        raise TimeoutError("ปฏิทินไม่เปลี่ยน view หลังกด Next")
+                except Exception as e:
+                    print(f"  ⚠️ ไม่สามารถกดปุ่ม Next: {e}")
+                    break
+
+        if views < month_count:
+            # view ที่เหลือไม่ได้อ่าน = ไม่สำเร็จ (ไม่ใช่ว่าง) -> ลองใหม่ / ไม่นับ released
+            raise RuntimeError(f"อ่านปฏิทินได้ {views}/{month_count} view")
+
+        return booked_dates
+
+    def _read_events(self):
+        """
+        อ่านช่วงวันติดจองจาก FullCalendar API ของหน้าเว็บในครั้งเดียว
+
+        คืนค่า set ของ 'YYYY-MM-DD' หรือ None ถ้าหา instance ของปฏิทินไม่พบ / โหลด event feed ไม่สำเร็จ
+        """
+        today = datetime.now().date().replace(day=1)
+        range_start = today.isoformat()
+        range_end = (today + relativedelta(months=self.scraper.month_count)).isoformat()
+
+        try:
+            self.driver.set_script_timeout(15)
+            data = self.driver.execute_async_script(FULLCALENDAR_EVENTS_JS, range_start, range_end)
+        except Exception as e:
+            print(f"  ⚠️ อ่าน FullCalendar API ไม่สำเร็จ: {e}")
+            return None
+
+        if not data:
+            return None
+        if data.get('lazySources'):
+            # event source แบบฟังก์ชันโหลดเฉพาะเดือนที่แสดง -> ต้องกด Next
+            print("  ⚠️ FullCalendar โหลด event ทีละ view")
+            return None
+        if data.get('error'):
+            # event ที่โหลดไว้มีแค่ view ที่แสดงอยู่ เดือนถัดไปจะดูเหมือนว่างทั้งหมด -> ต้องกด Next
+            print(f"  ⚠️ โหลด event feed ไม่สำเร็จ ({data['error']})")
+            return None
+
+        events = data.get('events') or []
+        print(f"  🔌 FullCalendar API ({data.get('source')}): {len(events)} events")
+        return expand_fullcalendar_events(events)
@@ -0,0 +1,54 @@
+"""POST /push: body ที่ไม่ใช่ list ของ row ต้องได้ 400 และไม่เปลี่ยน snapshot"""
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from availability_service import AvailabilityService, make_handler
+
+ROW = {"ชื่อบ้าน": "Villa A", "รหัส": "DV-1", "เดือน": "มีนาคม 2569", "วันที่": 5, "สถานะ": "ติดจอง"}
+
+
+@pytest.fixture
+def server(tmp_path):
+    service = AvailabilityService(str(tmp_path / "booking_result.json"))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post(url, body):
+    request = urllib.request.Request(url + "/push", data=body, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("body", [b"{}", b"1", b'["x"]', b"null", b"not json"])
+def test_push_rejects_body_that_is_not_a_list_of_rows(server, body):
+    service, url = server
+    etag = service.snapshot.etag
+    status, payload = _post(url, body)
+    assert status == 400
+    assert "error" in payload
+    assert service.snapshot.etag == etag
+
+
+def test_push_accepts_list_of_rows(server):
+    service, url = server
+    status, payload = _post(url, json.dumps([ROW]).encode("utf-8"))
+    assert status == 200
+    assert payload["changed"] is True
+    assert service.snapshot.index.names == {"DV-1": "Villa A"}
@@ -0,0 +1,61 @@
+"""Deville: HTTP ล้มเหลวกับ host ที่ circuit เปิดแล้ว ต้องไม่เปิด Chrome แทนทีละหน้า"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from host_health import HostDown, HostHealth
+from sites.deville import DevilleAdapter
+
+URL = "https://www.devillegroups.com/allcalendar/"
+
+
+class DeadHttp:
+    def get(self, url):
+        raise ConnectionError("connection refused")
+
+    def fetch_month_html(self, h_id, ym):
+        raise ConnectionError("connection refused")
+
+
+class FakeScraper:
+    deville_engine = "selenium"
+
+    def __init__(self, health):
+        self.health = health
+        self.opened = []
+        self.failed = []
+
+    def open(self, url):
+        self.opened.append(url)
+        raise AssertionError("ไม่ควรเปิด Chrome")
+
+    def unit_failed(self, key, reason, error):
+        self.failed.append((key, reason))
+
+
+def _adapter(health):
+    adapter = DevilleAdapter(FakeScraper(health))
+    adapter.http = DeadHttp()
+    return adapter
+
+
+def test_month_fetch_skips_chrome_once_circuit_opens():
+    health = HostHealth(retries=0, failure_threshold=2)
+    adapter = _adapter(health)
+    health.failure("devillegroups.com", "1")   # บ้านอื่นล้มเหลวมาก่อน
+    with pytest.raises(HostDown):
+        adapter._fetch_month("2", "2026-03")
+    assert adapter.scraper.opened == []
+
+
+def test_listing_goes_through_health_and_is_skipped_when_down():
+    health = HostHealth(retries=0, failure_threshold=1)
+    health.failure("devillegroups.com", "a")
+    health.failure("devillegroups.com", "b")
+    adapter = _adapter(health)
+    assert adapter.find_houses(URL) == []
+    assert adapter.scraper.opened == []
+    assert adapter.scraper.failed == [((URL, None, None), "circuit_open")]
@@ -0,0 +1,41 @@
+"""FULLCALENDAR_EVENTS_JS + expand_fullcalendar_events กับ event แบบ FullCalendar v4 (Date object)"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dom_extract import FULLCALENDAR_EVENTS_JS, expand_fullcalendar_events
+
+BOOKED = "rgb(248, 229, 231)"
+
+
+def _plain_events(events_js):
+    """รัน pad/iso/classes/plain จาก FULLCALENDAR_EVENTS_JS ด้วย node (เวลาท้องถิ่น = Asia/Bangkok)"""
+    helpers = re.findall(r"^function (?:pad|iso|classes|plain)\(.*?^}\n", FULLCALENDAR_EVENTS_JS, re.M | re.S)
+    script = "".join(helpers) + f"console.log(JSON.stringify(({events_js}).map(plain)));"
+    out = subprocess.run(
+        ["node", "-e", script], capture_output=True, text=True, check=True,
+        env={**os.environ, "TZ": "Asia/Bangkok"},
+    )
+    return json.loads(out.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="ต้องใช้ node")
+def test_v4_date_objects_keep_local_days():
+    events = _plain_events(f"""[
+        {{start: new Date(2026, 2, 10), end: new Date(2026, 2, 12), display: 'background', backgroundColor: '{BOOKED}'}},
+        {{start: new Date(2026, 2, 20, 14, 0), end: new Date(2026, 2, 22, 11, 0), allDay: false,
+          display: 'background', backgroundColor: '{BOOKED}'}}
+    ]""")
+
+    assert events[0]["start"] == "2026-03-10"
+    assert expand_fullcalendar_events(events) == {
+        "2026-03-10", "2026-03-11",                  # all-day: end exclusive
+        "2026-03-20", "2026-03-21", "2026-03-22",    # timed: วันที่ check-out นับด้วย
+    }
@@ -0,0 +1,33 @@
+"""sheet แยกเว็บต้องแยกตามชื่อเว็บ ไม่ใช่ส่วนหน้ารหัส (Deville และ Pattaya Party ใช้ "DV-" เหมือนกัน)"""
+import os
+import re
+import sys
+import zipfile
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from booking_record import BookingRecord, to_rows
+from excel_export import ExcelExporter
+
+pytest.importorskip("xlsxwriter")
+
+
+def test_per_site_sheets_group_by_site_name(tmp_path):
+    path = str(tmp_path / "booking_result.xlsx")
+    records = [
+        BookingRecord("Deville A", "DV-1", date(2026, 3, 5), site="deville"),
+        BookingRecord("Party B", "DV-2606", date(2026, 3, 6), site="pattayaparty"),
+        BookingRecord("City C", "CITY-7", date(2026, 3, 7), site="poolvillacity"),
+    ]
+    exporter = ExcelExporter(path, date(2026, 3, 1), 31, per_site=True)
+    for row in to_rows(records):
+        exporter.add(row)
+    assert exporter.close() == 3
+
+    with zipfile.ZipFile(path) as z:
+        workbook = z.read("xl/workbook.xml").decode("utf-8")
+    sheets = re.findall(r'<sheet name="([^"]+)"', workbook)
+    assert sheets == ["Bookings", "Calendar", "deville", "pattayaparty", "poolvillacity"]
@@ -0,0 +1,101 @@
+"""publish(): snapshot ของรอบนี้ต้องเป็น baseline ของรอบถัดไป (ไม่บันทึก event เดิมซ้ำ)"""
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_calendar
+from booking_record import BookingRecord, BookingStatus
+
+
+def _records(today):
+    return [
+        BookingRecord("Villa A", "DV-1", today + timedelta(days=3)),
+        BookingRecord("Villa A", "DV-1", today + timedelta(days=4), BookingStatus.PENDING),
+        BookingRecord("Villa B", "DV-2", today + timedelta(days=10)),
+    ]
+
+
+def _events(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_publish_twice_with_same_rows_emits_no_new_events(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scrape_calendar, "AVAILABILITY_SERVICE_URL", "")
+    today = date.today()
+
+    # baseline เก่าที่ต่างจากรอบนี้ (DV-2 เคยจองวันอื่น)
+    with open(scrape_calendar.SNAPSHOT_FILE, "w", encoding="utf-8") as f:
+        json.dump([BookingRecord("Villa B", "DV-2", today + timedelta(days=11)).to_row()], f, ensure_ascii=False)
+
+    scrape_calendar.publish(iter(_records(today)), today)
+    first = _events(scrape_calendar.CHANGE_LOG_FILE)
+    assert {event["event"] for event in first} == {"booked", "released"}
+
+    scrape_calendar.publish(iter(_records(today)), today)
+    assert _events(scrape_calendar.CHANGE_LOG_FILE) == first
+
+
+def _failing(records):
+    yield records[0]
+    raise RuntimeError("scrape ล้มกลางทาง")
+
+
+def test_interrupted_publish_keeps_previous_snapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scrape_calendar, "AVAILABILITY_SERVICE_URL", "")
+    today = date.today()
+
+    scrape_calendar.publish(iter(_records(today)), today)
+    with open(scrape_calendar.SNAPSHOT_FILE, "rb") as f:
+        baseline = f.read()
+
+    with pytest.raises(RuntimeError):
+        scrape_calendar.publish(_failing(_records(today)), today)
+    with open(scrape_calendar.SNAPSHOT_FILE, "rb") as f:
+        assert f.read() == baseline
+    assert not os.path.exists(scrape_calendar.SNAPSHOT_FILE + ".tmp")
+
+
+def test_truncated_snapshot_falls_back_to_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scrape_calendar, "AVAILABILITY_SERVICE_URL", "")
+    today = date.today()
+
+    scrape_calendar.publish(iter(_records(today)), today)
+    events = _events(scrape_calendar.CHANGE_LOG_FILE)
+    # ถูก kill ระหว่างเขียน: เหลือแค่ "[" ที่ไม่ปิด
+    with open(scrape_calendar.SNAPSHOT_FILE, "w", encoding="utf-8") as f:
+        f.write("[\n  ")
+
+    scrape_calendar.publish(iter(_records(today)), today)
+    assert _events(scrape_calendar.CHANGE_LOG_FILE) == events
+
+
+def test_failed_unit_keeps_previous_rows_in_baseline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scrape_calendar, "AVAILABILITY_SERVICE_URL", "")
+    today = date.today()
+    records = _records(today)
+    dv1 = [record for record in records if record.code == "DV-1"]
+
+    scrape_calendar.publish(iter(records), today)
+    first = _events(scrape_calendar.CHANGE_LOG_FILE)
+
+    # รอบที่ 2: DV-2 ดึงไม่สำเร็จ -> row ของ DV-2 ต้องยังอยู่ใน snapshot
+    scrape_calendar.publish(iter(dv1), today, failed=[{"รหัส": "DV-2", "month": None}])
+    assert _events(scrape_calendar.CHANGE_LOG_FILE) == first
+    with open(scrape_calendar.SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+        assert {row["รหัส"] for row in json.load(f)} == {"DV-1", "DV-2"}
+
+    # รอบที่ 3: DV-2 กลับมา ข้อมูลเดิม -> ไม่มี booked ซ้ำ
+    scrape_calendar.publish(iter(_records(today)), today)
+    assert _events(scrape_calendar.CHANGE_LOG_FILE) == first
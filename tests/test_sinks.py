@@ -0,0 +1,33 @@
+"""PastDateFilter: ทิ้งวันที่ผ่านมาแล้ว และบันทึก span "filter" 1 ครั้งตอน close"""
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+from booking_record import BookingRecord
+from sinks import PastDateFilter, Sink
+
+
+class Collect(Sink):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def send(self, record):
+        self.records.append(record)
+
+
+def test_past_date_filter_drops_past_days_and_records_one_span():
+    metrics.reset()
+    today = date(2026, 3, 10)
+    out = Collect()
+    chain = PastDateFilter(today, out)
+    for day in (9, 10, 11):
+        chain.send(BookingRecord("Villa A", "DV-1", date(2026, 3, day)))
+    chain.close()
+
+    assert [r.day.day for r in out.records] == [10, 11]
+    assert chain.dropped == 1
+    assert [s["phase"] for s in metrics.SPANS] == ["filter"]
@@ -0,0 +1,55 @@
+"""
+แปลงชื่อเดือนในผลลัพธ์ ("มีนาคม 2569" หรือ "2026-03") เป็นวันที่ และกลับกัน
+
+เป็นที่เดียวที่แปลง พ.ศ. <-> ค.ศ. (ทั้ง scraper, export และเครื่องมืออ่านผลลัพธ์ใช้ร่วมกัน)
+ชื่อเดือนในผลลัพธ์มีไม่กี่สิบแบบ จึง memoize ทั้งสองทาง - แต่ละ label parse ครั้งเดียว
+
+ใช้ได้โดยไม่ต้อง import scraper (ไม่มี selenium / pandas)
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+THAI_MONTHS = [
+    'มกราคม', 'กุมภาพันธ์', 'มีนาคม', 'เมษายน', 'พฤษภาคม', 'มิถุนายน',
+    'กรกฎาคม', 'สิงหาคม', 'กันยายน', 'ตุลาคม', 'พฤศจิกายน', 'ธันวาคม',
+]
+THAI_MONTH_NUMBERS = {name: i + 1 for i, name in enumerate(THAI_MONTHS)}
+BE_OFFSET = 543   # พ.ศ. = ค.ศ. + 543
+
+_THAI_MONTH = re.compile('|'.join(THAI_MONTHS))
+_BE_YEAR = re.compile(r'(25\d{2}|26\d{2}|27\d{2})')
+_ISO_LABEL = re.compile(r'(\d{4})-(\d{2})')
+
+
+@lru_cache(maxsize=1024)
+def parse_month_label(label):
+    """
+    "มกราคม 2569" -> (2026, 1), "2026-01" -> (2026, 1)
+    ถ้า parse ไม่ได้คืน (None, None)
+    """
+    label = str(label or "")
+    month_match = _THAI_MONTH.search(label)
+    if month_match:
+        year_match = _BE_YEAR.search(label)
+        if year_match:
+            return int(year_match.group(1)) - BE_OFFSET, THAI_MONTH_NUMBERS[month_match.group(0)]
+    match = _ISO_LABEL.match(label)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return None, None
+
+
+@lru_cache(maxsize=1024)
+def month_label(year, month):
+    """(2026, 1) -> 'มกราคม 2569'"""
+    return f"{THAI_MONTHS[month - 1]} {year + BE_OFFSET}"
+
+
+def row_date(row):
+    """วันที่ของ row ผลลัพธ์ (date) หรือ None ถ้า parse ไม่ได้"""
+    year, month = parse_month_label(row.get("เดือน", ""))
+    try:
+        return date(year, month, int(row.get("วันที่", 0)))
+    except (TypeError, ValueError):
+        return None
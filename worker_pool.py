@@ -0,0 +1,153 @@
+"""
+Worker pool สำหรับ scrape หลาย URL / บ้าน / เดือนพร้อมกัน
+
+- มี N worker (thread) แต่ละตัวมี CalendarScraper + Chrome เป็นของตัวเอง
+- ทุก worker ดึงงานจากคิวเดียวกัน:
+    1. ("discover", url)  -> แตกเป็น unit ย่อย (เช่น บ้าน × เดือนของ Deville) แล้วใส่คิว
+    2. ("unit", unit)     -> scrape unit นั้น
+- ผลลัพธ์ปล่อยออกตามลำดับ (ลำดับ URL, ลำดับ unit) ทันทีที่ส่วนต้นครบ (OrderedResults)
+  จึงได้ลำดับเดียวกับการรันทีละตัวเสมอ ไม่ขึ้นกับว่า worker ไหนเสร็จก่อน
+  และไม่ต้องรอให้ทุก URL เสร็จก่อนเริ่มเขียนผล
+"""
+import queue
+import threading
+
+
+class OrderedResults:
+    """
+    รวมผลของ unit ที่เสร็จไม่ตามลำดับ แล้วปล่อยเฉพาะส่วนต้นที่ครบแล้ว
+
+    - discovered(url_idx, n): URL ที่ url_idx มี n unit
+    - done(url_idx, unit_idx, rows): unit เสร็จแล้ว
+    - ready(): row ที่ปล่อยได้ตอนนี้ (ตามลำดับ URL -> unit)
+    - rest(): ปล่อยทุกอย่างที่เหลือ (ตอนจบ แม้บาง unit จะไม่ได้รายงาน)
+    """
+
+    def __init__(self, url_count):
+        self.url_count = url_count
+        self.unit_counts = {}
+        self.pending = {}
+        self.next_url = 0
+        self.next_unit = 0
+
+    def discovered(self, url_idx, unit_count):
+        self.unit_counts[url_idx] = unit_count
+
+    def done(self, url_idx, unit_idx, rows):
+        self.pending[(url_idx, unit_idx)] = rows
+
+    @property
+    def finished(self):
+        return self.next_url >= self.url_count
+
+    def ready(self):
+        rows = []
+        while not self.finished:
+            count = self.unit_counts.get(self.next_url)
+            if count is None:
+                break
+            if self.next_unit >= count:
+                self.next_url += 1
+                self.next_unit = 0
+                continue
+            key = (self.next_url, self.next_unit)
+            if key not in self.pending:
+                break
+            rows.extend(self.pending.pop(key))
+            self.next_unit += 1
+        return rows
+
+    def rest(self):
+        rows = self.ready()
+        for key in sorted(self.pending):
+            rows.extend(self.pending.pop(key))
+        self.next_url = self.url_count
+        return rows
+
+
+def drain(events, url_count):
+    """
+    อ่าน event จากคิวจนได้ None แล้ว yield row ตามลำดับ
+
+    event = ("discovered", url_idx, n) / ("done", url_idx, unit_idx, rows) / None
+    """
+    results = OrderedResults(url_count)
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        if event[0] == "discovered":
+            results.discovered(event[1], event[2])
+        else:
+            results.done(event[1], event[2], event[3])
+        yield from results.ready()
+    yield from results.rest()
+
+
+def run_pool(urls, make_scraper, workers):
+    """
+    Scrape ทุก URL ด้วย worker pool
+
+    - urls: รายการ URL ตามลำดับ
+    - make_scraper: ฟังก์ชันสร้าง CalendarScraper ใหม่ (เรียก 1 ครั้งต่อ worker)
+    - workers: จำนวน worker
+
+    generator ของ BookingRecord เรียงตามลำดับ URL -> unit (ปล่อยทันทีที่ส่วนต้นครบ)
+    """
+    tasks = queue.Queue()
+    events = queue.Queue()
+
+    for url_idx, url in enumerate(urls):
+        tasks.put(((url_idx,), "discover", url))
+
+    def worker():
+        scraper = make_scraper()
+        try:
+            while True:
+                item = tasks.get()
+                if item is None:
+                    tasks.task_done()
+                    break
+
+                key, kind, payload = item
+                try:
+                    if kind == "discover":
+                        units = []
+                        try:
+                            units = scraper.discover_units(payload)
+                        finally:
+                            # รายงานจำนวน unit ก่อนใส่คิว (unit ที่เสร็จเร็วจะได้ไม่ค้าง)
+                            events.put(("discovered", key[0], len(units)))
+                        for unit_idx, unit in enumerate(units):
+                            tasks.put((key + (unit_idx,), "unit", unit))
+                    else:
+                        rows = []
+                        try:
+                            rows = list(scraper.scrape_unit(payload))
+                        finally:
+                            events.put(("done", key[0], key[1], rows))
+                except Exception as e:
+                    print(f"❌ Error ({kind} {payload if kind == 'discover' else payload['url']}): {e}")
+                finally:
+                    tasks.task_done()
+        finally:
+            scraper.close()
+
+    threads = [
+        threading.Thread(target=worker, name=f"scraper-{i + 1}", daemon=True)
+        for i in range(max(1, workers))
+    ]
+    for t in threads:
+        t.start()
+
+    def finish():
+        # รอจนงานทั้งหมด (รวม unit ที่แตกออกมาระหว่างทาง) เสร็จ แล้วสั่งหยุด worker
+        tasks.join()
+        for _ in threads:
+            tasks.put(None)
+        for t in threads:
+            t.join()
+        events.put(None)
+
+    threading.Thread(target=finish, name="scraper-join", daemon=True).start()
+    yield from drain(events, len(urls))